@@ -0,0 +1,65 @@
+"""
+Per call benchmark of the incremental indicators against TA-Lib.
+
+Times ``IncrementalIndicators.calculate`` (only the new candle of a sliding live window is
+fed) and ``calculate_full`` (TA-Lib over the whole window) for the indicator sets of
+Strategy_SLpart_* and Strategy_Goal_Vidra_RSI_EMA_MACD_INJ, at growing window sizes.
+
+Usage (from the repository root, inside the freqtrade environment):
+    python benchmarks/incremental_indicators.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "user_data" / "strategies"))
+from shared.incremental import ADX, EMA, MACD, RSI, IncrementalIndicators, calculate_full  # noqa: E402
+
+INDICATOR_SETS = {
+    "SLpart": {"ema20": EMA(20), "ema30": EMA(30)},
+    "Vidra_MACD": {"rsi": RSI(14), "ema_short": EMA(50), "ema_long": EMA(200),
+                   "macd": MACD(12, 26, 9), "adx": ADX(14)},
+}
+WINDOWS = [500, 1_000, 5_000, 20_000]
+CALLS = 200
+
+
+def synthetic_candles(size: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, size))
+    return pd.DataFrame({
+        "date": pd.date_range("2024-01-01", periods=size, freq="5min", tz="UTC"),
+        "high": close + rng.uniform(0, 1, size),
+        "low": close - rng.uniform(0, 1, size),
+        "close": close,
+    })
+
+
+def per_call(calculate, frames) -> float:
+    start = time.perf_counter()
+    for frame in frames:
+        calculate(frame)
+    return (time.perf_counter() - start) / len(frames)
+
+
+def main() -> int:
+    print(f"{'indicators':>12} {'window':>8} {'TA-Lib us':>10} {'incremental us':>15}")
+    for name, indicators in INDICATOR_SETS.items():
+        for window in WINDOWS:
+            candles = synthetic_candles(window + CALLS)
+            frames = [candles.iloc[end - window:end].reset_index(drop=True) for end in range(window + 1, window + CALLS + 1)]
+
+            engine = IncrementalIndicators(check_every=0)
+            engine.calculate("pair", candles.iloc[:window].reset_index(drop=True), indicators)
+            talib_time = per_call(lambda frame: calculate_full(frame, indicators), frames)
+            incremental_time = per_call(lambda frame: engine.calculate("pair", frame, indicators), frames)
+            print(f"{name:>12} {window:>8} {talib_time * 1e6:>10.1f} {incremental_time * 1e6:>15.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
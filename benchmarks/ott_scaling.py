@@ -0,0 +1,64 @@
+"""
+Scaling benchmark for the shared OTT indicator.
+
+Times ``calculate_ott`` on growing synthetic candle series and checks that the runtime
+grows linearly with the number of candles (the previous implementation was O(n^2)).
+
+Usage (from the repository root, inside the freqtrade environment):
+    python benchmarks/ott_scaling.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "user_data" / "strategies"))
+from shared.ott import calculate_ott  # noqa: E402
+
+SIZES = [25_000, 50_000, 100_000, 200_000, 400_000]
+REPEATS = 5
+# Doubling the candles may at most cost this factor (2.0 is perfectly linear)
+MAX_DOUBLING_RATIO = 3.0
+
+
+def synthetic_close(size: int, seed: int = 42) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 100 + np.cumsum(rng.normal(0, 1, size))
+
+
+def best_time(close: np.ndarray) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        calculate_ott(close)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> int:
+    # Warm up (numba compilation, if available)
+    calculate_ott(synthetic_close(1_000))
+
+    results = [(size, best_time(synthetic_close(size))) for size in SIZES]
+
+    print(f"{'candles':>10} {'seconds':>10} {'ns/candle':>10} {'ratio':>7}")
+    failed = False
+    previous = None
+    for size, seconds in results:
+        ratio = seconds / previous if previous else float("nan")
+        print(f"{size:>10} {seconds:>10.4f} {seconds / size * 1e9:>10.1f} {ratio:>7.2f}")
+        if previous and ratio > MAX_DOUBLING_RATIO:
+            failed = True
+        previous = seconds
+
+    if failed:
+        print(f"Runtime grows faster than linear (doubling ratio > {MAX_DOUBLING_RATIO}).")
+        return 1
+    print("Runtime grows linearly with the number of candles.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
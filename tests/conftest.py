@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The strategies import their helpers as ``shared.*`` from user_data/strategies
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'user_data' / 'strategies'))
@@ -0,0 +1,74 @@
+import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('talib')
+
+from shared.incremental import (ADX, ATR, BBANDS, EMA, MACD, MAX, MIN, RSI, SMA,  # noqa: E402
+                                IncrementalIndicators, calculate_full)
+
+INDICATORS = {
+    'ema': EMA(20),
+    'ema_long': EMA(200),
+    'sma': SMA(30),
+    'bb': BBANDS(20, 2.0, 2.0),
+    'max': MAX(50),
+    'min': MIN(50),
+    'rsi': RSI(14),
+    'atr': ATR(14),
+    'adx': ADX(14),
+    'macd': MACD(12, 26, 9),
+}
+
+
+def _candles(count: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, count)))
+    return pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=count, freq='5min', tz='UTC'),
+        'high': close * (1 + rng.uniform(0, 0.005, count)),
+        'low': close * (1 - rng.uniform(0, 0.005, count)),
+        'close': close,
+    })
+
+
+def _assert_talib(columns, expected):
+    assert columns.keys() == expected.keys()
+    for column, values in expected.items():
+        np.testing.assert_allclose(columns[column], values, rtol=1e-10, atol=1e-10, equal_nan=True, err_msg=column)
+
+
+@pytest.mark.parametrize('key', list(INDICATORS))
+def test_fed_from_the_first_candle_equals_talib(key):
+    candles = _candles(3000)
+    indicator = copy.deepcopy(INDICATORS[key])
+
+    arrays = [candles[column].tolist() for column in indicator.inputs]
+    outputs = [indicator.update(dict(zip(indicator.inputs, candle))) for candle in zip(*arrays)]
+
+    for values, expected in zip(zip(*outputs), indicator.reference(candles)):
+        np.testing.assert_allclose(values, expected, rtol=1e-10, atol=1e-10, equal_nan=True)
+
+
+def test_growing_dataframe_equals_talib():
+    candles = _candles(1200)
+    engine = IncrementalIndicators()
+
+    for end in range(1000, len(candles) + 1, 7):
+        columns = engine.calculate('pair', candles.iloc[:end], INDICATORS)
+
+    _assert_talib(columns, calculate_full(candles.iloc[:end], INDICATORS))
+
+
+def test_changed_last_candle_is_calculated_again():
+    candles = _candles(1000)
+    engine = IncrementalIndicators()
+    engine.calculate('pair', candles, INDICATORS)
+
+    changed = candles.copy()
+    changed.loc[changed.index[-1], 'close'] *= 1.01
+    columns = engine.calculate('pair', changed, INDICATORS)
+
+    _assert_talib(columns, calculate_full(changed, INDICATORS))
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from shared.normalize import CausalNormalizer, causal_normalize
+
+WINDOW = 100
+LIVE_CANDLES = 500
+
+
+def _candles(count: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, count)))
+    dates = pd.date_range('2024-01-01', periods=count, freq='5min', tz='UTC')
+    return pd.DataFrame({'date': dates, 'close': close})
+
+
+def _rolling_calls(candles: pd.DataFrame, column_of):
+    """
+    Normalizer results of the live window sliding one candle at a time over the candles.
+    """
+    normalizer = CausalNormalizer(window=WINDOW)
+    full_calls = 0
+    latest = []
+    for end in range(LIVE_CANDLES, len(candles) + 1):
+        window = candles.iloc[end - LIVE_CANDLES:end]
+        before = normalizer._series.get('key')
+        scaled = normalizer.normalize('key', window['date'], column_of(window))
+        full_calls += normalizer._series.get('key') is not before
+        latest.append(scaled.iloc[-1])
+    return np.array(latest), full_calls
+
+
+def test_rolling_window_of_one_series_equals_causal_normalize():
+    candles = _candles(1500)
+    expected = causal_normalize(candles['close'], WINDOW).to_numpy()[LIVE_CANDLES - 1:]
+
+    latest, full_calls = _rolling_calls(candles, lambda window: window['close'])
+
+    assert full_calls == 1
+    np.testing.assert_allclose(latest, expected, rtol=0, atol=1e-12)
+
+
+def test_rolling_window_of_recalculated_indicator_within_rtol():
+    talib = pytest.importorskip('talib')
+    candles = _candles(1500, seed=1)
+    ema = lambda window: pd.Series(talib.EMA(window['close'].to_numpy(), timeperiod=110), index=window.index)
+
+    latest, full_calls = _rolling_calls(candles, ema)
+
+    # The reference: every live window scaled on its own, as the strategies did before
+    expected = np.array([causal_normalize(ema(candles.iloc[end - LIVE_CANDLES:end]), WINDOW).iloc[-1]
+                         for end in range(LIVE_CANDLES, len(candles) + 1)])
+    values = np.array([ema(candles.iloc[end - LIVE_CANDLES:end]).iloc[-1]
+                       for end in range(LIVE_CANDLES, len(candles) + 1)])
+    low = pd.Series(values).rolling(WINDOW).min().to_numpy()[WINDOW:]
+    high = pd.Series(values).rolling(WINDOW).max().to_numpy()[WINDOW:]
+    bound = 2 * 1e-4 * np.abs(values[WINDOW:]) / (high - low)
+
+    assert full_calls == 1
+    # Approximate, not identical: both the values and the window's min / max are within rtol
+    assert not np.allclose(latest, expected, rtol=0, atol=1e-12)
+    assert (np.abs(latest - expected)[WINDOW:] <= bound).all()
+
+
+def test_changed_latest_candle_is_scaled_again():
+    candles = _candles(600)
+    normalizer = CausalNormalizer(window=WINDOW)
+    normalizer.normalize('key', candles['date'], candles['close'])
+
+    changed = candles['close'].copy()
+    changed.iloc[-1] *= 1.01
+    scaled = normalizer.normalize('key', candles['date'], changed)
+
+    np.testing.assert_array_equal(scaled.to_numpy(), causal_normalize(changed, WINDOW).to_numpy())
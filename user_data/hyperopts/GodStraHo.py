@@ -22,6 +22,10 @@ from freqtrade.optimize.hyperopt_interface import IHyperOpt
 from ta import add_all_ta_features
 from ta.utils import dropna
 import freqtrade.vendor.qtpylib.indicators as qtpylib
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'strategies'))
+from shared.gene_rules import compile_rules, param_genes  # noqa: E402
 # this is your trading strategy DNA Size
 # you can change it and see the results...
 DNA_SIZE = 1
@@ -77,49 +81,16 @@ class GodStraHo(IHyperOpt):
         """
         Define the buy strategy parameters to be used by Hyperopt.
         """
+        # Compiled once per epoch, evaluated per pair
+        plan = compile_rules(param_genes(params, 'buy', DNA_SIZE))
+
         def populate_entry_trend(dataframe: DataFrame, metadata: dict) -> DataFrame:
             """
             Buy strategy Hyperopt will build and use.
             """
-            conditions = []
-            # GUARDS AND TRENDS
-            for i in range(DNA_SIZE):
-
-                OPR = params[f'buy-oper-{i}']
-                IND = params[f'buy-indicator-{i}']
-                CRS = params[f'buy-cross-{i}']
-                INT = params[f'buy-int-{i}']
-                REAL = params[f'buy-real-{i}']
-                DFIND = dataframe[IND]
-                DFCRS = dataframe[CRS]
-
-                if OPR == ">":
-                    conditions.append(DFIND > DFCRS)
-                elif OPR == "=":
-                    conditions.append(np.isclose(DFIND, DFCRS))
-                elif OPR == "<":
-                    conditions.append(DFIND < DFCRS)
-                elif OPR == "CA":
-                    conditions.append(qtpylib.crossed_above(DFIND, DFCRS))
-                elif OPR == "CB":
-                    conditions.append(qtpylib.crossed_below(DFIND, DFCRS))
-                elif OPR == ">I":
-                    conditions.append(DFIND > INT)
-                elif OPR == "=I":
-                    conditions.append(DFIND == INT)
-                elif OPR == "<I":
-                    conditions.append(DFIND < INT)
-                elif OPR == ">R":
-                    conditions.append(DFIND > REAL)
-                elif OPR == "=R":
-                    conditions.append(np.isclose(DFIND, REAL))
-                elif OPR == "<R":
-                    conditions.append(DFIND < REAL)
-
-            if conditions:
-                dataframe.loc[
-                    reduce(lambda x, y: x & y, conditions),
-                    'enter_long'] = 1
+            entry = plan.evaluate(dataframe)
+            if entry is not None:
+                dataframe.loc[entry, 'enter_long'] = 1
 
             return dataframe
 
@@ -149,50 +120,16 @@ class GodStraHo(IHyperOpt):
         """
         Define the sell strategy parameters to be used by Hyperopt.
         """
+        # Compiled once per epoch, evaluated per pair
+        plan = compile_rules(param_genes(params, 'sell', DNA_SIZE))
+
         def populate_exit_trend(dataframe: DataFrame, metadata: dict) -> DataFrame:
             """
             Sell strategy Hyperopt will build and use.
             """
-            conditions = []
-
-            # GUARDS AND TRENDS
-            for i in range(DNA_SIZE):
-
-                OPR = params[f'sell-oper-{i}']
-                IND = params[f'sell-indicator-{i}']
-                CRS = params[f'sell-cross-{i}']
-                INT = params[f'sell-int-{i}']
-                REAL = params[f'sell-real-{i}']
-                DFIND = dataframe[IND]
-                DFCRS = dataframe[CRS]
-
-                if OPR == ">":
-                    conditions.append(DFIND > DFCRS)
-                elif OPR == "=":
-                    conditions.append(np.isclose(DFIND, DFCRS))
-                elif OPR == "<":
-                    conditions.append(DFIND < DFCRS)
-                elif OPR == "CA":
-                    conditions.append(qtpylib.crossed_above(DFIND, DFCRS))
-                elif OPR == "CB":
-                    conditions.append(qtpylib.crossed_below(DFIND, DFCRS))
-                elif OPR == ">I":
-                    conditions.append(DFIND > INT)
-                elif OPR == "=I":
-                    conditions.append(DFIND == INT)
-                elif OPR == "<I":
-                    conditions.append(DFIND < INT)
-                elif OPR == ">R":
-                    conditions.append(DFIND > REAL)
-                elif OPR == "=R":
-                    conditions.append(np.isclose(DFIND, REAL))
-                elif OPR == "<R":
-                    conditions.append(DFIND < REAL)
-
-            if conditions:
-                dataframe.loc[
-                    reduce(lambda x, y: x & y, conditions),
-                    'exit_long']=1
+            exit_ = plan.evaluate(dataframe)
+            if exit_ is not None:
+                dataframe.loc[exit_, 'exit_long'] = 1
 
             return dataframe
 
@@ -5,6 +5,10 @@ from functools import reduce
 from pandas import DataFrame
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 from freqtrade.strategy import IStrategy, CategoricalParameter, DecimalParameter, IntParameter, RealParameter
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from shared.range_indicators import RangeIndicator  # noqa: E402
 
 __author__ = "Robert Roman"
 __copyright__ = "Free For Use"
@@ -62,6 +66,8 @@ class Bandtastic(IStrategy):
     sell_ema_enabled = CategoricalParameter([True, False], space='sell', optimize=True, default=False)
     sell_trigger = CategoricalParameter(["sell-bb_upper1", "sell-bb_upper2", "sell-bb_upper3", "sell-bb_upper4"], default="sell-bb_upper2", space="sell")
 
+    ema = RangeIndicator('EMA', lambda dataframe, period: ta.EMA(dataframe, timeperiod=period))
+
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         # RSI
         dataframe['rsi'] = ta.RSI(dataframe)
@@ -87,14 +93,9 @@ class Bandtastic(IStrategy):
         dataframe['bb_lowerband4'] = bollinger4['lower']
         dataframe['bb_middleband4'] = bollinger4['mid']
         dataframe['bb_upperband4'] = bollinger4['upper']
-        # Build EMA rows - combine all ranges to a single set to avoid duplicate calculations.
-        for period in set(
-                list(self.buy_fastema.range)
-                + list(self.buy_slowema.range)
-                + list(self.sell_fastema.range)
-                + list(self.sell_slowema.range)
-            ):
-            dataframe[f'EMA_{period}'] = ta.EMA(dataframe, timeperiod=period)
+        # Build EMA rows - each period of all ranges once.
+        dataframe = self.ema.add(dataframe, self.buy_fastema, self.buy_slowema,
+                                 self.sell_fastema, self.sell_slowema)
 
         return dataframe
 
@@ -1,8 +1,15 @@
 # --- Do not remove these libs ---
-from freqtrade.strategy import IStrategy
+import datetime
+import sys
+from pathlib import Path
+from typing import Optional
+from freqtrade.strategy import IStrategy, stoploss_from_open
+from freqtrade.persistence import Trade
 import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 from pandas import DataFrame
+sys.path.append(str(Path(__file__).resolve().parent))
+from shared.pair_settings import ANY_COIN, PairSettings  # noqa: E402
 # --------------------------------
 
 class Strategy00_SL(IStrategy):
@@ -11,8 +18,13 @@ class Strategy00_SL(IStrategy):
     author@: Yurii Udaltsov
     github@: https://github.com/freqtrade/freqtrade-strategies
 
+    Trades every coin of PAIR_SETTINGS with the settings of its row, in one bot.
+    freqtrade trails per bot, so the rows' stoploss and trailing stop are applied by
+    custom_stoploss, following the rules of the built-in trailing stop. The single coin
+    subclasses (Strategy00_SL_ATOMUSDT, ...) use the built-in trailing stop instead.
+
     How to use it?
-    > python3 ./freqtrade/main.py -s Strategy00
+    > python3 ./freqtrade/main.py -s Strategy00_SL
     """
 
     INTERFACE_VERSION: int = 3
@@ -20,15 +32,30 @@ class Strategy00_SL(IStrategy):
     # Оптимальний стоп-лосс або %max, розроблений для стратегії
     stoploss = -0.05
 
+    use_custom_stoploss = True
+
     # Оптимальний таймфрейм для стратегії
     timeframe = '30m'
 
-    # Налаштування трейлінг стоп-лосу
-    trailing_stop = True  # Включення трейлінг стоп-лосу
+    # Налаштування трейлінг стоп-лосу (для кожної монети окремо, в custom_stoploss)
+    trailing_stop = False
     trailing_stop_positive = 0.033  # Трейлінг стоп активується, коли прибуток досягає 3,3%
     trailing_stop_positive_offset = 0.035  # Трейлінг стоп починає діяти, коли прибуток перевищує 3,5%
     trailing_only_offset_is_reached = True  # Трейлінг стоп активується тільки після досягнення offset
 
+    # EMA periods of the cross
+    ema_fast = 20
+    ema_slow = 30
+
+    # Settings per coin (see shared/pair_settings.py), overriding the class attributes above
+    PAIR_SETTINGS = {
+        ANY_COIN: dict(),
+        'ATOM': dict(stoploss=-0.035, trailing_stop_positive=0.035, trailing_stop_positive_offset=0.036,
+                     ema_fast=28, ema_slow=48),
+        'BNB': dict(stoploss=-0.015),
+        'INJ': dict(stoploss=-0.035, trailing_stop_positive=0.05, trailing_stop_positive_offset=0.051),
+    }
+
     # запускати "populate_indicators" тільки для нової свічки
     process_only_new_candles = True
 
@@ -44,15 +71,21 @@ class Strategy00_SL(IStrategy):
         'stoploss_on_exchange': False
     }
 
+    def bot_start(self, **kwargs) -> None:
+        self.pair_settings = PairSettings(self, self.PAIR_SETTINGS)
+        self.pair_settings.index_whitelist(self.dp)
+
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
         Adds EMA 15 and EMA 30 indicators to the given DataFrame
         """
+        settings = self.pair_settings.get(metadata['pair'])
+
         # Calculate and add EMA 15
-        dataframe['ema15'] = ta.EMA(dataframe, timeperiod=20)
+        dataframe['ema15'] = ta.EMA(dataframe, timeperiod=settings.ema_fast)
 
         # Calculate and add EMA 30
-        dataframe['ema30'] = ta.EMA(dataframe, timeperiod=30)
+        dataframe['ema30'] = ta.EMA(dataframe, timeperiod=settings.ema_slow)
 
         return dataframe
 
@@ -81,4 +114,23 @@ class Strategy00_SL(IStrategy):
             'exit_long'] = 1
 
         return dataframe
-      
\ No newline at end of file
+
+    def custom_stoploss(self, pair: str, trade: Trade, current_time: datetime,
+                        current_rate: float, current_profit: float, after_fill: bool,
+                        **kwargs) -> Optional[float]:
+        """
+        Stoploss and trailing stop of the pair's row, with the rules of the built-in ones.
+        freqtrade only ever raises the stop, so the trailing stop follows the highest rate.
+        """
+        settings = self.pair_settings.get(pair)
+        if settings is None:
+            return None
+
+        if settings.trailing_stop_positive is not None and current_profit > settings.trailing_stop_positive_offset:
+            return settings.trailing_stop_positive
+        if not settings.trailing_only_offset_is_reached:
+            # Trails at the stoploss distance until the offset is reached
+            return -settings.stoploss
+
+        return stoploss_from_open(settings.stoploss, current_profit,
+                                  is_short=trade.is_short, leverage=trade.leverage)
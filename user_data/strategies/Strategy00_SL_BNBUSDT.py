@@ -1,84 +1,32 @@
 # --- Do not remove these libs ---
-from freqtrade.strategy import IStrategy
-import talib.abstract as ta
-import freqtrade.vendor.qtpylib.indicators as qtpylib
-from pandas import DataFrame
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent))
+from shared.pair_settings import ANY_COIN  # noqa: E402
+from Strategy00_SL import Strategy00_SL  # noqa: E402
 # --------------------------------
 
-class Strategy00_SL_BNBUSDT(IStrategy):
+
+class Strategy00_SL_BNBUSDT(Strategy00_SL):
     """
-    Strategy 00
+    Strategy00_SL trading every pair with the BNB settings
     author@: Yurii Udaltsov
     github@: https://github.com/freqtrade/freqtrade-strategies
 
     How to use it?
-    > python3 ./freqtrade/main.py -s Strategy00
+    > python3 ./freqtrade/main.py -s Strategy00_SL_BNBUSDT
     """
 
-    INTERFACE_VERSION: int = 3
-
     # Оптимальний стоп-лосс або %max, розроблений для стратегії
     stoploss = -0.015
 
-    # Оптимальний таймфрейм для стратегії
-    timeframe = '30m'
-
-    # Налаштування трейлінг стоп-лосу
+    # Налаштування трейлінг стоп-лосу (вбудований трейлінг стоп freqtrade, одна монета на бота)
+    use_custom_stoploss = False
     trailing_stop = True  # Включення трейлінг стоп-лосу
     trailing_stop_positive = 0.033  # Трейлінг стоп активується, коли прибуток досягає 3,3%
     trailing_stop_positive_offset = 0.035  # Трейлінг стоп починає діяти, коли прибуток перевищує 3,5%
     trailing_only_offset_is_reached = True  # Трейлінг стоп активується тільки після досягнення offset
 
-    # запускати "populate_indicators" тільки для нової свічки
-    process_only_new_candles = True
-
-    # Експериментальні параметри (конфігурація має перевагу над ними, якщо встановлено)
-    use_exit_signal = True
-    exit_profit_only = False
-
-    # Optional order type mapping
-    order_types = {
-        'entry': 'limit',
-        'exit': 'limit',
-        'stoploss': 'market',
-        'stoploss_on_exchange': False
+    PAIR_SETTINGS = {
+        ANY_COIN: dict(),
     }
-
-    def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        """
-        Adds EMA 15 and EMA 30 indicators to the given DataFrame
-        """
-        # Calculate and add EMA 15
-        dataframe['ema15'] = ta.EMA(dataframe, timeperiod=20)
-
-        # Calculate and add EMA 30
-        dataframe['ema30'] = ta.EMA(dataframe, timeperiod=30)
-
-        return dataframe
-
-    def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        """
-        Generates buy signal based on EMA indicators
-        A buy signal is generated when EMA 15 crosses above EMA 30
-        """
-        dataframe.loc[
-            (
-                qtpylib.crossed_above(dataframe['ema15'], dataframe['ema30'])
-            ),
-            'enter_long'] = 1
-
-        return dataframe
-
-    def populate_exit_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        """
-        Generates sell signal based on EMA indicators
-        A sell signal is generated when EMA 15 crosses below EMA 30
-        """
-        dataframe.loc[
-            (
-                qtpylib.crossed_below(dataframe['ema15'], dataframe['ema30'])
-            ),
-            'exit_long'] = 1
-
-        return dataframe
-      
\ No newline at end of file
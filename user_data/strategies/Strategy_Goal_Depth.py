@@ -0,0 +1,214 @@
+# --- Do not remove these libs ---
+import datetime
+import logging
+import sys
+from pathlib import Path
+from typing import Optional, Tuple, Union
+from freqtrade.strategy import IStrategy
+from pandas import DataFrame
+from freqtrade.persistence import Trade
+sys.path.append(str(Path(__file__).resolve().parent))
+from shared.orderbook import OrderBookAnalytics  # noqa: E402
+from shared.orderbook_features import DepthFeatures  # noqa: E402
+from shared.exit_ladder import ExitLadder  # noqa: E402
+from shared.pair_settings import PairSettings  # noqa: E402
+from shared.diagnostics import Diagnostics  # noqa: E402
+from shared.decision_trace import DecisionTrace  # noqa: E402
+
+
+class SettingsObject:
+    bids_ask_delta: float
+    depth: int
+    volume_threshold: int
+    
+    def __init__(self, bids_ask_delta: float, depth: int, volume_threshold: int):
+        self.bids_ask_delta = bids_ask_delta
+        self.depth = depth
+        self.volume_threshold = volume_threshold
+        
+
+# class GoogleSheetsImporter:
+#     SCOPES = ['https://www.googleapis.com/auth/spreadsheets',
+#               "https://www.googleapis.com/auth/drive"]
+#     client: Spreadsheet
+
+#     def __init__(self):
+#         json_data = json.loads(base64.b64decode("eyJ3ZWIiOnsiY2xpZW50X2lkIjoiNDM5OTg5NDc4OTE0LWc0Mm90cWNkbzQxdGRiaWEzczNnZzBiMXA0ZGpiN3FzLmFwcHMuZ29vZ2xldXNlcmNvbnRlbnQuY29tIiwicHJvamVjdF9pZCI6InByb21pc2luZy1mbGFzaC00MzUyMTItazMiLCJhdXRoX3VyaSI6Imh0dHBzOi8vYWNjb3VudHMuZ29vZ2xlLmNvbS9vL29hdXRoMi9hdXRoIiwidG9rZW5fdXJpIjoiaHR0cHM6Ly9vYXV0aDIuZ29vZ2xlYXBpcy5jb20vdG9rZW4iLCJhdXRoX3Byb3ZpZGVyX3g1MDlfY2VydF91cmwiOiJodHRwczovL3d3dy5nb29nbGVhcGlzLmNvbS9vYXV0aDIvdjEvY2VydHMiLCJjbGllbnRfc2VjcmV0IjoiR09DU1BYLUg5MnhTa3FWb1N6eHFudkY1Wjc5TjB4Y3lJdm8ifX0="))
+#         credentials = ServiceAccountCredentials.from_json_keyfile_dict(json_data)
+#         self.client = gspread.authorize(credentials).open_by_key("1C_NWy7a5EuDU6wz5xC5k2tPVfzKSV88WV4nhXYlqEsI")
+
+#     def get_timeframe_settings(self, strategy, timeframe) -> SettingsObject:
+        
+#         sheet = self.client.worksheet(strategy)
+#         self.timeframes_dics = {item['Timeframe']: SettingsObject(item["BidAskDelta"], item["Depth"], item["VolumeThreshold"]) for item in sheet.get_all_records()}
+
+#         return self.timeframes_dics[timeframe]
+# --------------------------------
+
+class Strategy_Goal_Depth(IStrategy):
+    """
+    Strategy_Goal_Depth 
+    author@: Yurii Udaltsov
+    github@: https://github.com/freqtrade/freqtrade-strategies
+
+    Trades every coin of PAIR_SETTINGS with the settings of its row, in one bot.
+
+    How to use it?
+    > python3 ./freqtrade/main.py -s Strategy_Goal_Depth
+    """
+
+    INTERFACE_VERSION: int = 3
+    
+    STRATEGY_SHEET_NAME = "DepthSpot"
+    
+    # Settings per coin (see shared/pair_settings.py), the row's STRATEGY_SETTINGS per timeframe
+    PAIR_SETTINGS = {
+        'INJ': dict(STRATEGY_SETTINGS={
+            "5m": SettingsObject(1.3, 15 , 500),
+            "30m": SettingsObject(1.3, 15 , 1000)
+        }),
+        'SOL': dict(STRATEGY_SETTINGS={
+            "5m": SettingsObject(1.3, 15 , 500),
+            "1h": SettingsObject(1.3, 20 , 500)
+        }),
+        'SUI': dict(STRATEGY_SETTINGS={
+            "5m": SettingsObject(1.3, 15 , 40000)
+        }),
+    }
+    
+    position_adjustment_enable = True
+
+    # Оптимальний стоп-лосс або %max, розроблений для стратегії
+    stoploss = -0.02
+    
+    use_custom_stoploss = True
+
+    # Оптимальний таймфрейм для стратегії
+    #timeframe = '15s'
+
+    # Налаштування трейлінг стоп-лосу
+    # trailing_stop = True  # Включення трейлінг стоп-лосу
+    # trailing_stop_positive = 0.033  # Трейлінг стоп активується, коли прибуток досягає 3,3%
+    # trailing_stop_positive_offset = 0.035  # Трейлінг стоп починає діяти, коли прибуток перевищує 3,5%
+    # trailing_only_offset_is_reached = True  # Трейлінг стоп активується тільки після досягнення offset
+
+    # запускати "populate_indicators" тільки для нової свічки
+    process_only_new_candles = True
+
+    # Експериментальні параметри (конфігурація має перевагу над ними, якщо встановлено)
+    use_exit_signal = True
+    exit_profit_only = False
+
+    # Optional order type mapping
+    order_types = {
+        'entry': 'limit',
+        'exit': 'limit',
+        'stoploss': 'market',
+        'stoploss_on_exchange': False
+    }
+    
+    # Settings for target reaching logic
+    target_percent = 0.06
+    
+    target_stage_1 = 0.02
+    target_stage_2 = 0.04
+    
+    stage_1_sell_amount = 0.2
+    stage_2_sell_amount = 0.3
+
+    
+    def bot_start(self, **kwargs) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.diagnostics = Diagnostics(self.logger, sample_rate=self.config.get('diagnostics_sample_rate', 0),
+                                       trace=DecisionTrace.for_strategy(self))
+        self.exit_ladder = ExitLadder(
+            stages=[(self.target_stage_1, self.stage_1_sell_amount),
+                    (self.target_stage_2, self.stage_2_sell_amount)],
+            final_target=self.target_percent, logger=self.logger)
+        self.exit_ladder.state.load_open_trades()
+        
+        self.pair_settings = PairSettings(self, self.PAIR_SETTINGS, self.timeframe, logger=self.logger)
+        self.pair_settings.index_whitelist(self.dp)
+        for settings in self.pair_settings:
+            settings.depth_features = DepthFeatures(
+                depths=(settings.depth,), short_depths=(settings.depth,),
+                thresholds=(settings.volume_threshold,))
+
+    def bot_loop_start(self, current_time: datetime, **kwargs) -> None:
+        # Write the trade state changed during the last iteration
+        self.exit_ladder.state.flush()
+        self.diagnostics.flush_due()
+
+    def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        settings = self.pair_settings.get(metadata['pair'])
+        if settings is None:
+            return dataframe
+
+        order_book = OrderBookAnalytics(self.dp.orderbook(metadata['pair'], settings.depth + 1))
+
+        # depth_imbalance_*, large_bid_count_* and large_ask_count_* columns
+        dataframe = settings.depth_features.populate(dataframe, metadata['pair'], order_book)
+        return dataframe
+
+    def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        """
+        Generates buy signal based on EMA indicators
+        A buy signal is generated when EMA 15 crosses above EMA 30
+        """
+        settings = self.pair_settings.get(metadata['pair'])
+        if settings is None:
+            return dataframe
+        
+        depth_value = dataframe[f'depth_imbalance_{settings.depth}'] > settings.bids_ask_delta
+        large_orders_value = (dataframe[f'large_bid_count_{settings.volume_threshold}'] +
+                              dataframe[f'large_ask_count_{settings.volume_threshold}'] > 0)
+        volume_value = dataframe['volume'] > dataframe['volume'].shift(1)
+        close_value = dataframe['close'] < dataframe['close'].shift(1)
+        
+        entry = (depth_value) & (large_orders_value) & (volume_value) & (close_value)
+        self.diagnostics.record('entry', metadata['pair'], date=dataframe['date'], depth=depth_value,
+                                large_orders=large_orders_value, volume=volume_value, close=close_value, signal=entry)
+
+        dataframe.loc[entry, 'enter_long'] = 1
+        
+        return dataframe
+
+
+    def populate_exit_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        settings = self.pair_settings.get(metadata['pair'])
+        if settings is None:
+            return dataframe
+        
+        # Вихід по признакам входу в шорт шортової позиції
+        dataframe.loc[
+            (dataframe[f'depth_imbalance_short_{settings.depth}'] > settings.bids_ask_delta) &  
+            (dataframe[f'large_bid_count_{settings.volume_threshold}'] +
+             dataframe[f'large_ask_count_{settings.volume_threshold}'] > 0) &  
+            (dataframe['volume'] > dataframe['volume'].shift(1)) &  
+            (dataframe['close'] > dataframe['close'].shift(1)),  
+            'exit_long'
+            ] = 1
+
+        return dataframe
+
+    def custom_stoploss(self, pair: str, trade: Trade, current_time: datetime,
+                        current_rate: float, current_profit: float, after_fill: bool,
+                        **kwargs) -> Optional[float]:
+        try:
+            return self.exit_ladder.custom_stoploss(trade, current_rate, current_profit)
+        except Exception as e:
+            self.logger.info(f"Error occured during custom stoploss definition: {str(e)}")
+            return None
+    
+    def adjust_trade_position(self, trade: Trade, current_time: datetime,
+                              current_rate: float, current_profit: float,
+                              min_stake: Optional[float], max_stake: float,
+                              current_entry_rate: float, current_exit_rate: float,
+                              current_entry_profit: float, current_exit_profit: float,
+                              **kwargs
+                              ) -> Union[Optional[float], Tuple[Optional[float], Optional[str]]]:
+        try:
+            return self.exit_ladder.adjust_trade_position(trade, current_rate)
+        except Exception as e:
+            self.logger.info(f"Error occured during trade position adjustment: {str(e)}")
+            return None
@@ -0,0 +1,247 @@
+# --- Do not remove these libs ---
+import datetime
+import logging
+import sys
+from pathlib import Path
+import pandas as pd
+from typing import Optional, Tuple, Union
+from freqtrade.strategy import IStrategy, informative
+from pandas import DataFrame
+from freqtrade.persistence import Trade
+from freqtrade.exchange import timeframe_to_minutes
+# --------------------------------
+sys.path.append(str(Path(__file__).resolve().parent))
+from shared.orderbook import OrderBookCache  # noqa: E402
+from shared.orderbook_features import DepthFeatures  # noqa: E402
+from shared.orderbook_store import OrderBookRecorder, OrderBookReplay  # noqa: E402
+from shared.exit_ladder import ExitLadder  # noqa: E402
+from shared.pair_settings import PairSettings  # noqa: E402
+
+class Strategy_Goal_Depth_Futures(IStrategy):
+    """
+    Strategy_Goal_Depth_Futures
+    author@: Yurii Udaltsov and Illia
+    github@: https://github.com/freqtrade/freqtrade-strategies
+
+    Trades every coin of PAIR_SETTINGS with the settings of its row, in one bot.
+
+    How to use it?
+    > python3 ./freqtrade/main.py -s Strategy_Goal_Depth_Futures
+    """
+
+    INTERFACE_VERSION: int = 3
+    
+    position_adjustment_enable = True
+
+    # Оптимальний стоп-лосс або %max, розроблений для стратегії
+    stoploss = -0.02
+    
+    use_custom_stoploss = True
+    
+    can_short = True
+
+    # Оптимальний таймфрейм для стратегії
+    timeframe = '5m'
+
+    # Налаштування трейлінг стоп-лосу
+    # trailing_stop = True  # Включення трейлінг стоп-лосу
+    # trailing_stop_positive = 0.033  # Трейлінг стоп активується, коли прибуток досягає 3,3%
+    # trailing_stop_positive_offset = 0.035  # Трейлінг стоп починає діяти, коли прибуток перевищує 3,5%
+    # trailing_only_offset_is_reached = True  # Трейлінг стоп активується тільки після досягнення offset
+
+    # запускати "populate_indicators" тільки для нової свічки
+    process_only_new_candles = True
+
+    # Експериментальні параметри (конфігурація має перевагу над ними, якщо встановлено)
+    use_exit_signal = True
+    exit_profit_only = False
+
+    # Optional order type mapping
+    order_types = {
+        'entry': 'limit',
+        'exit': 'limit',
+        'stoploss': 'market',
+        'stoploss_on_exchange': True
+    }
+    
+    # Settings for target reaching logic
+    target_percent = 0.03
+    
+    target_stage_1 = 0.01
+    target_stage_2 = 0.02
+    
+    stage_1_sell_amount = 0.4
+    stage_2_sell_amount = 0.6
+    
+    # Settings for check market depth on enter 
+    
+    bids_to_ask_delta_long = 1.3
+    bids_to_ask_delta_short = 1.3
+    
+    depth_long = 15
+    depth_short = 15
+    
+    volume_threshold_long = 500
+    volume_threshold_short = 500
+    
+    leverage_ratio = 4.0
+    
+    # Settings per coin (see shared/pair_settings.py), overriding the class attributes above
+    PAIR_SETTINGS = {
+        'INJ': dict(bids_to_ask_delta_short=0.7, depth_long=7, depth_short=7, leverage_ratio=3.0),
+        'SOL': dict(),
+        'SUI': dict(bids_to_ask_delta_short=1.4, volume_threshold_long=40000, volume_threshold_short=50000),
+    }
+    
+    # Record order book snapshots in live / dry-run, they are replayed per candle in backtesting
+    record_order_books = True
+    
+    def bot_start(self, **kwargs) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.exit_ladder = ExitLadder(
+            stages=[(self.target_stage_1, self.stage_1_sell_amount),
+                    (self.target_stage_2, self.stage_2_sell_amount)],
+            final_target=self.target_percent, logger=self.logger)
+        self.exit_ladder.state.load_open_trades()
+        
+        self.pair_settings = PairSettings(self, self.PAIR_SETTINGS, logger=self.logger)
+        self.pair_settings.index_whitelist(self.dp)
+        for settings in self.pair_settings:
+            settings.order_book_depth = max(settings.depth_long, settings.depth_short) + 1
+            settings.depth_features = DepthFeatures(
+                depths=(settings.depth_long,), short_depths=(settings.depth_short,),
+                thresholds=(settings.volume_threshold_long, settings.volume_threshold_short))
+
+        runmode = self.dp.runmode.value
+        order_book_dir = Path(self.config['user_data_dir']) / 'orderbooks'
+        order_book_depth = max((settings.order_book_depth for settings in self.pair_settings), default=1)
+        self.candle_duration = pd.Timedelta(minutes=timeframe_to_minutes(self.timeframe))
+
+        recorder = None
+        if self.record_order_books and runmode in ('live', 'dry_run'):
+            recorder = OrderBookRecorder(order_book_dir, depth=order_book_depth)
+
+        # One order book request per pair and iteration, shared by entry and exit population
+        self.order_books = OrderBookCache(
+            ttl=self.config.get('internals', {}).get('process_throttle_secs', 5), recorder=recorder)
+
+        # Recorded snapshots stand in for the live order book in backtesting / hyperopt
+        self.order_book_replay = None
+        if runmode in ('backtest', 'hyperopt'):
+            self.order_book_replay = OrderBookReplay(order_book_dir, tolerance=self.candle_duration)
+
+    def bot_loop_start(self, current_time: datetime, **kwargs) -> None:
+        self.order_books.clear()
+        # Write the trade state changed during the last iteration
+        self.exit_ladder.state.flush()
+        
+    # @informative(timeframe, candle_type="funding_rate")
+    # def populate_indicators_funding_rate(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+    #     self.logger.info(dataframe.head(10).to_string())
+    #     dataframe['funding_rate'] = dataframe['open']
+    #     return dataframe
+
+    def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        settings = self.pair_settings.get(metadata['pair'])
+        if settings is None:
+            return dataframe
+
+        order_book = self.get_order_book(dataframe, metadata, settings)
+
+        # depth_imbalance_*, large_bid_count_* and large_ask_count_* columns
+        return settings.depth_features.populate(dataframe, metadata['pair'], order_book)
+
+    def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        settings = self.pair_settings.get(metadata['pair'])
+        if settings is None:
+            return dataframe
+
+        # Відкриття лонгової позиції
+        dataframe.loc[
+            (dataframe[f'depth_imbalance_{settings.depth_long}'] > settings.bids_to_ask_delta_long) &  
+            (dataframe[f'large_bid_count_{settings.volume_threshold_long}'] +
+             dataframe[f'large_ask_count_{settings.volume_threshold_long}'] > 0) &  
+            (dataframe['volume'] > dataframe['volume'].shift(1)) &  
+            (dataframe['close'] < dataframe['close'].shift(1)),  
+            'enter_long'
+            ] = 1
+            
+
+        # Відкриття шортової позиції
+        dataframe.loc[
+            (dataframe[f'depth_imbalance_short_{settings.depth_short}'] > settings.bids_to_ask_delta_short) &  
+            (dataframe[f'large_bid_count_{settings.volume_threshold_short}'] +
+             dataframe[f'large_ask_count_{settings.volume_threshold_short}'] > 0) &  
+            (dataframe['volume'] > dataframe['volume'].shift(1)) &  
+            (dataframe['close'] > dataframe['close'].shift(1)),  
+            'enter_short'
+            ] = 1
+
+        return dataframe
+    
+    def populate_exit_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        settings = self.pair_settings.get(metadata['pair'])
+        if settings is None:
+            return dataframe
+
+        # Вихід із шорту по признакам лонгу
+        dataframe.loc[
+            (dataframe[f'depth_imbalance_{settings.depth_long}'] > settings.bids_to_ask_delta_long) &  
+            (dataframe[f'large_bid_count_{settings.volume_threshold_long}'] +
+             dataframe[f'large_ask_count_{settings.volume_threshold_long}'] > 0) &  
+            (dataframe['volume'] > dataframe['volume'].shift(1)) &  
+            (dataframe['close'] < dataframe['close'].shift(1)),  
+            'exit_short'
+            ] = 1
+            
+
+        # Вихід із лонгу по признакам шорту 
+        dataframe.loc[
+            (dataframe[f'depth_imbalance_short_{settings.depth_short}'] > settings.bids_to_ask_delta_short) &  
+            (dataframe[f'large_bid_count_{settings.volume_threshold_short}'] +
+             dataframe[f'large_ask_count_{settings.volume_threshold_short}'] > 0) &  
+            (dataframe['volume'] > dataframe['volume'].shift(1)) &  
+            (dataframe['close'] > dataframe['close'].shift(1)),  
+            'exit_long'
+            ] = 1
+        
+        return dataframe
+
+    def get_order_book(self, dataframe: DataFrame, metadata: dict, settings):
+        """
+        Order book checks for the pair: the live snapshot (one value for the whole dataframe)
+        or, in backtesting, the recorded snapshot of every candle (one value per candle).
+        """
+        if self.order_book_replay is not None:
+            return self.order_book_replay.frames(metadata['pair'], dataframe['date'],
+                                                 offset=self.candle_duration)
+
+        return self.order_books.get(self.dp, metadata['pair'], settings.order_book_depth)
+
+    def leverage(self, pair: str, current_time: datetime, current_rate: float,
+                 proposed_leverage: float, max_leverage: float, entry_tag: Optional[str], side: str,
+                 **kwargs) -> float:
+        settings = self.pair_settings.get(pair)
+        return settings.leverage_ratio if settings is not None else 1.0
+    
+    def custom_stoploss(self, pair: str, trade: Trade, current_time: datetime,
+                        current_rate: float, current_profit: float, after_fill: bool,
+                        **kwargs) -> Optional[float]:
+        try:
+            return self.exit_ladder.custom_stoploss(trade, current_rate, current_profit)
+        except Exception as e:
+            self.logger.info(f"Error occured during custom stoploss definition: {str(e)}")
+            return None
+    
+    def adjust_trade_position(self, trade: Trade, current_time: datetime,
+                              current_rate: float, current_profit: float,
+                              min_stake: Optional[float], max_stake: float,
+                              current_entry_rate: float, current_exit_rate: float,
+                              current_entry_profit: float, current_exit_profit: float,
+                              **kwargs
+                              ) -> Union[Optional[float], Tuple[Optional[float], Optional[str]]]:
+        try:
+            return self.exit_ladder.adjust_trade_position(trade, current_rate)
+        except Exception as e:
+            self.logger.info(f"Error occured during trade position adjustment: {str(e)}")
+            return None
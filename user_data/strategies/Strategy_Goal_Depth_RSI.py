@@ -0,0 +1,218 @@
+# --- Do not remove these libs ---
+import datetime
+import logging
+import sys
+from pathlib import Path
+from typing import Optional, Tuple, Union
+from freqtrade.strategy import IStrategy, stoploss_from_open
+from pandas import DataFrame
+from freqtrade.persistence import Trade
+
+import talib.abstract as ta
+sys.path.append(str(Path(__file__).resolve().parent))
+from shared.orderbook import OrderBookAnalytics  # noqa: E402
+from shared.orderbook_features import DepthFeatures  # noqa: E402
+from shared.exit_ladder import ExitLadder, TradeState  # noqa: E402
+from shared.pair_settings import PairSettings  # noqa: E402
+from shared.diagnostics import Diagnostics  # noqa: E402
+from shared.decision_trace import DecisionTrace  # noqa: E402
+
+class SettingsObject:
+    bids_ask_delta: float
+    depth: int
+    volume_threshold: int
+    
+    def __init__(self, bids_ask_delta: float, depth: int, volume_threshold: int):
+        self.bids_ask_delta = bids_ask_delta
+        self.depth = depth
+        self.volume_threshold = volume_threshold
+        
+
+class Strategy_Goal_Depth_RSI(IStrategy):
+    """
+    Strategy_Goal_Depth_RSI
+    author@: Yurii Udaltsov
+    github@: https://github.com/freqtrade/freqtrade-strategies
+
+    Trades every coin of PAIR_SETTINGS with the settings of its row, in one bot.
+    The class stoploss is the widest of the rows, tighter ones are applied by custom_stoploss.
+
+    How to use it?
+    > python3 ./freqtrade/main.py -s Strategy_Goal_Depth_RSI
+    """
+
+    INTERFACE_VERSION: int = 3
+    
+    STRATEGY_SHEET_NAME = "DepthSpot"
+    
+    # Settings per coin (see shared/pair_settings.py), the row's STRATEGY_SETTINGS per timeframe
+    PAIR_SETTINGS = {
+        'INJ': dict(STRATEGY_SETTINGS={
+            "5m": SettingsObject(1.3, 15 , 500),
+            "30m": SettingsObject(1.3, 15 , 1000),
+            "1h": SettingsObject(1.3, 20, 1000)
+        }),
+        'SOL': dict(STRATEGY_SETTINGS={
+            "5m": SettingsObject(1.3, 15 , 500),
+            "1h": SettingsObject(1.3, 20 , 500)
+        }, stoploss=-0.02, target_percent=0.06, target_stage_1=0.02, target_stage_2=0.04, rsi_buy=35),
+        'SUI': dict(STRATEGY_SETTINGS={
+            "5m": SettingsObject(1.3, 15 , 40000)
+        }, stoploss=-0.02, target_percent=0.06, target_stage_1=0.02, target_stage_2=0.04, rsi_buy=35),
+    }
+    
+    position_adjustment_enable = True
+
+    # Оптимальний стоп-лосс або %max, розроблений для стратегії
+    stoploss = -0.03
+    
+    use_custom_stoploss = True
+
+    # запускати "populate_indicators" тільки для нової свічки
+    process_only_new_candles = True
+
+    # Експериментальні параметри (конфігурація має перевагу над ними, якщо встановлено)
+    use_exit_signal = True
+    exit_profit_only = False
+
+    # Optional order type mapping
+    order_types = {
+        'entry': 'limit',
+        'exit': 'limit',
+        'stoploss': 'market',
+        'stoploss_on_exchange': False
+    }
+    
+    rsi_depth = 14
+    rsi_buy = 30
+    
+    # Settings for target reaching logic
+    target_percent = 0.09
+    
+    target_stage_1 = 0.03
+    target_stage_2 = 0.06
+    
+    stage_1_sell_amount = 0.2
+    stage_2_sell_amount = 0.3
+
+    
+    def bot_start(self, **kwargs) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.diagnostics = Diagnostics(self.logger, sample_rate=self.config.get('diagnostics_sample_rate', 0),
+                                       trace=DecisionTrace.for_strategy(self))
+        self.trade_state = TradeState(self.logger)
+        self.trade_state.load_open_trades()
+
+        self.pair_settings = PairSettings(self, self.PAIR_SETTINGS, self.timeframe, logger=self.logger)
+        self.pair_settings.index_whitelist(self.dp)
+        for settings in self.pair_settings:
+            settings.exit_ladder = ExitLadder(
+                stages=[(settings.target_stage_1, settings.stage_1_sell_amount),
+                        (settings.target_stage_2, settings.stage_2_sell_amount)],
+                final_target=settings.target_percent, state=self.trade_state, logger=self.logger)
+            settings.depth_features = DepthFeatures(
+                depths=(settings.depth,), thresholds=(settings.volume_threshold,))
+        
+    def bot_loop_start(self, current_time: datetime, **kwargs) -> None:
+        # Write the trade state changed during the last iteration
+        self.trade_state.flush()
+        self.diagnostics.flush_due()
+
+    @property
+    def plot_config(self):
+        plot_config = {}
+        plot_config['main_plot'] = {}
+        plot_config['subplots'] = {
+            # Additional subplot RSI
+            "RSI": {
+                'rsi': {'color': 'red'}
+            }
+        }
+
+        return plot_config
+
+    def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        """
+        Додає індикатор RSI до таблиці `dataframe`.
+        """
+        dataframe['rsi'] = ta.RSI(dataframe, timeperiod=self.rsi_depth)  # Розрахунок RSI за 14 періодів
+        settings = self.pair_settings.get(metadata['pair'])
+        if settings is None:
+            return dataframe
+
+        order_book = OrderBookAnalytics(self.dp.orderbook(metadata['pair'], settings.depth + 1))
+
+        # depth_imbalance_*, large_bid_count_* and large_ask_count_* columns
+        dataframe = settings.depth_features.populate(dataframe, metadata['pair'], order_book)
+        return dataframe
+
+    def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        """
+        Generates buy signal based on EMA indicators
+        A buy signal is generated when EMA 15 crosses above EMA 30
+        """
+        settings = self.pair_settings.get(metadata['pair'])
+        if settings is None:
+            return dataframe
+        
+        depth_value = dataframe[f'depth_imbalance_{settings.depth}'] > settings.bids_ask_delta
+        large_orders_value = (dataframe[f'large_bid_count_{settings.volume_threshold}'] +
+                              dataframe[f'large_ask_count_{settings.volume_threshold}'] > 0)
+        volume_value = dataframe['volume'] > dataframe['volume'].shift(1)
+        close_value = dataframe['close'] < dataframe['close'].shift(1)
+        rsi = dataframe['rsi'] < settings.rsi_buy
+        
+        entry = (depth_value) & (large_orders_value) & (volume_value) & (close_value) & (rsi)
+        self.diagnostics.record('entry', metadata['pair'], date=dataframe['date'], depth=depth_value,
+                                large_orders=large_orders_value, volume=volume_value, close=close_value,
+                                rsi=dataframe['rsi'], rsi_buy=rsi, signal=entry)
+
+        dataframe.loc[entry, 'enter_long'] = 1
+        
+        return dataframe
+
+
+    def populate_exit_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        
+        # Вихід по RSI
+        dataframe.loc[
+            (dataframe['rsi'] > 70) &  
+            (dataframe['volume'] > 0),  
+            'exit_long'
+            ] = 1
+
+        return dataframe
+
+    def custom_stoploss(self, pair: str, trade: Trade, current_time: datetime,
+                        current_rate: float, current_profit: float, after_fill: bool,
+                        **kwargs) -> Optional[float]:
+        try:
+            settings = self.pair_settings.get(pair)
+            if settings is None:
+                return None
+
+            stoploss = settings.exit_ladder.custom_stoploss(trade, current_rate, current_profit)
+            if stoploss is None and settings.stoploss > self.stoploss:
+                # Coin with a tighter stoploss than the class one
+                stoploss = stoploss_from_open(settings.stoploss, current_profit,
+                                              is_short=trade.is_short, leverage=trade.leverage)
+            return stoploss
+        except Exception as e:
+            self.logger.info(f"Error occured during custom stoploss definition: {str(e)}")
+            return None
+    
+    def adjust_trade_position(self, trade: Trade, current_time: datetime,
+                              current_rate: float, current_profit: float,
+                              min_stake: Optional[float], max_stake: float,
+                              current_entry_rate: float, current_exit_rate: float,
+                              current_entry_profit: float, current_exit_profit: float,
+                              **kwargs
+                              ) -> Union[Optional[float], Tuple[Optional[float], Optional[str]]]:
+        try:
+            settings = self.pair_settings.get(trade.pair)
+            if settings is None:
+                return None
+            return settings.exit_ladder.adjust_trade_position(trade, current_rate)
+        except Exception as e:
+            self.logger.info(f"Error occured during trade position adjustment: {str(e)}")
+            return None
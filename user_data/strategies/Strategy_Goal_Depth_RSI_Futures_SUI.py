@@ -1,13 +1,21 @@
 # --- Do not remove these libs ---
 import datetime
 import logging
+import sys
+from pathlib import Path
 from typing import Optional, Tuple, Union
 from freqtrade.strategy import IStrategy, informative
 from pandas import DataFrame
 from freqtrade.persistence import Trade
-from freqtrade.strategy import stoploss_from_open
 import talib.abstract as ta
 # --------------------------------
+sys.path.append(str(Path(__file__).resolve().parent))
+from shared.orderbook import OrderBookAnalytics  # noqa: E402
+from shared.orderbook_features import DepthFeatures  # noqa: E402
+from shared.exit_ladder import ExitLadder  # noqa: E402
+from shared.pair_settings import PairSettings  # noqa: E402
+from shared.diagnostics import Diagnostics  # noqa: E402
+from shared.decision_trace import DecisionTrace  # noqa: E402
 
 class SettingsObject:
     bids_ask_delta: float
@@ -31,9 +39,6 @@ class Strategy_Goal_Depth_RSI_Futures_SUI(IStrategy):
     """
 
     INTERFACE_VERSION: int = 3
-    BE_ACTIVATED: str = "be_activated"
-    STAGE_1_SOLD: str = "stage_1_sold"
-    STAGE_2_SOLD: str = "stage_2_sold"
     
     # Налаштування для глибини ринку та аналізу обсягів
     STRATEGY_SETTINGS = {
@@ -89,7 +94,19 @@ class Strategy_Goal_Depth_RSI_Futures_SUI(IStrategy):
     
     def bot_start(self, **kwargs) -> None:
         self.logger = logging.getLogger(__name__)
-        self.settings = self.STRATEGY_SETTINGS[self.timeframe]
+        self.diagnostics = Diagnostics(self.logger, sample_rate=self.config.get('diagnostics_sample_rate', 0),
+                                       trace=DecisionTrace.for_strategy(self))
+        self.exit_ladder = ExitLadder(
+            stages=[(self.target_stage_1, self.stage_1_sell_amount),
+                    (self.target_stage_2, self.stage_2_sell_amount)],
+            final_target=self.target_percent, logger=self.logger)
+        self.exit_ladder.state.load_open_trades()
+        # Settings per (pair, timeframe), resolved once for the whole whitelist
+        self.pair_settings = PairSettings(self, timeframe=self.timeframe, logger=self.logger)
+        self.pair_settings.index_whitelist(self.dp)
+        for settings in self.pair_settings:
+            settings.depth_features = DepthFeatures(
+                depths=(settings.depth,), thresholds=(settings.volume_threshold,))
         
     # @informative(timeframe, candle_type="funding_rate")
     # def populate_indicators_funding_rate(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
@@ -97,9 +114,22 @@ class Strategy_Goal_Depth_RSI_Futures_SUI(IStrategy):
     #     dataframe['funding_rate'] = dataframe['open']
     #     return dataframe
 
+    def bot_loop_start(self, current_time: datetime, **kwargs) -> None:
+        # Write the trade state changed during the last iteration
+        self.exit_ladder.state.flush()
+        self.diagnostics.flush_due()
+
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         
         dataframe['rsi'] = ta.RSI(dataframe, timeperiod=self.rsi_period)  # Розрахунок RSI за 14 періодів
+        settings = self.pair_settings.get(metadata['pair'])
+        if settings is None:
+            return dataframe
+
+        order_book = OrderBookAnalytics(self.dp.orderbook(metadata['pair'], settings.depth + 1))
+
+        # depth_imbalance_*, large_bid_count_* and large_ask_count_* columns
+        dataframe = settings.depth_features.populate(dataframe, metadata['pair'], order_book)
         return dataframe
     
     @property
@@ -116,31 +146,37 @@ class Strategy_Goal_Depth_RSI_Futures_SUI(IStrategy):
         return plot_config
 
     def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        order_book = self.dp.orderbook(metadata['pair'], self.settings.depth + 1)
-    
+        settings = self.pair_settings.get(metadata['pair'])
+        if settings is None:
+            return dataframe
+
         # Умови входу за книгою ордерів
-        depth_value = self.check_depth_of_market(order_book,self.settings.bids_ask_delta, self.settings.depth)
-        large_orders_value = self.analyze_large_orders(order_book, self.settings.volume_threshold)
+        depth_value = dataframe[f'depth_imbalance_{settings.depth}'] > settings.bids_ask_delta
+        large_orders_value = (dataframe[f'large_bid_count_{settings.volume_threshold}'] +
+                              dataframe[f'large_ask_count_{settings.volume_threshold}'] > 0)
         volume_value = dataframe['volume'] > dataframe['volume'].shift(1)
         close_value = dataframe['close'] < dataframe['close'].shift(1)
         rsi_condition = dataframe['rsi'] < self.rsi_buy_threshold  # Вхід у лонг при RSI < 35
-        
-        self.logger.info(f"Depth check: {depth_value}, large orders check: {large_orders_value}, volume check: {volume_value.tail(2)}, close check: {close_value.tail(2)}, rsi check: {dataframe[['date', 'rsi']].tail(2)}")
-
-        # Лонг позиція
-        dataframe.loc[
-            (depth_value) & (large_orders_value) & (volume_value) & (close_value) & (rsi_condition),
-            'enter_long'
-        ] = 1
 
         # Умови на шорт
         rsi_condition_short = dataframe['rsi'] > self.rsi_sell_threshold  # Вхід у шорт при RSI > 70
         close_value_short = dataframe['close'] > dataframe['close'].shift(1)
 
-        dataframe.loc[
-            (depth_value) & (large_orders_value) & (volume_value) & (close_value_short) & (rsi_condition_short),
-            'enter_short'
-        ] = 1
+        entry_long = (depth_value) & (large_orders_value) & (volume_value) & (close_value) & (rsi_condition)
+        entry_short = ((depth_value) & (large_orders_value) & (volume_value) &
+                       (close_value_short) & (rsi_condition_short))
+
+        self.diagnostics.record('entry', metadata['pair'], date=dataframe['date'], depth=depth_value,
+                                large_orders=large_orders_value, volume=volume_value, close=close_value,
+                                rsi=dataframe['rsi'], rsi_buy=rsi_condition, signal=entry_long,
+                                close_short=close_value_short, rsi_sell=rsi_condition_short,
+                                signal_short=entry_short)
+
+        # Лонг позиція
+        dataframe.loc[entry_long, 'enter_long'] = 1
+
+        # Шорт позиція
+        dataframe.loc[entry_short, 'enter_short'] = 1
 
         return dataframe
 
@@ -163,25 +199,6 @@ class Strategy_Goal_Depth_RSI_Futures_SUI(IStrategy):
 
         return dataframe
 
-
-    def check_depth_of_market(self, order_book, bids_to_ask_delta=1.3, depth=7, is_short=False) -> bool:
-        if len(order_book['bids']) < depth or len(order_book['asks']) < depth:
-            return False
-        
-        total_bids = sum([bid[1] for bid in order_book['bids'][:depth]])
-        total_asks = sum([ask[1] for ask in order_book['asks'][:depth]])
-        
-        if is_short:
-            return ( total_asks / total_bids ) > bids_to_ask_delta  
-        else:
-            return ( total_bids / total_asks ) > bids_to_ask_delta  
-
-    def analyze_large_orders(self, order_book, volume_threshold ) -> bool:
-        large_orders = [order for order in order_book['bids'] if order[1] >= volume_threshold] + \
-                       [order for order in order_book['asks'] if order[1] >= volume_threshold]
-        
-        return len(large_orders) > 0
-    
     def leverage(self, pair: str, current_time: datetime, current_rate: float,
                  proposed_leverage: float, max_leverage: float, entry_tag: Optional[str], side: str,
                  **kwargs) -> float:
@@ -192,21 +209,7 @@ class Strategy_Goal_Depth_RSI_Futures_SUI(IStrategy):
                         current_rate: float, current_profit: float, after_fill: bool,
                         **kwargs) -> Optional[float]:
         try:
-            be_activated = trade.get_custom_data(self.BE_ACTIVATED, default=False)
-            
-            current_price_rate = 0
-            if trade.is_short:
-                current_price_rate = trade.open_rate / current_rate - 1
-            else:
-                current_price_rate = current_rate / trade.open_rate - 1
-
-            if be_activated or current_price_rate >= self.target_stage_1:
-                if not be_activated: 
-                    trade.set_custom_data(self.BE_ACTIVATED, True)
-                    
-                return stoploss_from_open(0.002, current_profit, is_short=trade.is_short, leverage=trade.leverage)
-
-            return None
+            return self.exit_ladder.custom_stoploss(trade, current_rate, current_profit)
         except Exception as e:
             self.logger.info(f"Error occured during custom stoploss definition: {str(e)}")
             return None
@@ -219,30 +222,7 @@ class Strategy_Goal_Depth_RSI_Futures_SUI(IStrategy):
                               **kwargs
                               ) -> Union[Optional[float], Tuple[Optional[float], Optional[str]]]:
         try:
-            stage_1_sold = trade.get_custom_data(self.STAGE_1_SOLD, default=False)
-            stage_2_sold = trade.get_custom_data(self.STAGE_2_SOLD, default=False)
-            
-            current_price_rate = 0
-            if trade.is_short:
-                current_price_rate = trade.open_rate / current_rate - 1
-            else:
-                current_price_rate = current_rate / trade.open_rate - 1
-            
-            self.logger.info(f"Check for goal to be closed, price rate {current_price_rate}.")
-            
-            if not stage_1_sold and current_price_rate >= self.target_stage_1:
-                self.logger.info(f"Price rise up bigger than {self.target_stage_1}, closing first target {self.stage_1_sell_amount}.")
-                trade.set_custom_data(self.STAGE_1_SOLD, True)
-                return - ( trade.stake_amount * self.stage_1_sell_amount )
-            elif not stage_2_sold and current_price_rate >= self.target_stage_2:
-                self.logger.info(f"Price rise up bigger than {self.target_stage_2}, closing second target {self.stage_2_sell_amount}.")
-                trade.set_custom_data(self.STAGE_2_SOLD, True)
-                return - ( trade.stake_amount * self.stage_2_sell_amount )
-            elif current_price_rate >= self.target_percent:
-                self.logger.info(f"Price rise up bigger than {self.target_percent}, closing order.")
-                return - trade.stake_amount
-            else:
-                return None
+            return self.exit_ladder.adjust_trade_position(trade, current_rate)
         except Exception as e:
             self.logger.info(f"Error occured during trade position adjustment: {str(e)}")
-            return None
\ No newline at end of file
+            return None
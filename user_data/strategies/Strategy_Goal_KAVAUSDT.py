@@ -7,7 +7,10 @@ import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 from pandas import DataFrame
 from freqtrade.persistence import Trade
-from freqtrade.strategy import stoploss_from_open
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent))
+from shared.exit_ladder import ExitLadder  # noqa: E402
 # --------------------------------
 
 class Strategy_Goal_KAVAUSDT(IStrategy):
@@ -21,10 +24,6 @@ class Strategy_Goal_KAVAUSDT(IStrategy):
     """
 
     INTERFACE_VERSION: int = 3
-    BE_ACTIVATED: str = "be_activated"
-    STAGE_1_SOLD: str = "stage_1_sold"
-    STAGE_2_SOLD: str = "stage_2_sold"
-    STAGE_3_SOLD: str = "stage_3_sold"
     
     position_adjustment_enable = True
 
@@ -70,6 +69,16 @@ class Strategy_Goal_KAVAUSDT(IStrategy):
     
     def bot_start(self, **kwargs) -> None:
         self.logger = logging.getLogger(__name__)
+        self.exit_ladder = ExitLadder(
+            stages=[(self.target_percent * self.target_stage_1, self.stage_1_sell_amount),
+                    (self.target_percent * self.target_stage_2, self.stage_2_sell_amount),
+                    (self.target_percent * self.target_stage_3, self.stage_3_sell_amount)],
+            final_target=self.target_percent, logger=self.logger)
+        self.exit_ladder.state.load_open_trades()
+
+    def bot_loop_start(self, current_time: datetime, **kwargs) -> None:
+        # Write the trade state changed during the last iteration
+        self.exit_ladder.state.flush()
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
@@ -113,17 +122,7 @@ class Strategy_Goal_KAVAUSDT(IStrategy):
                         current_rate: float, current_profit: float, after_fill: bool,
                         **kwargs) -> Optional[float]:
         try:
-            be_activated = trade.get_custom_data(self.BE_ACTIVATED, default=False)
-            
-            current_price_rate = current_rate / trade.open_rate - 1
-
-            if be_activated or current_price_rate >= self.target_percent * self.target_stage_1:
-                if not be_activated: 
-                    trade.set_custom_data(self.BE_ACTIVATED, True)
-                    
-                return stoploss_from_open(0.002, current_profit, is_short=trade.is_short, leverage=trade.leverage)
-
-            return None
+            return self.exit_ladder.custom_stoploss(trade, current_rate, current_profit)
         except Exception as e:
             self.logger.info(f"Error occured during custom stoploss definition: {str(e)}")
             return None
@@ -136,31 +135,7 @@ class Strategy_Goal_KAVAUSDT(IStrategy):
                               **kwargs
                               ) -> Union[Optional[float], Tuple[Optional[float], Optional[str]]]:
         try:
-            stage_1_sold = trade.get_custom_data(self.STAGE_1_SOLD, default=False)
-            stage_2_sold = trade.get_custom_data(self.STAGE_2_SOLD, default=False)
-            stage_3_sold = trade.get_custom_data(self.STAGE_3_SOLD, default=False)
-            
-            current_price_rate = current_rate / trade.open_rate - 1
-            
-            
-            self.logger.info(f"Check for goal to be closed, price rate {current_price_rate}")
-            
-            if not stage_1_sold and current_price_rate >= self.target_percent * self.target_stage_1:
-                self.logger.info(f"Price rise up bigger than {self.target_percent * self.target_stage_1}, closing first target {self.stage_1_sell_amount}")
-                trade.set_custom_data(self.STAGE_1_SOLD, True)
-                return - ( trade.stake_amount * self.stage_1_sell_amount )
-            elif not stage_2_sold and current_price_rate >= self.target_percent * self.target_stage_2:
-                self.logger.info(f"Price rise up bigger than {self.target_percent * self.target_stage_2}, closing second target {self.stage_2_sell_amount}")
-                trade.set_custom_data(self.STAGE_2_SOLD, True)
-                return - ( trade.stake_amount * self.stage_2_sell_amount )
-            elif not stage_3_sold and current_price_rate >= self.target_percent * self.target_stage_3:
-                self.logger.info(f"Price rise up bigger than {self.target_percent * self.target_stage_3}, closing third target {self.stage_3_sell_amount}")
-                trade.set_custom_data(self.STAGE_3_SOLD, True)
-                return - ( trade.stake_amount * self.stage_3_sell_amount )
-            elif current_price_rate >= self.target_percent:
-                return - trade.stake_amount
-            else:
-                return None
+            return self.exit_ladder.adjust_trade_position(trade, current_rate)
         except Exception as e:
             self.logger.info(f"Error occured during trade position adjustment: {str(e)}")
-            return None
\ No newline at end of file
+            return None
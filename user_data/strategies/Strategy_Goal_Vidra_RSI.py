@@ -0,0 +1,180 @@
+# --- Do not remove these libs ---
+import datetime
+import logging
+import sys
+from pathlib import Path
+from typing import Optional, Tuple, Union
+from freqtrade.strategy import IStrategy, stoploss_from_open
+from pandas import DataFrame
+from freqtrade.persistence import Trade
+import talib.abstract as ta
+sys.path.append(str(Path(__file__).resolve().parent))
+from shared.orderbook import OrderBookAnalytics  # noqa: E402
+from shared.exit_ladder import ExitLadder  # noqa: E402
+from shared.pair_settings import PairSettings  # noqa: E402
+from shared.diagnostics import Diagnostics  # noqa: E402
+from shared.decision_trace import DecisionTrace  # noqa: E402
+
+
+class SettingsObject:
+    bids_ask_delta: float
+    depth: int
+    volume_threshold: int
+    
+    def __init__(self, bids_ask_delta: float, depth: int, volume_threshold: int):
+        self.bids_ask_delta = bids_ask_delta
+        self.depth = depth
+        self.volume_threshold = volume_threshold
+        
+
+
+class Strategy_Goal_Vidra_RSI(IStrategy):
+    """
+    Strategy_Goal_Vidra_RSI
+    author@: Yurii Udaltsov and Illia
+    github@: https://github.com/freqtrade/freqtrade-strategies
+
+    Trades every coin of PAIR_SETTINGS with the settings of its row, in one bot.
+    The class stoploss is the widest of the rows, tighter ones are applied by custom_stoploss.
+
+    How to use it?
+    > python3 ./freqtrade/main.py -s Strategy_Goal_Vidra_RSI
+    """
+
+    INTERFACE_VERSION: int = 3
+    
+    STRATEGY_SHEET_NAME = "DepthSpot"
+    
+    # Settings per coin (see shared/pair_settings.py), the row's STRATEGY_SETTINGS per timeframe
+    PAIR_SETTINGS = {
+        'INJ': dict(STRATEGY_SETTINGS={
+            "5m": SettingsObject(1.3, 15, 500),
+            "30m": SettingsObject(1.3, 15, 1000)
+        }, stoploss=-0.04),
+        'SUI': dict(STRATEGY_SETTINGS={
+            "5m": SettingsObject(1.3, 15, 20000)
+        }),
+    }
+    
+    position_adjustment_enable = True
+
+    # Оптимальний стоп-лосс або %max, розроблений для стратегії
+    stoploss = -0.1
+    
+    use_custom_stoploss = True
+
+    # запускати "populate_indicators" тільки для нової свічки
+    process_only_new_candles = True
+
+    # Експериментальні параметри (конфігурація має перевагу над ними, якщо встановлено)
+    use_exit_signal = True
+    exit_profit_only = False
+
+    # Optional order type mapping
+    order_types = {
+        'entry': 'limit',
+        'exit': 'limit',
+        'stoploss': 'market',
+        'stoploss_on_exchange': False
+    }
+    
+    # Settings for target reaching logic
+    target_percent = 0.08
+    
+    target_stage_1 = 0.02
+    target_stage_2 = 0.04
+    
+    stage_1_sell_amount = 0.2
+    stage_2_sell_amount = 0.3
+    
+    
+    # Step buying (DCA) settings
+    dca_levels = [-0.02, -0.04, -0.06, -0.08]  # Levels for additional buy-ins
+    dca_buy_amounts = [0.15, 0.15, 0.10, 0.10]  # Buy amounts for each level
+    
+    rsi_buy_threshold = 35  # Порогове значення для покупки по RSI
+    rsi_sell_threshold = 70  # Порогове значення для продажу по RSI
+
+
+    def bot_start(self, **kwargs) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.diagnostics = Diagnostics(self.logger, sample_rate=self.config.get('diagnostics_sample_rate', 0),
+                                       trace=DecisionTrace.for_strategy(self))
+        self.exit_ladder = ExitLadder(
+            stages=[(self.target_stage_1, self.stage_1_sell_amount),
+                    (self.target_stage_2, self.stage_2_sell_amount)],
+            final_target=self.target_percent,
+            dca=list(zip(self.dca_levels, self.dca_buy_amounts)), logger=self.logger)
+        self.exit_ladder.state.load_open_trades()
+        
+        # Settings per (pair, timeframe), resolved once for the whole whitelist
+        self.pair_settings = PairSettings(self, self.PAIR_SETTINGS, self.timeframe, logger=self.logger)
+        self.pair_settings.index_whitelist(self.dp)
+
+    def bot_loop_start(self, current_time: datetime, **kwargs) -> None:
+        # Write the trade state changed during the last iteration
+        self.exit_ladder.state.flush()
+        self.diagnostics.flush_due()
+
+    def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        dataframe['rsi'] = ta.RSI(dataframe, timeperiod=14)
+        return dataframe
+
+    def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        """
+        Generates buy signal based on EMA indicators
+        A buy signal is generated when EMA 15 crosses above EMA 30
+        """
+        settings = self.pair_settings.get(metadata['pair'])
+        if settings is None:
+            return dataframe
+        
+        order_book = OrderBookAnalytics(self.dp.orderbook(metadata['pair'], settings.depth + 1), logger=self.logger)
+
+        depth_value = order_book.check_depth(settings.depth, settings.bids_ask_delta)
+        large_orders_value = order_book.has_large_orders(settings.volume_threshold)
+        volume_value = dataframe['volume'] > dataframe['volume'].shift(1)
+        close_value = dataframe['close'] < dataframe['close'].shift(1)
+        rsi_buy_condition = dataframe['rsi'] < self.rsi_buy_threshold
+        
+        entry = (depth_value) & (large_orders_value) & (volume_value) & (close_value) & (rsi_buy_condition)
+        self.diagnostics.record('entry', metadata['pair'], date=dataframe['date'], depth=depth_value,
+                                large_orders=large_orders_value, volume=volume_value, close=close_value,
+                                rsi=dataframe['rsi'], rsi_buy=rsi_buy_condition, signal=entry)
+
+        dataframe.loc[entry, 'enter_long'] = 1
+
+        return dataframe
+
+
+    def populate_exit_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        dataframe.loc[
+            (dataframe['rsi'] > self.rsi_sell_threshold),
+            'exit_long'
+        ] = 1
+
+        return dataframe
+
+    def custom_stoploss(self, pair: str, trade: Trade, current_time: datetime,
+                        current_rate: float, current_profit: float, after_fill: bool,
+                        **kwargs) -> Optional[float]:
+        settings = self.pair_settings.get(pair)
+        if settings is None or settings.stoploss <= self.stoploss:
+            return None
+
+        # Coin with a tighter stoploss than the class one
+        return stoploss_from_open(settings.stoploss, current_profit,
+                                  is_short=trade.is_short, leverage=trade.leverage)
+
+    def adjust_trade_position(self, trade: Trade, current_time: datetime,
+                              current_rate: float, current_profit: float,
+                              min_stake: Optional[float], max_stake: float,
+                              current_entry_rate: float, current_exit_rate: float,
+                              current_entry_profit: float, current_exit_profit: float,
+                              **kwargs
+                              ) -> Union[Optional[float], Tuple[Optional[float], Optional[str]]]:
+        try:
+            return self.exit_ladder.adjust_trade_position(trade, current_rate)
+        except Exception as e:
+            self.logger.info(f"Error occured during trade position adjustment: {str(e)}")
+            return None
@@ -1,11 +1,18 @@
 # --- Do not remove these libs ---
 import datetime
 import logging
+import sys
+from pathlib import Path
 from typing import Optional, Tuple, Union
 from freqtrade.strategy import IStrategy
 from pandas import DataFrame
 from freqtrade.persistence import Trade
 import talib.abstract as ta
+sys.path.append(str(Path(__file__).resolve().parent))
+from shared.orderbook import OrderBookAnalytics  # noqa: E402
+from shared.pair_settings import PairSettings  # noqa: E402
+from shared.diagnostics import Diagnostics  # noqa: E402
+from shared.decision_trace import DecisionTrace  # noqa: E402
 
 
 class SettingsObject:
@@ -87,8 +94,16 @@ class Strategy_Goal_Vidra_RSI_Trend(IStrategy):
 
     def bot_start(self, **kwargs) -> None:
         self.logger = logging.getLogger(__name__)
+        self.diagnostics = Diagnostics(self.logger, sample_rate=self.config.get('diagnostics_sample_rate', 0),
+                                       trace=DecisionTrace.for_strategy(self))
 
-        self.settings = self.STRATEGY_SETTINGS[self.timeframe]
+        # Settings per (pair, timeframe), resolved once for the whole whitelist
+        self.pair_settings = PairSettings(self, timeframe=self.timeframe, logger=self.logger)
+        self.pair_settings.index_whitelist(self.dp)
+
+    def bot_loop_start(self, current_time: datetime, **kwargs) -> None:
+        # Write the decision trace buffered for longer than its flush_interval
+        self.diagnostics.flush_due()
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         # RSI
@@ -118,6 +133,9 @@ class Strategy_Goal_Vidra_RSI_Trend(IStrategy):
         """
         Entry conditions with trend filters.
         """
+        settings = self.pair_settings.get(metadata['pair'])
+        if settings is None:
+            return dataframe
 
         # Фільтри тренду
         trend_condition = (
@@ -127,30 +145,30 @@ class Strategy_Goal_Vidra_RSI_Trend(IStrategy):
             (dataframe['adx'] > self.adx_threshold)  # Сильний тренд
         )
 
-        order_book = self.dp.orderbook(metadata['pair'], self.settings.depth + 1)
+        order_book = OrderBookAnalytics(self.dp.orderbook(metadata['pair'], settings.depth + 1), logger=self.logger)
 
-        depth_value = self.check_depth_of_market(order_book, self.settings.depth, self.settings.bids_ask_delta)
-        large_orders_value = self.analyze_large_orders(order_book, self.settings.volume_threshold)
+        depth_value = order_book.check_depth(settings.depth, settings.bids_ask_delta)
+        large_orders_value = order_book.has_large_orders(settings.volume_threshold)
         volume_value = dataframe['volume'] > dataframe['volume'].shift(1)
         close_value = dataframe['close'] < dataframe['close'].shift(1)
         rsi_buy_condition = dataframe['rsi'] < self.rsi_buy_threshold
 
         # Об'єднання всіх умов
-        dataframe.loc[
+        entry = (
             trend_condition &
             depth_value &
             large_orders_value &
             volume_value &
             close_value &
-            rsi_buy_condition,
-            'enter_long'] = 1
+            rsi_buy_condition
+        )
+        dataframe.loc[entry, 'enter_long'] = 1
 
         # Логування
-        self.logger.info(f"Entry conditions for {metadata['pair']} at {dataframe['date'].iloc[-1]}:")
-        self.logger.info(f"Trend condition: {trend_condition.iloc[-1]}")
-        self.logger.info(f"Depth check: {depth_value}, Large orders: {large_orders_value}")
-        self.logger.info(f"Volume increasing: {volume_value.iloc[-1]}, Price decreasing: {close_value.iloc[-1]}")
-        self.logger.info(f"RSI value: {dataframe['rsi'].iloc[-1]}")
+        self.diagnostics.record('entry', metadata['pair'], date=dataframe['date'], trend=trend_condition,
+                                depth=depth_value, large_orders=large_orders_value,
+                                volume=volume_value, close=close_value, rsi=dataframe['rsi'],
+                                rsi_buy=rsi_buy_condition, signal=entry)
 
         return dataframe
 
@@ -165,36 +183,11 @@ class Strategy_Goal_Vidra_RSI_Trend(IStrategy):
         dataframe.loc[exit_condition, 'exit_long'] = 1
 
         # Логування
-        self.logger.info(f"Exit conditions for {metadata['pair']} at {dataframe['date'].iloc[-1]}:")
-        self.logger.info(f"Exit condition met: {exit_condition.iloc[-1]}")
-        self.logger.info(f"RSI value: {dataframe['rsi'].iloc[-1]}")
+        self.diagnostics.record('exit', metadata['pair'], date=dataframe['date'], rsi=dataframe['rsi'],
+                                signal=exit_condition)
 
         return dataframe
 
-    def check_depth_of_market(self, order_book, depth, delta, exit=False) -> bool:
-        if len(order_book['bids']) < depth or len(order_book['asks']) < depth:
-            return False
-
-        total_bids = sum([bid[1] for bid in order_book['bids'][:depth]])
-        total_asks = sum([ask[1] for ask in order_book['asks'][:depth]])
-
-        ratio = total_bids / total_asks if total_asks != 0 else 0
-        self.logger.info(f"Analyzing depth of market... Total bids/asks ratio: {ratio}, Configured delta: {delta}")
-
-        if exit:
-            return (total_asks / total_bids) > delta
-        else:
-            return ratio > delta
-
-    def analyze_large_orders(self, order_book, threshold) -> bool:
-        large_bids = [order for order in order_book['bids'] if order[1] >= threshold]
-        large_asks = [order for order in order_book['asks'] if order[1] >= threshold]
-        large_orders = large_bids + large_asks
-
-        self.logger.info(f"Analyzing large orders for threshold {threshold}, found {len(large_orders)} large orders")
-
-        return len(large_orders) > 0
-
     def adjust_trade_position(self, trade: Trade, current_time: datetime.datetime,
                               current_rate: float, current_profit: float,
                               min_stake: Optional[float], max_stake: float,
@@ -204,8 +197,8 @@ class Strategy_Goal_Vidra_RSI_Trend(IStrategy):
                               ) -> Union[Optional[float], Tuple[Optional[float], Optional[str]]]:
         try:
             current_price_rate = current_rate / trade.open_rate - 1
-            self.logger.info(f"Adjusting trade position for {trade.pair} at {current_time}")
-            self.logger.info(f"Current price rate: {current_price_rate:.4f}, Current profit: {current_profit:.4f}")
+            self.logger.debug("Adjusting trade position for %s at %s, current price rate: %.4f, current profit: %.4f",
+                              trade.pair, current_time, current_price_rate, current_profit)
 
             # Check if DCA levels are hit
             for level, amount in zip(self.dca_levels, self.dca_buy_amounts):
@@ -1,11 +1,19 @@
 # --- Do not remove these libs ---
 import datetime
 import logging
+import sys
+from pathlib import Path
 from typing import Optional, Tuple, Union
 from freqtrade.strategy import IStrategy, informative
 from pandas import DataFrame
 from freqtrade.persistence import Trade
 import talib.abstract as ta
+sys.path.append(str(Path(__file__).resolve().parent))
+from shared.orderbook import OrderBookAnalytics  # noqa: E402
+from shared.exit_ladder import ExitLadder, STAGE_SOLD  # noqa: E402
+from shared.pair_settings import PairSettings  # noqa: E402
+from shared.diagnostics import Diagnostics  # noqa: E402
+from shared.decision_trace import DecisionTrace  # noqa: E402
 
 
 class SettingsObject:
@@ -31,9 +39,6 @@ class Strategy_Goal_Vidra_RSI_lim_UNI(IStrategy):
     """
 
     INTERFACE_VERSION: int = 3
-    BE_ACTIVATED: str = "be_activated"
-    STAGE_SOLD: str = "stage_{stage}_sold"
-    STAGE_BOUGHT: str = "stage_{stage}_bought"
     
     STRATEGY_SHEET_NAME = "DepthSpot"
     
@@ -84,9 +89,24 @@ class Strategy_Goal_Vidra_RSI_lim_UNI(IStrategy):
 
     def bot_start(self, **kwargs) -> None:
         self.logger = logging.getLogger(__name__)
+        self.diagnostics = Diagnostics(self.logger, sample_rate=self.config.get('diagnostics_sample_rate', 0),
+                                       trace=DecisionTrace.for_strategy(self))
+        self.exit_ladder = ExitLadder(
+            stages=[(self.target_stage_1, self.stage_1_sell_amount),
+                    (self.target_stage_2, self.stage_2_sell_amount)],
+            final_target=self.target_percent,
+            dca=list(zip(self.dca_levels, self.dca_buy_amounts)), logger=self.logger)
+        self.exit_ladder.state.load_open_trades()
         
-        self.settings = self.STRATEGY_SETTINGS[self.timeframe]
+        # Settings per (pair, timeframe), resolved once for the whole whitelist
+        self.pair_settings = PairSettings(self, timeframe=self.timeframe, logger=self.logger)
+        self.pair_settings.index_whitelist(self.dp)
         
+    def bot_loop_start(self, current_time: datetime, **kwargs) -> None:
+        # Write the trade state changed during the last iteration
+        self.exit_ladder.state.flush()
+        self.diagnostics.flush_due()
+
     @informative('1h')
     def populate_indicators_1h(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         dataframe['rsi'] = ta.RSI(dataframe, timeperiod=14)
@@ -100,20 +120,24 @@ class Strategy_Goal_Vidra_RSI_lim_UNI(IStrategy):
         Generates buy signal based on EMA indicators
         A buy signal is generated when EMA 15 crosses above EMA 30
         """
+        settings = self.pair_settings.get(metadata['pair'])
+        if settings is None:
+            return dataframe
         
-        order_book = self.dp.orderbook(metadata['pair'], self.settings.depth + 1)
+        order_book = OrderBookAnalytics(self.dp.orderbook(metadata['pair'], settings.depth + 1), logger=self.logger)
 
-        depth_value = self.check_depth_of_market(order_book, self.settings.depth, self.settings.bids_ask_delta)
-        large_orders_value = self.analyze_large_orders(order_book, self.settings.volume_threshold)
+        depth_value = order_book.check_depth(settings.depth, settings.bids_ask_delta)
+        large_orders_value = order_book.has_large_orders(settings.volume_threshold)
         volume_value = dataframe['volume'] > dataframe['volume'].shift(1)
         close_value = dataframe['close'] < dataframe['close'].shift(1)
         rsi_buy_condition = dataframe['rsi_1h'] < self.rsi_buy_threshold
         
-        self.logger.info(f"Depth check: {depth_value}, large orders check: {large_orders_value}, volume check: {volume_value.tail(2)}, close check: {close_value.tail(2)}, rsi check: {dataframe[['date', 'rsi_1h']].tail(2)}")
+        entry = (depth_value) & (large_orders_value) & (volume_value) & (close_value) & (rsi_buy_condition)
+        self.diagnostics.record('entry', metadata['pair'], date=dataframe['date'], depth=depth_value,
+                                large_orders=large_orders_value, volume=volume_value, close=close_value,
+                                rsi_1h=dataframe['rsi_1h'], rsi_buy=rsi_buy_condition, signal=entry)
 
-        dataframe.loc[
-            (depth_value) & (large_orders_value) & (volume_value) & (close_value) & (rsi_buy_condition),
-            'enter_long'] = 1
+        dataframe.loc[entry, 'enter_long'] = 1
 
         return dataframe
 
@@ -124,30 +148,7 @@ class Strategy_Goal_Vidra_RSI_lim_UNI(IStrategy):
         ] = 1
 
         return dataframe
-    
-    def check_depth_of_market(self, order_book, depth, delta, exit=False) -> bool:
-        if len(order_book['bids']) < depth or len(order_book['asks']) < depth:
-            return False
-        
-        total_bids = sum([bid[1] for bid in order_book['bids'][:depth]])
-        total_asks = sum([ask[1] for ask in order_book['asks'][:depth]])
-        
-        self.logger.info(f"Analyzing depth of market... Results: total bids / total asks is {total_bids / total_asks}, configured delta is {delta}")
-        
-        if exit:
-            return ( total_asks / total_bids ) > delta  
-        else:
-            return ( total_bids / total_asks ) > delta  
 
-    def analyze_large_orders(self, order_book, threshold) -> bool:
-        large_orders = [order for order in order_book['bids'] if order[1] >= threshold] + \
-                       [order for order in order_book['asks'] if order[1] >= threshold]
-
-        self.logger.info(f"Analyzing large orders for threshold {threshold}, found {len(large_orders)}")
-        
-        return len(large_orders) > 0
-    
-    
     def adjust_trade_position(self, trade: Trade, current_time: datetime,
                               current_rate: float, current_profit: float,
                               min_stake: Optional[float], max_stake: float,
@@ -156,35 +157,12 @@ class Strategy_Goal_Vidra_RSI_lim_UNI(IStrategy):
                               **kwargs
                               ) -> Union[Optional[float], Tuple[Optional[float], Optional[str]]]:
         try:
-            
             time_passed = datetime.datetime.now() - trade.open_date
-            if time_passed.days >= 2 and trade.get_custom_data(self.STAGE_SOLD.format(stage=1)):
+            if time_passed.days >= 2 and self.exit_ladder.state.get(trade, STAGE_SOLD.format(stage=1)):
                 # Exit from trade if more than 2 days passed from start and 1 goal is reached
                 return - trade.stake_amount
-            
-            current_price_rate = current_rate / trade.open_rate - 1
-            self.logger.info(f"Check for goal to be closed, price rate {current_price_rate}")
-            
-            # Check if DCA levels are hit
-            for level, amount in zip(self.dca_levels, self.dca_buy_amounts):
-                if not trade.get_custom_data(self.STAGE_BOUGHT.format(stage=self.dca_levels.index(level)), default=False) and current_price_rate <= level:
-                    self.logger.info(f"DCA level {level} reached, buying {amount * 100}% more")
-                    trade.set_custom_data(self.STAGE_BOUGHT.format(stage=self.dca_levels.index(level)), True)
-                    return amount * trade.stake_amount
-
-            
-            if not trade.get_custom_data(self.STAGE_SOLD.format(stage=1), default=False) and current_price_rate >= self.target_stage_1:
-                self.logger.info(f"Price rise up bigger than {self.target_stage_1}, closing first target {self.stage_1_sell_amount}")
-                trade.set_custom_data(self.STAGE_SOLD.format(stage=1), True)
-                return - ( trade.stake_amount * self.stage_1_sell_amount )
-            elif not trade.get_custom_data(self.STAGE_SOLD.format(stage=2), default=False) and current_price_rate >= self.target_stage_2:
-                self.logger.info(f"Price rise up bigger than {self.target_stage_2}, closing second target {self.stage_2_sell_amount}")
-                trade.set_custom_data(self.STAGE_SOLD.format(stage=2), True)
-                return - ( trade.stake_amount * self.stage_2_sell_amount )
-            elif current_price_rate >= self.target_percent:
-                return - trade.stake_amount
-            else:
-                return None
+
+            return self.exit_ladder.adjust_trade_position(trade, current_rate)
         except Exception as e:
             self.logger.info(f"Error occured during trade position adjustment: {str(e)}")
-            return None
\ No newline at end of file
+            return None
@@ -1,6 +1,8 @@
 # --- Do not remove these libs ---
 import datetime
 import logging
+import sys
+from pathlib import Path
 from typing import Optional, Tuple, Union
 from freqtrade.strategy import IStrategy, merge_informative_pair, informative
 from pandas import DataFrame
@@ -8,6 +10,11 @@ from freqtrade.persistence import Trade
 import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 # --------------------------------
+sys.path.append(str(Path(__file__).resolve().parent))
+from shared.orderbook import OrderBookAnalytics  # noqa: E402
+from shared.pair_settings import PairSettings  # noqa: E402
+from shared.diagnostics import Diagnostics  # noqa: E402
+from shared.decision_trace import DecisionTrace  # noqa: E402
 
 class SettingsObject:
     bids_ask_delta: float
@@ -80,8 +87,16 @@ class Strategy_Goal_Vidra_SUI_EMA_30(IStrategy):
 
     def bot_start(self, **kwargs) -> None:
         self.logger = logging.getLogger(__name__)
-        self.settings = self.STRATEGY_SETTINGS[self.timeframe]
-        
+        self.diagnostics = Diagnostics(self.logger, sample_rate=self.config.get('diagnostics_sample_rate', 0),
+                                       trace=DecisionTrace.for_strategy(self))
+        # Settings per (pair, timeframe), resolved once for the whole whitelist
+        self.pair_settings = PairSettings(self, timeframe=self.timeframe, logger=self.logger)
+        self.pair_settings.index_whitelist(self.dp)
+
+    def bot_loop_start(self, current_time: datetime, **kwargs) -> None:
+        # Write the decision trace buffered for longer than its flush_interval
+        self.diagnostics.flush_due()
+
     @informative(informative_timeframe)
     def populate_indicators_15m(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         
@@ -98,22 +113,26 @@ class Strategy_Goal_Vidra_SUI_EMA_30(IStrategy):
         Генерує сигнал на покупку на основі індикаторів EMA
         Сигнал на покупку генерується, коли EMA20 на 30-хвилинному таймфреймі вище EMA30
         """
+        settings = self.pair_settings.get(metadata['pair'])
+        if settings is None:
+            return dataframe
 
-        order_book = self.dp.orderbook(metadata['pair'], self.settings.depth + 1)
+        order_book = OrderBookAnalytics(self.dp.orderbook(metadata['pair'], settings.depth + 1), logger=self.logger)
 
-        depth_value = self.check_depth_of_market(order_book, self.settings.depth, self.settings.bids_ask_delta)
-        large_orders_value = self.analyze_large_orders(order_book, self.settings.volume_threshold)
+        depth_value = order_book.check_depth(settings.depth, settings.bids_ask_delta)
+        large_orders_value = order_book.has_large_orders(settings.volume_threshold)
         volume_value = dataframe['volume'] > dataframe['volume'].shift(1)
         close_value = dataframe['close'] < dataframe['close'].shift(1)
 
         # Додаємо умову EMA: EMA20 > EMA30 на 30-хвилинному таймфреймі
         ema_condition = dataframe['ema20_15m'] > dataframe['ema30_15m']
 
-        self.logger.info(f"Depth check: {depth_value}, large orders check: {large_orders_value}, volume check: {volume_value.tail(5)}, close check: {close_value.tail(5)}, EMA condition: {ema_condition.tail(5)}")
+        entry = (depth_value) & (large_orders_value) & (volume_value) & (close_value) & (ema_condition)
+        self.diagnostics.record('entry', metadata['pair'], date=dataframe['date'], depth=depth_value,
+                                large_orders=large_orders_value, volume=volume_value, close=close_value,
+                                ema=ema_condition, signal=entry)
 
-        dataframe.loc[
-            (depth_value) & (large_orders_value) & (volume_value) & (close_value) & (ema_condition),
-            'enter_long'] = 1
+        dataframe.loc[entry, 'enter_long'] = 1
 
         return dataframe
 
@@ -125,35 +144,13 @@ class Strategy_Goal_Vidra_SUI_EMA_30(IStrategy):
         
         return dataframe
 
-    def check_depth_of_market(self, order_book, depth, delta, exit=False) -> bool:
-        if len(order_book['bids']) < depth or len(order_book['asks']) < depth:
-            return False
-
-        total_bids = sum([bid[1] for bid in order_book['bids'][:depth]])
-        total_asks = sum([ask[1] for ask in order_book['asks'][:depth]])
-
-        self.logger.info(f"Analyzing depth of market... Results: total bids / total asks is {total_bids / total_asks}, configured delta is {delta}")
-
-        if exit:
-            return (total_asks / total_bids) > delta
-        else:
-            return (total_bids / total_asks) > delta
-
-    def analyze_large_orders(self, order_book, threshold) -> bool:
-        large_orders = [order for order in order_book['bids'] if order[1] >= threshold] + \
-                       [order for order in order_book['asks'] if order[1] >= threshold]
-
-        self.logger.info(f"Analyzing large orders for threshold {threshold}, found {len(large_orders)}")
-
-        return len(large_orders) > 0
-
     def adjust_trade_position(self, trade: Trade, current_time: datetime.datetime,
                               current_rate: float, current_profit: float,
                               **kwargs
                               ) -> Union[Optional[float], Tuple[Optional[float], Optional[str]]]:
         try:
             current_price_rate = current_rate / trade.open_rate - 1
-            self.logger.info(f"Check for goal to be closed, price rate {current_price_rate}")
+            self.logger.debug("Check for goal to be closed, price rate %s", current_price_rate)
 
             # Перевірка, чи досягнуті рівні DCA
             for level, amount in zip(self.dca_levels, self.dca_buy_amounts):
@@ -5,9 +5,12 @@ from freqtrade.strategy import IStrategy
 from freqtrade.persistence import Trade
 import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
-from freqtrade.strategy import stoploss_from_open
 from pandas import DataFrame
 import logging
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent))
+from shared.exit_ladder import TrailingProfitLadder  # noqa: E402
 
 # --------------------------------
 
@@ -22,10 +25,6 @@ class Strategy_SLpart_ETHUSDT(IStrategy):
     """
 
     INTERFACE_VERSION: int = 3
-    BEST_PRICE_KEY: str = "best_price"
-    PL_SELL_HALF_KEY: str = "pl_sell_half"
-    PL_SELL_3_4_KEY: str = "pl_sell_3_4"
-    BE_ACTIVATED: str = "be_activated"
     
     position_adjustment_enable = True
 
@@ -64,6 +63,13 @@ class Strategy_SLpart_ETHUSDT(IStrategy):
     
     def bot_start(self, **kwargs) -> None:
         self.logger = logging.getLogger(__name__)
+        self.exit_ladder = TrailingProfitLadder(
+            pl=self.pl, break_even=self.brakeeven, break_even_offset=0.002, logger=self.logger)
+        self.exit_ladder.state.load_open_trades()
+
+    def bot_loop_start(self, current_time: datetime, **kwargs) -> None:
+        # Write the trade state changed during the last iteration
+        self.exit_ladder.state.flush()
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
@@ -107,17 +113,7 @@ class Strategy_SLpart_ETHUSDT(IStrategy):
                         current_rate: float, current_profit: float, after_fill: bool,
                         **kwargs) -> Optional[float]:
         try:
-            be_activated = trade.get_custom_data(self.BE_ACTIVATED, default=False)
-            
-            current_price_rate = current_rate / trade.open_rate - 1
-
-            if be_activated or current_price_rate > self.brakeeven:
-                if not be_activated: 
-                    trade.set_custom_data(self.BE_ACTIVATED, True)
-                    
-                return stoploss_from_open(0.002, current_profit, is_short=trade.is_short, leverage=trade.leverage)
-
-            return None
+            return self.exit_ladder.custom_stoploss(trade, current_rate, current_profit)
         except Exception as e:
             self.logger.info(f"Error occured during custom stoploss definition: {str(e)}")
             return None
@@ -130,45 +126,7 @@ class Strategy_SLpart_ETHUSDT(IStrategy):
                               **kwargs
                               ) -> Union[Optional[float], Tuple[Optional[float], Optional[str]]]:
         try:
-            best_price = trade.get_custom_data(self.BEST_PRICE_KEY, default=0)
-            half_closed = trade.get_custom_data(self.PL_SELL_HALF_KEY, default=False)
-            closed_3_4 = trade.get_custom_data(self.PL_SELL_3_4_KEY, default=False)
-            
-            if not best_price:
-                best_price = current_rate
-                trade.set_custom_data(self.BEST_PRICE_KEY, best_price)
-                return None
-            
-            profit_loss = 0
-            
-            if current_rate > best_price:
-                trade.set_custom_data(self.BEST_PRICE_KEY, current_rate)
-                if half_closed:
-                    trade.set_custom_data(self.PL_SELL_HALF_KEY, False)
-                if closed_3_4:
-                    trade.set_custom_data(self.PL_SELL_3_4_KEY, False)
-                return None
-            else:
-                profit_loss = 1 - current_rate / best_price
-            
-                    
-            if profit_loss > self.pl:
-                self.logger.info(f"Profit loss for trade {trade.id} is reached {profit_loss}. Sell all. Type: {trade.trade_direction}")
-                return - trade.stake_amount
-            elif not closed_3_4 and profit_loss > (self.pl / 2 + self.pl / 4):
-                self.logger.info(f"Profit loss for trade {trade.id} is reached {profit_loss}. Sell 3/4 of stake. Type: {trade.trade_direction}")
-                trade.set_custom_data(self.PL_SELL_3_4_KEY, True)
-                return - (trade.stake_amount / 2)
-            elif not half_closed and profit_loss > self.pl / 2:
-                self.logger.info(f"Profit loss for trade {trade.id} is reached {profit_loss}. Sell half of stake. Type: {trade.trade_direction}")
-                trade.set_custom_data(self.PL_SELL_HALF_KEY, True)
-                return - (trade.stake_amount / 2)
-            else:
-                return None
+            return self.exit_ladder.adjust_trade_position(trade, current_rate)
         except Exception as e:
             self.logger.info(f"Error occured during trade position adjustment: {str(e)}")
             return None
-        
-                    
-                
-      
\ No newline at end of file
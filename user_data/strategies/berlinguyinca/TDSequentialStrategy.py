@@ -1,9 +1,15 @@
+import sys
+from pathlib import Path
+
 import talib.abstract as ta
 from pandas import DataFrame
 import scipy.signal
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 from freqtrade.strategy import IStrategy
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from shared.tdsequential import td_sequential  # noqa: E402
+
 
 class TDSequentialStrategy(IStrategy):
     """
@@ -51,6 +57,9 @@ class TDSequentialStrategy(IStrategy):
         'stoploss_on_exchange': False
     }
 
+    # Run "populate_indicators" only for new candle
+    process_only_new_candles = True
+
     # Number of candles the strategy requires before producing valid signals
     startup_candle_count: int = 30
 
@@ -85,41 +94,16 @@ class TDSequentialStrategy(IStrategy):
         :return: a Dataframe with all mandatory indicators for the strategies
         """
 
-        dataframe['exceed_high'] = False
-        dataframe['exceed_low'] = False
-
-        # count consecutive closes “lower” than the close 4 bars prior.
-        dataframe['seq_buy'] = dataframe['close'] < dataframe['close'].shift(4)
-        dataframe['seq_buy'] = dataframe['seq_buy'] * (dataframe['seq_buy'].groupby(
-            (dataframe['seq_buy'] != dataframe['seq_buy'].shift()).cumsum()).cumcount() + 1)
-
-        # count consecutive closes “higher” than the close 4 bars prior.
-        dataframe['seq_sell'] = dataframe['close'] > dataframe['close'].shift(4)
-        dataframe['seq_sell'] = dataframe['seq_sell'] * (dataframe['seq_sell'].groupby(
-            (dataframe['seq_sell'] != dataframe['seq_sell'].shift()).cumsum()).cumcount() + 1)
-
-        for index, row in dataframe.iterrows():
-            # check if the low of bars 6 and 7 in the count are exceeded by the low of bars 8 or 9.
-            seq_b = row['seq_buy']
-            if seq_b == 8:
-                dataframe.loc[index, 'exceed_low'] = (row['low'] < dataframe.loc[index - 2, 'low']) | \
-                                    (row['low'] < dataframe.loc[index - 1, 'low'])
-            if seq_b > 8:
-                dataframe.loc[index, 'exceed_low'] = (row['low'] < dataframe.loc[index - 3 - (seq_b - 9), 'low']) | \
-                                    (row['low'] < dataframe.loc[index - 2 - (seq_b - 9), 'low'])
-                if seq_b == 9:
-                    dataframe.loc[index, 'exceed_low'] = row['exceed_low'] | dataframe.loc[index-1, 'exceed_low']
-
-            # check if the high of bars 6 and 7 in the count are exceeded by the high of bars 8 or 9.
-            seq_s = row['seq_sell']
-            if seq_s == 8:
-                dataframe.loc[index, 'exceed_high'] = (row['high'] > dataframe.loc[index - 2, 'high']) | \
-                                    (row['high'] > dataframe.loc[index - 1, 'high'])
-            if seq_s > 8:
-                dataframe.loc[index, 'exceed_high'] = (row['high'] > dataframe.loc[index - 3 - (seq_s - 9), 'high']) | \
-                                    (row['high'] > dataframe.loc[index - 2 - (seq_s - 9), 'high'])
-                if seq_s == 9:
-                    dataframe.loc[index, 'exceed_high'] = row['exceed_high'] | dataframe.loc[index-1, 'exceed_high']
+        td = td_sequential(dataframe['close'], dataframe['high'], dataframe['low'])
+
+        # exceed_low / exceed_high: the low (high) of bars 6 and 7 in the count are
+        # exceeded by the low (high) of bars 8 or 9.
+        dataframe['exceed_high'] = td['exceed_high']
+        dataframe['exceed_low'] = td['exceed_low']
+
+        # count consecutive closes “lower” / “higher” than the close 4 bars prior.
+        dataframe['seq_buy'] = td['seq_buy']
+        dataframe['seq_sell'] = td['seq_sell']
 
         return dataframe
 
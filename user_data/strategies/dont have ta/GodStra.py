@@ -22,11 +22,19 @@ from freqtrade.strategy import IStrategy
 from numpy.lib import math
 from pandas import DataFrame
 # import talib.abstract as ta
-from ta import add_all_ta_features
 from ta.utils import dropna
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from shared.gene_rules import compile_rules, param_genes  # noqa: E402
+from shared.indicator_cache import IndicatorCache  # noqa: E402
+from shared.ta_features import add_all_features, add_ta_features  # noqa: E402
 
 # --------------------------------
 
+# All features of a pair's candles, shared by the hyperopt epochs and worker processes
+FEATURE_CACHE = IndicatorCache(
+    'GodStra', directory=Path(__file__).resolve().parents[2] / 'indicator_cache')
 
 
 class GodStra(IStrategy):
@@ -85,94 +93,37 @@ class GodStra(IStrategy):
             return -1  # in case if the parameter somehow doesn't have index
         return len({int_from_str(digit) for digit in dct.keys()})
 
+    def feature_columns(self) -> set:
+        """
+        Columns compared by the buy and sell params.
+        """
+        return {value for params in (self.buy_params, self.sell_params)
+                for key, value in params.items() if '-indicator-' in key or '-cross-' in key}
+
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        # Add all ta features
         dataframe = dropna(dataframe)
-        dataframe = add_all_ta_features(
-            dataframe, open="open", high="high", low="low", close="close", volume="volume",
-            fillna=True)
+        # GodStraHo may pick any feature in every epoch: all of them, calculated once.
+        # Otherwise only the ta features the params use ("ta_all_features": true in the
+        # config adds them all, e.g. for plotting)
+        if self.config.get('ta_all_features', self.dp.runmode.value == 'hyperopt'):
+            dataframe = add_all_features(dataframe, FEATURE_CACHE, metadata['pair'], fillna=True)
+        else:
+            dataframe = add_ta_features(dataframe, self.feature_columns(), fillna=True)
         # dataframe.to_csv("df.csv", index=True)
         return dataframe
 
     def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        conditions = list()
-        # /5: Cuz We have 5 Group of variables inside buy_param
-        for i in range(self.dna_size(self.buy_params)):
-
-            OPR = self.buy_params[f'buy-oper-{i}']
-            IND = self.buy_params[f'buy-indicator-{i}']
-            CRS = self.buy_params[f'buy-cross-{i}']
-            INT = self.buy_params[f'buy-int-{i}']
-            REAL = self.buy_params[f'buy-real-{i}']
-            DFIND = dataframe[IND]
-            DFCRS = dataframe[CRS]
-
-            if OPR == ">":
-                conditions.append(DFIND > DFCRS)
-            elif OPR == "=":
-                conditions.append(np.isclose(DFIND, DFCRS))
-            elif OPR == "<":
-                conditions.append(DFIND < DFCRS)
-            elif OPR == "CA":
-                conditions.append(qtpylib.crossed_above(DFIND, DFCRS))
-            elif OPR == "CB":
-                conditions.append(qtpylib.crossed_below(DFIND, DFCRS))
-            elif OPR == ">I":
-                conditions.append(DFIND > INT)
-            elif OPR == "=I":
-                conditions.append(DFIND == INT)
-            elif OPR == "<I":
-                conditions.append(DFIND < INT)
-            elif OPR == ">R":
-                conditions.append(DFIND > REAL)
-            elif OPR == "=R":
-                conditions.append(np.isclose(DFIND, REAL))
-            elif OPR == "<R":
-                conditions.append(DFIND < REAL)
-
-        print(conditions)
-        dataframe.loc[
-            reduce(lambda x, y: x & y, conditions),
-            'enter_long'] = 1
+        genes = param_genes(self.buy_params, 'buy', self.dna_size(self.buy_params))
+        entry = compile_rules(genes).evaluate(dataframe)
+        if entry is not None:
+            dataframe.loc[entry, 'enter_long'] = 1
 
         return dataframe
 
     def populate_exit_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        conditions = list()
-        for i in range(self.dna_size(self.sell_params)):
-            OPR = self.sell_params[f'sell-oper-{i}']
-            IND = self.sell_params[f'sell-indicator-{i}']
-            CRS = self.sell_params[f'sell-cross-{i}']
-            INT = self.sell_params[f'sell-int-{i}']
-            REAL = self.sell_params[f'sell-real-{i}']
-            DFIND = dataframe[IND]
-            DFCRS = dataframe[CRS]
-
-            if OPR == ">":
-                conditions.append(DFIND > DFCRS)
-            elif OPR == "=":
-                conditions.append(np.isclose(DFIND, DFCRS))
-            elif OPR == "<":
-                conditions.append(DFIND < DFCRS)
-            elif OPR == "CA":
-                conditions.append(qtpylib.crossed_above(DFIND, DFCRS))
-            elif OPR == "CB":
-                conditions.append(qtpylib.crossed_below(DFIND, DFCRS))
-            elif OPR == ">I":
-                conditions.append(DFIND > INT)
-            elif OPR == "=I":
-                conditions.append(DFIND == INT)
-            elif OPR == "<I":
-                conditions.append(DFIND < INT)
-            elif OPR == ">R":
-                conditions.append(DFIND > REAL)
-            elif OPR == "=R":
-                conditions.append(np.isclose(DFIND, REAL))
-            elif OPR == "<R":
-                conditions.append(DFIND < REAL)
-
-        dataframe.loc[
-            reduce(lambda x, y: x & y, conditions),
-            'exit_long'] = 1
+        genes = param_genes(self.sell_params, 'sell', self.dna_size(self.sell_params))
+        exit_ = compile_rules(genes).evaluate(dataframe)
+        if exit_ is not None:
+            dataframe.loc[exit_, 'exit_long'] = 1
 
         return dataframe
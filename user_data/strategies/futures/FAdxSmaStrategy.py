@@ -19,6 +19,10 @@ from freqtrade.strategy import (
 # Add your lib to import here
 import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from shared.range_indicators import RangeIndicator  # noqa: E402
 
 
 # This class is a sample. Feel free to customize it.
@@ -57,19 +61,17 @@ class FAdxSmaStrategy(IStrategy):
     sma_short_period = IntParameter(4, 24, default=12)
     sma_long_period = IntParameter(12, 175, default=48)
 
+    # One column per period, the short and long SMA ranges share theirs
+    adx = RangeIndicator("adx", lambda dataframe, period: ta.ADX(dataframe, timeperiod=period))
+    sma = RangeIndicator("sma", lambda dataframe, period: ta.SMA(dataframe, timeperiod=period))
+
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
 
         # Calculate all adx values
-        for val in self.adx_period.range:
-            dataframe[f"adx_{val}"] = ta.ADX(dataframe, timeperiod=val)
-
-        # Calculate all sma_short values
-        for val in self.sma_short_period.range:
-            dataframe[f"sma_short_{val}"] = ta.SMA(dataframe, timeperiod=val)
+        dataframe = self.adx.add(dataframe, self.adx_period)
 
-        # Calculate all sma_long values
-        for val in self.sma_long_period.range:
-            dataframe[f"sma_long_{val}"] = ta.SMA(dataframe, timeperiod=val)
+        # Calculate all sma_short and sma_long values
+        dataframe = self.sma.add(dataframe, self.sma_short_period, self.sma_long_period)
 
         return dataframe
 
@@ -79,22 +81,22 @@ class FAdxSmaStrategy(IStrategy):
 
         # GUARDS AND TRIGGERS
         conditions_long.append(
-            dataframe[f"adx_{self.adx_period.value}"] > self.pos_entry_adx.value
+            dataframe[self.adx.column(self.adx_period.value)] > self.pos_entry_adx.value
         )
         conditions_short.append(
-            dataframe[f"adx_{self.adx_period.value}"] > self.pos_entry_adx.value
+            dataframe[self.adx.column(self.adx_period.value)] > self.pos_entry_adx.value
         )
 
         conditions_long.append(
             qtpylib.crossed_above(
-                dataframe[f"sma_short_{self.sma_short_period.value}"],
-                dataframe[f"sma_long_{self.sma_long_period.value}"],
+                dataframe[self.sma.column(self.sma_short_period.value)],
+                dataframe[self.sma.column(self.sma_long_period.value)],
             )
         )
         conditions_short.append(
             qtpylib.crossed_below(
-                dataframe[f"sma_short_{self.sma_short_period.value}"],
-                dataframe[f"sma_long_{self.sma_long_period.value}"],
+                dataframe[self.sma.column(self.sma_short_period.value)],
+                dataframe[self.sma.column(self.sma_long_period.value)],
             )
         )
 
@@ -114,7 +116,7 @@ class FAdxSmaStrategy(IStrategy):
 
         conditions_close = []
         conditions_close.append(
-            dataframe[f"adx_{self.adx_period.value}"] < self.pos_entry_adx.value
+            dataframe[self.adx.column(self.adx_period.value)] < self.pos_entry_adx.value
         )
 
         dataframe.loc[
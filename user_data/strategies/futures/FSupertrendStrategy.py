@@ -12,12 +12,18 @@ Supertrend strategy:
 """
 
 import logging
+import sys
+from pathlib import Path
 from numpy.lib import math
 from freqtrade.strategy import IStrategy, IntParameter
 from pandas import DataFrame
 import talib.abstract as ta
 import numpy as np
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from shared.dataframe_utils import append_columns  # noqa: E402
+from shared.supertrend import calculate_supertrend, calculate_supertrend_grid  # noqa: E402
+
 
 class FSupertrendStrategy(IStrategy):
     # Buy params, Sell params, ROI, Stoploss and Trailing Stop are values generated by 'freqtrade hyperopt --strategy Supertrend --hyperopt-loss ShortTradeDurHyperOptLoss --timerange=20210101- --timeframe=1h --spaces all'
@@ -76,43 +82,30 @@ class FSupertrendStrategy(IStrategy):
     sell_p3 = IntParameter(7, 21, default=10)
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        for multiplier in self.buy_m1.range:
-            for period in self.buy_p1.range:
-                dataframe[f"supertrend_1_buy_{multiplier}_{period}"] = self.supertrend(
-                    dataframe, multiplier, period
-                )["STX"]
-
-        for multiplier in self.buy_m2.range:
-            for period in self.buy_p2.range:
-                dataframe[f"supertrend_2_buy_{multiplier}_{period}"] = self.supertrend(
-                    dataframe, multiplier, period
-                )["STX"]
-
-        for multiplier in self.buy_m3.range:
-            for period in self.buy_p3.range:
-                dataframe[f"supertrend_3_buy_{multiplier}_{period}"] = self.supertrend(
-                    dataframe, multiplier, period
-                )["STX"]
-
-        for multiplier in self.sell_m1.range:
-            for period in self.sell_p1.range:
-                dataframe[f"supertrend_1_sell_{multiplier}_{period}"] = self.supertrend(
-                    dataframe, multiplier, period
-                )["STX"]
-
-        for multiplier in self.sell_m2.range:
-            for period in self.sell_p2.range:
-                dataframe[f"supertrend_2_sell_{multiplier}_{period}"] = self.supertrend(
-                    dataframe, multiplier, period
-                )["STX"]
-
-        for multiplier in self.sell_m3.range:
-            for period in self.sell_p3.range:
-                dataframe[f"supertrend_3_sell_{multiplier}_{period}"] = self.supertrend(
-                    dataframe, multiplier, period
-                )["STX"]
+        # All buy/sell ranges are computed in one grid pass, sharing TR / ATR per period
+        # (outside hyperopt freqtrade's IntParameter.range is only the current value, so
+        # only the supertrends the signals use are calculated there)
+        groups = {
+            "1_buy": (self.buy_m1, self.buy_p1),
+            "2_buy": (self.buy_m2, self.buy_p2),
+            "3_buy": (self.buy_m3, self.buy_p3),
+            "1_sell": (self.sell_m1, self.sell_p1),
+            "2_sell": (self.sell_m2, self.sell_p2),
+            "3_sell": (self.sell_m3, self.sell_p3),
+        }
+        columns = {
+            f"supertrend_{name}_{multiplier}_{period}": (multiplier, period)
+            for name, (multiplier_param, period_param) in groups.items()
+            for multiplier in multiplier_param.range
+            for period in period_param.range
+        }
+        grid = calculate_supertrend_grid(
+            dataframe["high"], dataframe["low"], dataframe["close"], columns.values()
+        )
 
-        return dataframe
+        return append_columns(
+            dataframe, {column: grid[param][1] for column, param in columns.items()}
+        )
 
     def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
 
@@ -189,61 +182,8 @@ class FSupertrendStrategy(IStrategy):
     """
 
     def supertrend(self, dataframe: DataFrame, multiplier, period):
-        df = dataframe.copy()
-
-        df["TR"] = ta.TRANGE(df)
-        df["ATR"] = ta.SMA(df["TR"], period)
-
-        st = "ST_" + str(period) + "_" + str(multiplier)
-        stx = "STX_" + str(period) + "_" + str(multiplier)
-
-        # Compute basic upper and lower bands
-        df["basic_ub"] = (df["high"] + df["low"]) / 2 + multiplier * df["ATR"]
-        df["basic_lb"] = (df["high"] + df["low"]) / 2 - multiplier * df["ATR"]
-
-        # Compute final upper and lower bands
-        df["final_ub"] = 0.00
-        df["final_lb"] = 0.00
-        for i in range(period, len(df)):
-            df["final_ub"].iat[i] = (
-                df["basic_ub"].iat[i]
-                if df["basic_ub"].iat[i] < df["final_ub"].iat[i - 1]
-                or df["close"].iat[i - 1] > df["final_ub"].iat[i - 1]
-                else df["final_ub"].iat[i - 1]
-            )
-            df["final_lb"].iat[i] = (
-                df["basic_lb"].iat[i]
-                if df["basic_lb"].iat[i] > df["final_lb"].iat[i - 1]
-                or df["close"].iat[i - 1] < df["final_lb"].iat[i - 1]
-                else df["final_lb"].iat[i - 1]
-            )
-
-        # Set the Supertrend value
-        df[st] = 0.00
-        for i in range(period, len(df)):
-            df[st].iat[i] = (
-                df["final_ub"].iat[i]
-                if df[st].iat[i - 1] == df["final_ub"].iat[i - 1]
-                and df["close"].iat[i] <= df["final_ub"].iat[i]
-                else df["final_lb"].iat[i]
-                if df[st].iat[i - 1] == df["final_ub"].iat[i - 1]
-                and df["close"].iat[i] > df["final_ub"].iat[i]
-                else df["final_lb"].iat[i]
-                if df[st].iat[i - 1] == df["final_lb"].iat[i - 1]
-                and df["close"].iat[i] >= df["final_lb"].iat[i]
-                else df["final_ub"].iat[i]
-                if df[st].iat[i - 1] == df["final_lb"].iat[i - 1]
-                and df["close"].iat[i] < df["final_lb"].iat[i]
-                else 0.00
-            )
-        # Mark the trend direction up/down
-        df[stx] = np.where(
-            (df[st] > 0.00), np.where((df["close"] < df[st]), "down", "up"), np.NaN
+        st, stx = calculate_supertrend(
+            dataframe["high"], dataframe["low"], dataframe["close"], multiplier, period
         )
 
-        # Remove basic and final bands from the columns
-        df.drop(["basic_ub", "basic_lb", "final_ub", "final_lb"], inplace=True, axis=1)
-
-        df.fillna(0, inplace=True)
-
-        return DataFrame(index=df.index, data={"ST": df[st], "STX": df[stx]})
+        return DataFrame(index=dataframe.index, data={"ST": st, "STX": stx})
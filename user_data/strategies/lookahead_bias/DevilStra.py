@@ -20,10 +20,16 @@ from functools import reduce
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 import talib.abstract as ta
 import random
-from freqtrade.strategy import CategoricalParameter, IStrategy
+from functools import lru_cache
+from freqtrade.strategy import IntParameter, IStrategy
 
 from numpy.lib import math
 from pandas import DataFrame
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from shared.indicator_cache import IndicatorCache, hash_candles_once  # noqa: E402
+from shared.normalize import CausalNormalizer  # noqa: E402
 
 # ########################## SETTINGS ##############################
 # pairlist lenght(use exact count of pairs you used in whitelist size+1):
@@ -32,6 +38,9 @@ PAIR_LIST_LENGHT = 269
 TREND_CHECK_CANDLES = 4
 # Set the pain range of devil(2~9999)
 PAIN_RANGE = 1000
+# Spell list i of the pot is drawn with random.Random(SPELL_SEED + i): the same lists in
+# every process and run (as long as SPELLS and PAIR_LIST_LENGHT stay the same)
+SPELL_SEED = 0
 # Add "GodStraNew" Generated Results As spells inside SPELLS.
 # Set them unic phonemes like 'Zi' 'Gu' or 'Lu'!
 # * Use below replacement on GodStraNew results to
@@ -327,12 +336,45 @@ def spell_finder(index, space):
     return SPELLS[index][space+"_params"]
 
 
-def normalize(df):
-    df = (df-df.min())/(df.max()-df.min())
-    return df
+@lru_cache(maxsize=128)
+def spell_list(spell):
+    # Spells per pair of an entry of the pot, given by its index. Results hyperopted with the
+    # pot of comma separated spell strings are still accepted as they are.
+    if isinstance(spell, str):
+        return tuple(spell.split(","))
+    return tuple(random.Random(SPELL_SEED + spell).choices(list(SPELLS.keys()), k=PAIR_LIST_LENGHT))
 
 
-def gene_calculator(dataframe, indicator):
+# Candles the min / max of normalize() are taken over
+NORMALIZE_WINDOW = 500
+NORMALIZER = CausalNormalizer(NORMALIZE_WINDOW)
+
+
+def normalize(df, dataframe, key):
+    # Causal: every candle is scaled with the min / max of the NORMALIZE_WINDOW candles up to it,
+    # the new candles only in live (see shared/normalize.py)
+    return NORMALIZER.normalize(key, dataframe['date'], df)
+
+
+# TA-Lib results per pair and data, reused by every hyperopt epoch and worker process
+# (stored in user_data/indicator_cache, see shared/indicator_cache.py)
+TA_CACHE = IndicatorCache(
+    'DevilStra', directory=Path(__file__).resolve().parents[2] / 'indicator_cache')
+
+
+def ta_calculator(dataframe, gene_name, timeperiod=None, gene_index=None, pair=None):
+    name = '-'.join(str(part) for part in (gene_name, gene_index, timeperiod) if part is not None)
+
+    def calculate():
+        if timeperiod is None:
+            return getattr(ta, gene_name)(dataframe)
+        result = getattr(ta, gene_name)(dataframe, timeperiod=timeperiod)
+        return result if gene_index is None else result.iloc[:, gene_index]
+
+    return TA_CACHE.get_or_calculate(dataframe, name, calculate, pair=pair)
+
+
+def gene_calculator(dataframe, indicator, pair=None):
     # Cuz Timeperiods not effect calculating CDL patterns recognations
     if 'CDL' in indicator:
         splited_indicator = indicator.split('-')
@@ -355,65 +397,54 @@ def gene_calculator(dataframe, indicator):
         # For Pattern Recognations
         if gene_len == 1:
             # print('gene_len == 1\t', indicator)
-            result = getattr(ta, gene_name)(
-                dataframe
-            )
-            return normalize(result)
+            result = ta_calculator(dataframe, gene_name, pair=pair)
+            return normalize(result, dataframe, (pair, indicator))
         elif gene_len == 2:
             # print('gene_len == 2\t', indicator)
             gene_timeperiod = int(gene[1])
-            result = getattr(ta, gene_name)(
-                dataframe,
-                timeperiod=gene_timeperiod,
-            )
-            return normalize(result)
+            result = ta_calculator(dataframe, gene_name, gene_timeperiod, pair=pair)
+            return normalize(result, dataframe, (pair, indicator))
         # For
         elif gene_len == 3:
             # print('gene_len == 3\t', indicator)
             gene_timeperiod = int(gene[2])
             gene_index = int(gene[1])
-            result = getattr(ta, gene_name)(
-                dataframe,
-                timeperiod=gene_timeperiod,
-            ).iloc[:, gene_index]
-            return normalize(result)
+            result = ta_calculator(dataframe, gene_name, gene_timeperiod, gene_index, pair=pair)
+            return normalize(result, dataframe, (pair, indicator))
         # For trend operators(MA-5-SMA-4)
         elif gene_len == 4:
             # print('gene_len == 4\t', indicator)
             gene_timeperiod = int(gene[1])
             sharp_indicator = f'{gene_name}-{gene_timeperiod}'
-            dataframe[sharp_indicator] = getattr(ta, gene_name)(
-                dataframe,
-                timeperiod=gene_timeperiod,
-            )
-            return normalize(ta.SMA(dataframe[sharp_indicator].fillna(0), TREND_CHECK_CANDLES))
+            dataframe[sharp_indicator] = ta_calculator(dataframe, gene_name, gene_timeperiod, pair=pair)
+            return normalize(ta.SMA(dataframe[sharp_indicator].fillna(0), TREND_CHECK_CANDLES),
+                             dataframe, (pair, indicator))
         # For trend operators(STOCH-0-4-SMA-4)
         elif gene_len == 5:
             # print('gene_len == 5\t', indicator)
             gene_timeperiod = int(gene[2])
             gene_index = int(gene[1])
             sharp_indicator = f'{gene_name}-{gene_index}-{gene_timeperiod}'
-            dataframe[sharp_indicator] = getattr(ta, gene_name)(
-                dataframe,
-                timeperiod=gene_timeperiod,
-            ).iloc[:, gene_index]
-            return normalize(ta.SMA(dataframe[sharp_indicator].fillna(0), TREND_CHECK_CANDLES))
+            dataframe[sharp_indicator] = ta_calculator(
+                dataframe, gene_name, gene_timeperiod, gene_index, pair=pair)
+            return normalize(ta.SMA(dataframe[sharp_indicator].fillna(0), TREND_CHECK_CANDLES),
+                             dataframe, (pair, indicator))
 
 
-def condition_generator(dataframe, operator, indicator, crossed_indicator, real_num):
+def condition_generator(dataframe, operator, indicator, crossed_indicator, real_num, pair=None):
 
     condition = (dataframe['volume'] > 10)
 
     # TODO : it ill callculated in populate indicators.
 
-    dataframe[indicator] = gene_calculator(dataframe, indicator)
+    dataframe[indicator] = gene_calculator(dataframe, indicator, pair)
     dataframe[crossed_indicator] = gene_calculator(
-        dataframe, crossed_indicator)
+        dataframe, crossed_indicator, pair)
 
     indicator_trend_sma = f"{indicator}-SMA-{TREND_CHECK_CANDLES}"
     if operator in ["UT", "DT", "OT", "CUT", "CDT", "COT"]:
         dataframe[indicator_trend_sma] = gene_calculator(
-            dataframe, indicator_trend_sma)
+            dataframe, indicator_trend_sma, pair)
 
     if operator == ">":
         condition = (
@@ -562,46 +593,62 @@ class DevilStra(IStrategy):
     # 𝖂𝖔𝖗𝖘𝖙, 𝖀𝖓𝖎𝖉𝖊𝖆𝖑, 𝕾𝖚𝖇𝖔𝖕𝖙𝖎𝖒𝖆𝖑, 𝕸𝖆𝖑𝖆𝖕𝖗𝖔𝖕𝖔𝖘 𝕬𝖓𝖉 𝕯𝖎𝖘𝖒𝖆𝖑 𝖙𝖎𝖒𝖊𝖋𝖗𝖆𝖒𝖊 𝖋𝖔𝖗 𝖙𝖍𝖎𝖘 𝖘𝖙𝖗𝖆𝖙𝖊𝖌𝖞:
     timeframe = '4h'
 
-    spell_pot = [
-        ",".join(
-            tuple(
-                random.choices(
-                    list(SPELLS.keys()),
-                    # TODO: k will be change to len(pairlist)
-                    k=PAIR_LIST_LENGHT
-                )
-            )
-        )for i in range(PAIN_RANGE)
-    ]
-
-    buy_spell = CategoricalParameter(
-        spell_pot, default=spell_pot[0], space='buy')
-    sell_spell = CategoricalParameter(
-        spell_pot, default=spell_pot[0], space='sell')
+    # Full normalisation window before the first signal
+    startup_candle_count: int = NORMALIZE_WINDOW
 
-    def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+    # Index into the pot of PAIN_RANGE spell lists, decoded on demand by spell_list()
+    buy_spell = IntParameter(0, PAIN_RANGE - 1, default=0, space='buy')
+    sell_spell = IntParameter(0, PAIN_RANGE - 1, default=0, space='sell')
 
-        return dataframe
-
-    def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+    def bot_start(self, **kwargs) -> None:
+        # space -> (spell, whitelist, {pair: params}), see pair_params()
+        self._spell_params = {}
 
+    def bot_loop_start(self, current_time, **kwargs) -> None:
+        # Rebuilt on the next lookup if the whitelist changed since
         pairs = self.dp.current_whitelist()
-        pairs_len = len(pairs)
-        pair_index = pairs.index(metadata['pair'])
+        for space, (_, whitelist, _) in list(self._spell_params.items()):
+            if whitelist != pairs:
+                del self._spell_params[space]
+
+    def pair_params(self, pair, space):
+        """
+        Params of the spell the pair got for the space ('buy' or 'sell'). A dict lookup,
+        the mapping of all whitelisted pairs is built when the spell or the whitelist changed.
+        """
+        spell = getattr(self, f'{space}_spell').value
+        cached = self._spell_params.get(space)
+        if cached is None or cached[0] != spell or pair not in cached[2]:
+            pairs = self.dp.current_whitelist()
+            spells = spell_list(spell)
+
+            if len(pairs) > len(spells):
+                print(
+                    f"First set PAIR_LIST_LENGHT={len(pairs) + 1} And re-hyperopt the")
+                print(f"{space.capitalize()} strategy And paste result in exact place(lines 535~564)")
+                print("IMPORTANT: You Need An 'STATIC' Pairlist On Your Config.json !!!")
+                exit()
+
+            cached = (spell, pairs, {
+                whitelisted: spell_finder(name, space)
+                for whitelisted, name in zip(pairs, spells) if name in SPELLS
+            })
+            self._spell_params[space] = cached
+
+        params = cached[2].get(pair)
+        if params is None:
+            # Raises as before: ValueError if not whitelisted, KeyError for a spell missing from SPELLS
+            return spell_finder(spell_list(spell)[cached[1].index(pair)], space)
+        return params
 
-        buy_spells = self.buy_spell.value.split(",")
-        buy_spells_len = len(buy_spells)
+    def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
 
-        if pairs_len > buy_spells_len:
-            print(
-                f"First set PAIR_LIST_LENGHT={pairs_len + 1} And re-hyperopt the")
-            print("Buy strategy And paste result in exact place(lines 535~564)")
-            print("IMPORTANT: You Need An 'STATIC' Pairlist On Your Config.json !!!")
-            exit()
+        return dataframe
 
-        buy_params_index = buy_spells[pair_index]
+    @hash_candles_once
+    def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
 
-        params = spell_finder(buy_params_index, 'buy')
+        params = self.pair_params(metadata['pair'], 'buy')
         conditions = list()
         # TODO: Its not dry code!
         buy_indicator = params['buy_indicator0']
@@ -613,7 +660,8 @@ class DevilStra(IStrategy):
             buy_operator,
             buy_indicator,
             buy_crossed_indicator,
-            buy_real_num
+            buy_real_num,
+            metadata['pair']
         )
         conditions.append(condition)
         # backup
@@ -627,7 +675,8 @@ class DevilStra(IStrategy):
             buy_operator,
             buy_indicator,
             buy_crossed_indicator,
-            buy_real_num
+            buy_real_num,
+            metadata['pair']
         )
         conditions.append(condition)
 
@@ -640,7 +689,8 @@ class DevilStra(IStrategy):
             buy_operator,
             buy_indicator,
             buy_crossed_indicator,
-            buy_real_num
+            buy_real_num,
+            metadata['pair']
         )
         conditions.append(condition)
 
@@ -653,25 +703,10 @@ class DevilStra(IStrategy):
 
         return dataframe
 
+    @hash_candles_once
     def populate_exit_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
 
-        pairs = self.dp.current_whitelist()
-        pairs_len = len(pairs)
-        pair_index = pairs.index(metadata['pair'])
-
-        sell_spells = self.sell_spell.value.split(",")
-        sell_spells_len = len(sell_spells)
-
-        if pairs_len > sell_spells_len:
-            print(
-                f"First set PAIR_LIST_LENGHT={pairs_len + 1} And re-hyperopt the")
-            print("Sell strategy And paste result in exact place(lines 535~564)")
-            print("IMPORTANT: You Need An 'STATIC' Pairlist On Your Config.json !!!")
-            exit()
-
-        sell_params_index = sell_spells[pair_index]
-
-        params = spell_finder(sell_params_index, 'sell')
+        params = self.pair_params(metadata['pair'], 'sell')
 
         conditions = list()
         # TODO: Its not dry code!
@@ -684,7 +719,8 @@ class DevilStra(IStrategy):
             sell_operator,
             sell_indicator,
             sell_crossed_indicator,
-            sell_real_num
+            sell_real_num,
+            metadata['pair']
         )
         conditions.append(condition)
 
@@ -697,7 +733,8 @@ class DevilStra(IStrategy):
             sell_operator,
             sell_indicator,
             sell_crossed_indicator,
-            sell_real_num
+            sell_real_num,
+            metadata['pair']
         )
         conditions.append(condition)
 
@@ -710,7 +747,8 @@ class DevilStra(IStrategy):
             sell_operator,
             sell_indicator,
             sell_crossed_indicator,
-            sell_real_num
+            sell_real_num,
+            metadata['pair']
         )
         conditions.append(condition)
 
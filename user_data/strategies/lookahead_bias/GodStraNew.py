@@ -19,6 +19,12 @@ import freqtrade.vendor.qtpylib.indicators as qtpylib
 from functools import reduce
 import numpy as np
 from random import shuffle
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from shared.gene_rules import OPERATORS, compile_rules  # noqa: E402
+from shared.indicator_cache import IndicatorCache, hash_candles_once  # noqa: E402
+from shared.normalize import CausalNormalizer  # noqa: E402
 #  TODO: this gene is removed 'MAVP' cuz or error on periods
 all_god_genes = {
     'Overlap Studies': {
@@ -252,12 +258,36 @@ if len(operators) == 1:
     operators = operators*2
 
 
-def normalize(df):
-    df = (df-df.min())/(df.max()-df.min())
-    return df
+# Candles the min / max of normalize() are taken over
+NORMALIZE_WINDOW = 500
+NORMALIZER = CausalNormalizer(NORMALIZE_WINDOW)
 
 
-def gene_calculator(dataframe, indicator):
+def normalize(df, dataframe, key):
+    # Causal: every candle is scaled with the min / max of the NORMALIZE_WINDOW candles up to it,
+    # the new candles only in live (see shared/normalize.py)
+    return NORMALIZER.normalize(key, dataframe['date'], df)
+
+
+# TA-Lib results per pair and data, reused by every hyperopt epoch and worker process
+# (stored in user_data/indicator_cache, see shared/indicator_cache.py)
+TA_CACHE = IndicatorCache(
+    'GodStraNew', directory=Path(__file__).resolve().parents[2] / 'indicator_cache')
+
+
+def ta_calculator(dataframe, gene_name, timeperiod=None, gene_index=None, pair=None):
+    name = '-'.join(str(part) for part in (gene_name, gene_index, timeperiod) if part is not None)
+
+    def calculate():
+        if timeperiod is None:
+            return getattr(ta, gene_name)(dataframe)
+        result = getattr(ta, gene_name)(dataframe, timeperiod=timeperiod)
+        return result if gene_index is None else result.iloc[:, gene_index]
+
+    return TA_CACHE.get_or_calculate(dataframe, name, calculate, pair=pair)
+
+
+def gene_calculator(dataframe, indicator, pair=None):
     # Cuz Timeperiods not effect calculating CDL patterns recognations
     if 'CDL' in indicator:
         splited_indicator = indicator.split('-')
@@ -280,181 +310,75 @@ def gene_calculator(dataframe, indicator):
         # For Pattern Recognations
         if gene_len == 1:
             # print('gene_len == 1\t', indicator)
-            result = getattr(ta, gene_name)(
-                dataframe
-            )
-            return normalize(result)
+            result = ta_calculator(dataframe, gene_name, pair=pair)
+            return normalize(result, dataframe, (pair, indicator))
         elif gene_len == 2:
             # print('gene_len == 2\t', indicator)
             gene_timeperiod = int(gene[1])
-            result = getattr(ta, gene_name)(
-                dataframe,
-                timeperiod=gene_timeperiod,
-            )
-            return normalize(result)
+            result = ta_calculator(dataframe, gene_name, gene_timeperiod, pair=pair)
+            return normalize(result, dataframe, (pair, indicator))
         # For
         elif gene_len == 3:
             # print('gene_len == 3\t', indicator)
             gene_timeperiod = int(gene[2])
             gene_index = int(gene[1])
-            result = getattr(ta, gene_name)(
-                dataframe,
-                timeperiod=gene_timeperiod,
-            ).iloc[:, gene_index]
-            return normalize(result)
+            result = ta_calculator(dataframe, gene_name, gene_timeperiod, gene_index, pair=pair)
+            return normalize(result, dataframe, (pair, indicator))
         # For trend operators(MA-5-SMA-4)
         elif gene_len == 4:
             # print('gene_len == 4\t', indicator)
             gene_timeperiod = int(gene[1])
             sharp_indicator = f'{gene_name}-{gene_timeperiod}'
-            dataframe[sharp_indicator] = getattr(ta, gene_name)(
-                dataframe,
-                timeperiod=gene_timeperiod,
-            )
-            return normalize(ta.SMA(dataframe[sharp_indicator].fillna(0), TREND_CHECK_CANDLES))
+            dataframe[sharp_indicator] = ta_calculator(dataframe, gene_name, gene_timeperiod, pair=pair)
+            return normalize(ta.SMA(dataframe[sharp_indicator].fillna(0), TREND_CHECK_CANDLES),
+                             dataframe, (pair, indicator))
         # For trend operators(STOCH-0-4-SMA-4)
         elif gene_len == 5:
             # print('gene_len == 5\t', indicator)
             gene_timeperiod = int(gene[2])
             gene_index = int(gene[1])
             sharp_indicator = f'{gene_name}-{gene_index}-{gene_timeperiod}'
-            dataframe[sharp_indicator] = getattr(ta, gene_name)(
-                dataframe,
-                timeperiod=gene_timeperiod,
-            ).iloc[:, gene_index]
-            return normalize(ta.SMA(dataframe[sharp_indicator].fillna(0), TREND_CHECK_CANDLES))
+            dataframe[sharp_indicator] = ta_calculator(
+                dataframe, gene_name, gene_timeperiod, gene_index, pair=pair)
+            return normalize(ta.SMA(dataframe[sharp_indicator].fillna(0), TREND_CHECK_CANDLES),
+                             dataframe, (pair, indicator))
 
 
-def condition_generator(dataframe, operator, indicator, crossed_indicator, real_num):
+def trend_column(indicator):
+    return f"{indicator}-SMA-{TREND_CHECK_CANDLES}"
 
-    condition = (dataframe['volume'] > 10)
 
+def gene_generator(dataframe, operator, indicator, crossed_indicator, real_num, position, pair=None):
+    """
+    Adds the gene's indicators to the dataframe.
+    :param position: Position of the gene, prefixes its column names
+    :return: (gene for compile_rules, arrays of the columns it compares)
+    """
     # TODO : it ill callculated in populate indicators.
 
-    dataframe[indicator] = gene_calculator(dataframe, indicator)
+    dataframe[indicator] = gene_calculator(dataframe, indicator, pair)
     dataframe[crossed_indicator] = gene_calculator(
-        dataframe, crossed_indicator)
+        dataframe, crossed_indicator, pair)
 
-    indicator_trend_sma = f"{indicator}-SMA-{TREND_CHECK_CANDLES}"
+    indicator_trend_sma = trend_column(indicator)
     if operator in ["UT", "DT", "OT", "CUT", "CDT", "COT"]:
+        # Also sets dataframe[indicator] back to the raw (not normalized) values
         dataframe[indicator_trend_sma] = gene_calculator(
-            dataframe, indicator_trend_sma)
-
-    if operator == ">":
-        condition = (
-            dataframe[indicator] > dataframe[crossed_indicator]
-        )
-    elif operator == "=":
-        condition = (
-            np.isclose(dataframe[indicator], dataframe[crossed_indicator])
-        )
-    elif operator == "<":
-        condition = (
-            dataframe[indicator] < dataframe[crossed_indicator]
-        )
-    elif operator == "C":
-        condition = (
-            (qtpylib.crossed_below(dataframe[indicator], dataframe[crossed_indicator])) |
-            (qtpylib.crossed_above(
-                dataframe[indicator], dataframe[crossed_indicator]))
-        )
-    elif operator == "CA":
-        condition = (
-            qtpylib.crossed_above(
-                dataframe[indicator], dataframe[crossed_indicator])
-        )
-    elif operator == "CB":
-        condition = (
-            qtpylib.crossed_below(
-                dataframe[indicator], dataframe[crossed_indicator])
-        )
-    elif operator == ">R":
-        condition = (
-            dataframe[indicator] > real_num
-        )
-    elif operator == "=R":
-        condition = (
-            np.isclose(dataframe[indicator], real_num)
-        )
-    elif operator == "<R":
-        condition = (
-            dataframe[indicator] < real_num
-        )
-    elif operator == "/>R":
-        condition = (
-            dataframe[indicator].div(dataframe[crossed_indicator]) > real_num
-        )
-    elif operator == "/=R":
-        condition = (
-            np.isclose(dataframe[indicator].div(
-                dataframe[crossed_indicator]), real_num)
-        )
-    elif operator == "/<R":
-        condition = (
-            dataframe[indicator].div(dataframe[crossed_indicator]) < real_num
-        )
-    elif operator == "UT":
-        condition = (
-            dataframe[indicator] > dataframe[indicator_trend_sma]
-        )
-    elif operator == "DT":
-        condition = (
-            dataframe[indicator] < dataframe[indicator_trend_sma]
-        )
-    elif operator == "OT":
-        condition = (
-
-            np.isclose(dataframe[indicator], dataframe[indicator_trend_sma])
-        )
-    elif operator == "CUT":
-        condition = (
-            (
-                qtpylib.crossed_above(
-                    dataframe[indicator],
-                    dataframe[indicator_trend_sma]
-                )
-            ) &
-            (
-                dataframe[indicator] > dataframe[indicator_trend_sma]
-            )
-        )
-    elif operator == "CDT":
-        condition = (
-            (
-                qtpylib.crossed_below(
-                    dataframe[indicator],
-                    dataframe[indicator_trend_sma]
-                )
-            ) &
-            (
-                dataframe[indicator] < dataframe[indicator_trend_sma]
-            )
-        )
-    elif operator == "COT":
-        condition = (
-            (
-                (
-                    qtpylib.crossed_below(
-                        dataframe[indicator],
-                        dataframe[indicator_trend_sma]
-                    )
-                ) |
-                (
-                    qtpylib.crossed_above(
-                        dataframe[indicator],
-                        dataframe[indicator_trend_sma]
-                    )
-                )
-            ) &
-            (
-                np.isclose(
-                    dataframe[indicator],
-                    dataframe[indicator_trend_sma]
-                )
-            )
-        )
+            dataframe, indicator_trend_sma, pair)
 
-    return condition, dataframe
+    if operator not in OPERATORS:
+        # Disabled gene, only checks the volume
+        gene = ('>I', 'volume', None, 10, None)
+    else:
+        gene = (operator, indicator, crossed_indicator, None, real_num)
+    # The values as they are now, under names of this gene: the trend indicator of a
+    # later gene may overwrite a column
+    columns = {f'{position}:{column}': np.array(dataframe[column])
+               for column in compile_rules([gene], trend_column).columns}
+    operator, indicator, crossed_indicator, integer, real = gene
+    gene = (operator, f'{position}:{indicator}',
+            None if crossed_indicator is None else f'{position}:{crossed_indicator}', integer, real)
+    return gene, columns
 
 
 class GodStraNew(IStrategy):
@@ -473,6 +397,9 @@ class GodStraNew(IStrategy):
     # Buy hypers
     timeframe = '4h'
 
+    # Full normalisation window before the first signal
+    startup_candle_count: int = NORMALIZE_WINDOW
+
     # #################### END OF RESULT PLACE ####################
 
     # TODO: Its not dry code!
@@ -540,105 +467,45 @@ class GodStraNew(IStrategy):
         '''
         return dataframe
 
+    @hash_candles_once
     def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-
-        conditions = list()
-
-        # TODO: Its not dry code!
-        buy_indicator = self.buy_indicator0.value
-        buy_crossed_indicator = self.buy_crossed_indicator0.value
-        buy_operator = self.buy_operator0.value
-        buy_real_num = self.buy_real_num0.value
-        condition, dataframe = condition_generator(
-            dataframe,
-            buy_operator,
-            buy_indicator,
-            buy_crossed_indicator,
-            buy_real_num
-        )
-        conditions.append(condition)
-        # backup
-        buy_indicator = self.buy_indicator1.value
-        buy_crossed_indicator = self.buy_crossed_indicator1.value
-        buy_operator = self.buy_operator1.value
-        buy_real_num = self.buy_real_num1.value
-
-        condition, dataframe = condition_generator(
-            dataframe,
-            buy_operator,
-            buy_indicator,
-            buy_crossed_indicator,
-            buy_real_num
-        )
-        conditions.append(condition)
-
-        buy_indicator = self.buy_indicator2.value
-        buy_crossed_indicator = self.buy_crossed_indicator2.value
-        buy_operator = self.buy_operator2.value
-        buy_real_num = self.buy_real_num2.value
-        condition, dataframe = condition_generator(
-            dataframe,
-            buy_operator,
-            buy_indicator,
-            buy_crossed_indicator,
-            buy_real_num
-        )
-        conditions.append(condition)
-
-        if conditions:
-            dataframe.loc[
-                reduce(lambda x, y: x & y, conditions),
-                'enter_long']=1
+        entry = self.genes_mask(dataframe, metadata, (
+            (self.buy_indicator0, self.buy_crossed_indicator0, self.buy_operator0, self.buy_real_num0),
+            (self.buy_indicator1, self.buy_crossed_indicator1, self.buy_operator1, self.buy_real_num1),
+            (self.buy_indicator2, self.buy_crossed_indicator2, self.buy_operator2, self.buy_real_num2),
+        ))
+        dataframe.loc[entry, 'enter_long'] = 1
 
         # print(len(dataframe.keys()))
 
         return dataframe
 
+    @hash_candles_once
     def populate_exit_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-
-        conditions = list()
-        # TODO: Its not dry code!
-        sell_indicator = self.sell_indicator0.value
-        sell_crossed_indicator = self.sell_crossed_indicator0.value
-        sell_operator = self.sell_operator0.value
-        sell_real_num = self.sell_real_num0.value
-        condition, dataframe = condition_generator(
-            dataframe,
-            sell_operator,
-            sell_indicator,
-            sell_crossed_indicator,
-            sell_real_num
-        )
-        conditions.append(condition)
-
-        sell_indicator = self.sell_indicator1.value
-        sell_crossed_indicator = self.sell_crossed_indicator1.value
-        sell_operator = self.sell_operator1.value
-        sell_real_num = self.sell_real_num1.value
-        condition, dataframe = condition_generator(
-            dataframe,
-            sell_operator,
-            sell_indicator,
-            sell_crossed_indicator,
-            sell_real_num
-        )
-        conditions.append(condition)
-
-        sell_indicator = self.sell_indicator2.value
-        sell_crossed_indicator = self.sell_crossed_indicator2.value
-        sell_operator = self.sell_operator2.value
-        sell_real_num = self.sell_real_num2.value
-        condition, dataframe = condition_generator(
-            dataframe,
-            sell_operator,
-            sell_indicator,
-            sell_crossed_indicator,
-            sell_real_num
-        )
-        conditions.append(condition)
-
-        if conditions:
-            dataframe.loc[
-                reduce(lambda x, y: x & y, conditions),
-                'exit_long']=1
+        exit_ = self.genes_mask(dataframe, metadata, (
+            (self.sell_indicator0, self.sell_crossed_indicator0, self.sell_operator0, self.sell_real_num0),
+            (self.sell_indicator1, self.sell_crossed_indicator1, self.sell_operator1, self.sell_real_num1),
+            (self.sell_indicator2, self.sell_crossed_indicator2, self.sell_operator2, self.sell_real_num2),
+        ))
+        dataframe.loc[exit_, 'exit_long'] = 1
         return dataframe
+
+    def genes_mask(self, dataframe: DataFrame, metadata: dict, genes_params) -> np.ndarray:
+        """
+        AND of the genes given by (indicator, crossed indicator, operator, real number) params.
+        """
+        genes = []
+        columns = {}
+        for position, (indicator, crossed_indicator, operator, real_num) in enumerate(genes_params):
+            gene, gene_columns = gene_generator(
+                dataframe,
+                operator.value,
+                indicator.value,
+                crossed_indicator.value,
+                real_num.value,
+                position,
+                metadata['pair']
+            )
+            genes.append(gene)
+            columns.update(gene_columns)
+        return compile_rules(genes, trend_column).evaluate(columns)
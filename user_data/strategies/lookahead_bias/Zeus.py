@@ -21,6 +21,14 @@ from ta.utils import dropna
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 from functools import reduce
 import numpy as np
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from shared.normalize import CausalNormalizer  # noqa: E402
+
+# Candles the min / max of the normalization are taken over
+NORMALIZE_WINDOW = 500
+NORMALIZER = CausalNormalizer(NORMALIZE_WINDOW)
 
 
 class Zeus(IStrategy):
@@ -69,6 +77,9 @@ class Zeus(IStrategy):
     # Buy hypers
     timeframe = '4h'
 
+    # Full normalization window before the first signal
+    startup_candle_count: int = NORMALIZE_WINDOW
+
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         # Add all ta features
 
@@ -96,12 +107,10 @@ class Zeus(IStrategy):
 
         dataframe['trend_kst_diff'] = KST.kst_diff()
 
-        # Normalization
-        tib = dataframe['trend_ichimoku_base']
-        dataframe['trend_ichimoku_base'] = (
-            tib-tib.min())/(tib.max()-tib.min())
-        tkd = dataframe['trend_kst_diff']
-        dataframe['trend_kst_diff'] = (tkd-tkd.min())/(tkd.max()-tkd.min())
+        # Normalization (causal, over the last NORMALIZE_WINDOW candles)
+        for column in ('trend_ichimoku_base', 'trend_kst_diff'):
+            dataframe[column] = NORMALIZER.normalize(
+                (metadata['pair'], column), dataframe['date'], dataframe[column])
         return dataframe
 
     def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
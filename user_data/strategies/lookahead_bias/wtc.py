@@ -8,8 +8,6 @@
 # request to making this strategy.
 # hope you enjoy and get profit
 # Author: @Mablue (Masoud Azizi)
-# IMPORTANT: install sklearn befoure you run this strategy:
-# pip install sklearn
 # github: https://github.com/mablue/
 # freqtrade hyperopt --hyperopt-loss SharpeHyperOptLoss --spaces buy sell --strategy wtc
 
@@ -22,10 +20,17 @@ from pandas import DataFrame
 # --- Do not remove these libs ---
 import numpy as np  # noqa
 import pandas as pd  # noqa
-from sklearn import preprocessing
+import sys
+from pathlib import Path
 
 # --------------------------------
 # Add your lib to import here
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from shared.normalize import CausalNormalizer  # noqa: E402
+
+# Candles the min / max of the normalization are taken over
+NORMALIZE_WINDOW = 500
+NORMALIZER = CausalNormalizer(NORMALIZE_WINDOW)
 
 
 class wtc(IStrategy):
@@ -75,6 +80,9 @@ class wtc(IStrategy):
     ############################## END SETTINGS ##############################
     timeframe = '30m'
 
+    # Full normalization window before the first signal
+    startup_candle_count: int = NORMALIZE_WINDOW
+
     buy_max = DecimalParameter(-1, 1, decimals=4, default=0.4393, space='buy')
     buy_min = DecimalParameter(-1, 1, decimals=4, default=-0.4676, space='buy')
     sell_max = DecimalParameter(-1, 1, decimals=4,
@@ -116,11 +124,10 @@ class wtc(IStrategy):
             stoch = ta.STOCH(dataframe, 14)
             slowk = stoch['slowk']
             dataframe['slowk'] = slowk
-            # print(dataframe.iloc[:, 6:].keys())
-            x = dataframe.iloc[:, 6:].values  # returns a numpy array
-            min_max_scaler = preprocessing.MinMaxScaler()
-            x_scaled = min_max_scaler.fit_transform(x)
-            dataframe.iloc[:, 6:] = pd.DataFrame(x_scaled)
+            # Scale each column to [0, 1], causally over the last NORMALIZE_WINDOW candles
+            for column in ('wt1', 'wt2', 'slowk'):
+                dataframe[column] = NORMALIZER.normalize(
+                    (metadata['pair'], column), dataframe['date'], dataframe[column])
             # print('wt:\t', dataframe['wt'].min(), dataframe['wt'].max())
             # print('stoch:\t', dataframe['stoch'].min(), dataframe['stoch'].max())
             dataframe['def'] = dataframe['slowk']-dataframe['wt1']
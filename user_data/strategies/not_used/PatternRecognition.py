@@ -16,6 +16,10 @@ import talib.abstract as ta
 import pandas_ta as pta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 from technical.util import resample_to_interval, resampled_merge
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from shared.candle_patterns import CandlePatterns  # noqa: E402
 
 
 class PatternRecognition(IStrategy):
@@ -61,16 +65,21 @@ class PatternRecognition(IStrategy):
 
 
 
+    def bot_start(self, **kwargs) -> None:
+        # Patterns are calculated when a condition first uses them, see shared/candle_patterns.py
+        self.patterns = CandlePatterns(self.prs)
+
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        for pr in self.prs:
-            dataframe[pr] = getattr(ta, pr)(dataframe)
+        # Every hyperopt epoch may pick another pattern: all of them in one pass up front
+        if self.dp.runmode.value == 'hyperopt':
+            self.patterns.precompute(metadata['pair'], dataframe)
 
         return dataframe
 
     def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         dataframe.loc[
             (
-                (dataframe[self.buy_pr1.value]==self.buy_vol1.value)
+                (self.patterns.get(metadata['pair'], dataframe, self.buy_pr1.value)==self.buy_vol1.value)
                 # |(dataframe[self.buy_pr2.value]==self.buy_vol2.value)
             ),
             'enter_long'] = 1
@@ -17,6 +17,10 @@ from pandas import DataFrame
 import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 import numpy
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from shared.range_indicators import RangeIndicator  # noqa: E402
 
 
 
@@ -52,6 +56,10 @@ class SwingHighToSky(IStrategy):
     sell_rsi = IntParameter(low=10, high=90, default=30, space='sell', optimize=True)
     sell_rsiTime = IntParameter(low=10, high=80, default=26, space='sell', optimize=True)
 
+    # One column per period of the buy and sell ranges together
+    cci = RangeIndicator('cci', lambda dataframe, period: ta.CCI(dataframe, timeperiod=period))
+    rsi = RangeIndicator('rsi', lambda dataframe, period: ta.RSI(dataframe, timeperiod=period))
+
     # Buy hyperspace params:
     buy_params = {
         "buy_cci": -175,
@@ -73,17 +81,8 @@ class SwingHighToSky(IStrategy):
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
 
-        for val in self.buy_cciTime.range:
-            dataframe[f'cci-{val}'] = ta.CCI(dataframe, timeperiod=val)
-
-        for val in self.sell_cciTime.range:
-            dataframe[f'cci-sell-{val}'] = ta.CCI(dataframe, timeperiod=val)
-
-        for val in self.buy_rsiTime.range:
-            dataframe[f'rsi-{val}'] = ta.RSI(dataframe, timeperiod=val)
-
-        for val in self.sell_rsiTime.range:
-            dataframe[f'rsi-sell-{val}'] = ta.RSI(dataframe, timeperiod=val)
+        dataframe = self.cci.add(dataframe, self.buy_cciTime, self.sell_cciTime)
+        dataframe = self.rsi.add(dataframe, self.buy_rsiTime, self.sell_rsiTime)
 
         return dataframe
 
@@ -91,8 +90,8 @@ class SwingHighToSky(IStrategy):
 
         dataframe.loc[
             (
-                (dataframe[f'cci-{self.buy_cciTime.value}'] < self.buy_cci.value) &
-                (dataframe[f'rsi-{self.buy_rsiTime.value}'] < self.buy_rsi.value)
+                (dataframe[self.cci.column(self.buy_cciTime.value)] < self.buy_cci.value) &
+                (dataframe[self.rsi.column(self.buy_rsiTime.value)] < self.buy_rsi.value)
             ),
             'enter_long'] = 1
 
@@ -102,8 +101,8 @@ class SwingHighToSky(IStrategy):
 
         dataframe.loc[
             (
-                (dataframe[f'cci-sell-{self.sell_cciTime.value}'] > self.sell_cci.value) &
-                (dataframe[f'rsi-sell-{self.sell_rsiTime.value}'] > self.sell_rsi.value)
+                (dataframe[self.cci.column(self.sell_cciTime.value)] > self.sell_cci.value) &
+                (dataframe[self.rsi.column(self.sell_rsiTime.value)] > self.sell_rsi.value)
             ),
             'exit_long'] = 1
 
@@ -0,0 +1,9 @@
+"""
+Shared indicator and helper code for the strategies in this folder.
+
+Strategies living in a sub folder (``futures/``, ``not_used/``, ...) have to put
+``user_data/strategies`` on ``sys.path`` before importing from here, e.g.:
+
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+    from shared.supertrend import supertrend
+"""
@@ -0,0 +1,108 @@
+"""
+TA-Lib candlestick patterns, calculated when first used.
+
+PatternRecognition trades on one or two of the ~61 TA-Lib patterns, but used to add a
+column for every one of them to each dataframe. ``CandlePatterns.get`` calculates a pattern
+the first time a condition asks for it and keeps it per pair until the pair's candles
+change. ``precompute`` (hyperopt, where every epoch may pick another pattern) calculates
+all of them in one pass into a single int8 matrix: TA-Lib patterns are -200, -100, 0, 100
+or 200, stored divided by 100.
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import talib
+from pandas import DataFrame
+
+PATTERNS = talib.get_function_groups()['Pattern Recognition']
+# Every pattern output is a multiple of this
+PATTERN_UNIT = 100
+
+
+def _ohlc(dataframe: DataFrame):
+    return tuple(dataframe[column].to_numpy(dtype=np.float64) for column in ('open', 'high', 'low', 'close'))
+
+
+def pattern_matrix(dataframe: DataFrame, patterns: Sequence[str] = PATTERNS) -> np.ndarray:
+    """
+    All patterns of the dataframe, one int8 column per pattern in units of ``PATTERN_UNIT``.
+    """
+    ohlc = _ohlc(dataframe)
+    matrix = np.empty((len(dataframe), len(patterns)), dtype=np.int8)
+    for position, pattern in enumerate(patterns):
+        matrix[:, position] = getattr(talib, pattern)(*ohlc) // PATTERN_UNIT
+    return matrix
+
+
+class _PairPatterns:
+
+    def __init__(self, dates: np.ndarray):
+        self.dates = dates
+        self.columns: Dict[str, np.ndarray] = {}
+        self.matrix: Optional[np.ndarray] = None
+        self.matrix_columns: Dict[str, int] = {}
+
+    def rows(self, dates: np.ndarray) -> Optional[slice]:
+        """
+        Rows of ``dates`` in the stored candles, None if they aren't a contiguous part of them.
+        """
+        if not len(dates):
+            return None
+        start = int(np.searchsorted(self.dates, dates[0]))
+        end = start + len(dates)
+        if end > len(self.dates) or self.dates[start] != dates[0] or self.dates[end - 1] != dates[-1]:
+            return None
+        return slice(start, end)
+
+
+class CandlePatterns:
+    """
+    Usage:
+        # bot_start
+        self.patterns = CandlePatterns()
+        # populate_indicators, hyperopt only
+        self.patterns.precompute(metadata['pair'], dataframe)
+        # populate_entry_trend
+        dataframe.loc[self.patterns.get(metadata['pair'], dataframe, 'CDLHIGHWAVE') == -100, 'enter_long'] = 1
+    """
+
+    def __init__(self, patterns: Sequence[str] = PATTERNS):
+        self.patterns = list(patterns)
+        self._pairs: Dict[str, _PairPatterns] = {}
+
+    def precompute(self, pair: str, dataframe: DataFrame) -> None:
+        """
+        Calculate all patterns of the pair's candles at once.
+        """
+        entry = _PairPatterns(dataframe['date'].values)
+        entry.matrix = pattern_matrix(dataframe, self.patterns)
+        entry.matrix_columns = {pattern: position for position, pattern in enumerate(self.patterns)}
+        self._pairs[pair] = entry
+
+    def get(self, pair: str, dataframe: DataFrame, pattern: str) -> np.ndarray:
+        """
+        Values of the pattern (-200 ... 200) for the dataframe's candles.
+        The dataframe may be a part of the candles the patterns were calculated for, e.g. the
+        dataframe hyperopt trims the startup candles off.
+        """
+        dates = dataframe['date'].values
+        entry = self._pairs.get(pair)
+        rows = entry.rows(dates) if entry is not None else None
+        if rows is None:
+            entry = _PairPatterns(dates)
+            self._pairs[pair] = entry
+            rows = slice(0, len(dates))
+
+        position = entry.matrix_columns.get(pattern)
+        if position is not None:
+            return entry.matrix[rows, position].astype(np.int32) * PATTERN_UNIT
+
+        if pattern not in entry.columns:
+            if rows != slice(0, len(entry.dates)):
+                # A part of the stored candles, the pattern needs them all
+                entry = _PairPatterns(dates)
+                self._pairs[pair] = entry
+                rows = slice(0, len(dates))
+            entry.columns[pattern] = getattr(talib, pattern)(*_ohlc(dataframe))
+        return entry.columns[pattern][rows]
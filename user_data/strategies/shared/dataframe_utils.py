@@ -0,0 +1,28 @@
+"""
+Small dataframe helpers shared by the strategies.
+"""
+
+from typing import Mapping
+
+import pandas as pd
+from pandas import DataFrame
+
+
+def append_columns(dataframe: DataFrame, columns: Mapping) -> DataFrame:
+    """
+    Add many columns to a dataframe in one go.
+
+    Assigning hundreds of columns one by one fragments the dataframe (and makes pandas
+    warn about it), a single concat builds the new blocks once.
+    :param dataframe: Dataframe to extend
+    :param columns: Mapping of column name to array / Series aligned with the dataframe
+    :return: New dataframe with the columns added (existing columns are replaced)
+    """
+    if not columns:
+        return dataframe
+
+    existing = [column for column in columns if column in dataframe.columns]
+    if existing:
+        dataframe = dataframe.drop(columns=existing)
+
+    return pd.concat([dataframe, DataFrame(dict(columns), index=dataframe.index)], axis=1)
@@ -0,0 +1,158 @@
+"""
+Append-only trace of the entry / exit decisions of the Goal strategies.
+
+Every ``Diagnostics.record`` of a traced strategy adds one row per (event, pair, candle):
+the latest value of each condition (depth, large orders, volume, close, RSI, trend, ...)
+and of the resulting signal. Rows are buffered in memory and written in batches to
+feather files, so the decisions stay diagnosable with the INFO logging turned off. A batch
+is written every ``flush_size`` rows, and at the latest ``flush_interval`` seconds after
+the previous one (``flush_due`` from ``bot_loop_start``), so a crash loses little.
+The trace is written in live / dry-run only, set ``"decision_trace": false`` in the config
+to disable it.
+
+Layout:
+    <user_data_dir>/decision_traces/<Strategy>/<event>/<write time ns>.feather
+    columns: date, pair, one column per recorded field
+
+Offline:
+    trace = load_decision_trace('user_data/decision_traces', 'Strategy_Goal_Vidra', pair='SOL/USDT')
+    trace[~trace['signal'] & trace['depth']]
+
+Every write adds a small file per event. ``load_decision_trace(..., compact=True)`` merges
+the files it read into one (e.g. from a daily job), later loads read that one file.
+"""
+
+import atexit
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+import pandas as pd
+from pandas import DataFrame
+
+logger = logging.getLogger(__name__)
+
+
+class DecisionTrace:
+    """
+    Buffers decision rows in memory and writes them to disk in batches.
+    """
+
+    def __init__(self, directory: Path, flush_size: int = 500, flush_interval: float = 300):
+        """
+        :param directory: Directory of the strategy's trace (one sub folder per event)
+        :param flush_size: Number of buffered rows (over all events) triggering a write
+        :param flush_interval: Maximum number of seconds rows stay buffered
+        """
+        self.directory = Path(directory)
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._buffer: Dict[str, List[Dict[str, Any]]] = {}
+        self._buffered = 0
+        self._flushed_at = time.monotonic()
+        # Don't lose the last batch when the bot stops
+        atexit.register(self.flush)
+
+    @classmethod
+    def for_strategy(cls, strategy) -> Optional['DecisionTrace']:
+        """
+        Trace of the strategy in live / dry-run, None in the other run modes or if disabled.
+        """
+        if not strategy.config.get('decision_trace', True):
+            return None
+        if strategy.dp.runmode.value not in ('live', 'dry_run'):
+            return None
+        return cls(Path(strategy.config['user_data_dir']) / 'decision_traces' / type(strategy).__name__)
+
+    def record(self, event: str, pair: str, values: Mapping[str, Any]) -> None:
+        """
+        Add a row to the buffer.
+        :param event: Decision the row belongs to, e.g. 'entry'
+        :param pair: Pair of the decision
+        :param values: Scalar value per field, a 'date' field is used as the candle date
+        """
+        row = dict(values)
+        date = row.pop('date', None)
+        row = {'date': date if date is not None else pd.Timestamp(time.time(), unit='s', tz='UTC'),
+               'pair': pair, **row}
+        self._buffer.setdefault(event, []).append(row)
+        self._buffered += 1
+
+        if self._buffered >= self.flush_size:
+            self.flush()
+        else:
+            self.flush_due()
+
+    def flush_due(self) -> None:
+        """
+        Write the buffered rows if ``flush_interval`` passed since the last write.
+        """
+        if self._buffered and time.monotonic() - self._flushed_at >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write all buffered rows, one new file per event.
+        """
+        for event, rows in self._buffer.items():
+            if not rows:
+                continue
+
+            trace_df = DataFrame(rows)
+            trace_df['date'] = pd.to_datetime(trace_df['date'], utc=True)
+            trace_df['pair'] = trace_df['pair'].astype('category')
+
+            event_dir = self.directory / event
+            event_dir.mkdir(parents=True, exist_ok=True)
+            try:
+                # Rows of several pairs share a candle date, the write time keeps the files apart
+                trace_df.to_feather(event_dir / f'{time.time_ns()}.feather')
+            except Exception as e:
+                logger.warning(f"Could not write the {event} decision trace: {e}")
+
+        self._buffer = {}
+        self._buffered = 0
+        self._flushed_at = time.monotonic()
+
+
+def load_decision_trace(directory: Path, strategy: str, event: str = 'entry',
+                        pair: Optional[str] = None, compact: bool = False) -> DataFrame:
+    """
+    Recorded decisions of a strategy, sorted by date (empty dataframe if none).
+    :param directory: Root directory of the traces (<user_data_dir>/decision_traces)
+    :param strategy: Strategy class name
+    :param event: Decision to load, e.g. 'entry' or 'exit'
+    :param pair: Only the rows of this pair if given
+    :param compact: Merge the files read into one. Safe while the bot runs: files it writes
+        meanwhile aren't touched
+    """
+    files = sorted((Path(directory) / strategy / event).glob('*.feather'))
+    if not files:
+        return DataFrame({'date': pd.Series(dtype='datetime64[ns, UTC]'), 'pair': pd.Series(dtype=str)})
+
+    trace = pd.concat([pd.read_feather(file) for file in files], ignore_index=True)
+    trace['pair'] = trace['pair'].astype(str)
+    if compact and len(files) > 1:
+        _compact(trace, files)
+    if pair is not None:
+        trace = trace[trace['pair'] == pair]
+    return trace.sort_values('date', kind='stable').reset_index(drop=True)
+
+
+def _compact(trace: DataFrame, files: List[Path]) -> None:
+    """
+    Replace the files with one holding all their rows, under the newest file's name (the
+    names are write times, the merged file sorts where its last rows were written).
+    """
+    compacted = trace.sort_values('date', kind='stable').reset_index(drop=True)
+    compacted['pair'] = compacted['pair'].astype('category')
+    tmp_path = files[-1].with_name(f'{files[-1].stem}.{os.getpid()}.tmp')
+    try:
+        compacted.to_feather(tmp_path)
+        os.replace(tmp_path, files[-1])
+        for file in files[:-1]:
+            file.unlink()
+    except OSError as e:
+        logger.warning(f"Could not compact the decision trace in {files[-1].parent}: {e}")
@@ -0,0 +1,98 @@
+"""
+Structured diagnostics for the populate_* hot paths.
+
+The strategies used to log every candle with f-strings holding pandas objects
+(``volume_value.tail(5)``, ``dataframe[['date', 'rsi']].tail(2)``, ...), which renders them
+to strings on every call, even when INFO is filtered. ``Diagnostics.record`` instead keeps
+the latest value of each field as a plain number per (event, pair) and only formats a
+message when the logger is enabled for DEBUG, or at INFO for every ``sample_rate``-th
+record of an event. Records are also appended to the strategy's ``DecisionTrace`` (see
+shared/decision_trace.py) when one is given, whatever the log level.
+
+Usage:
+    # bot_start
+    self.diagnostics = Diagnostics(self.logger, sample_rate=self.config.get('diagnostics_sample_rate', 0),
+                                   trace=DecisionTrace.for_strategy(self))
+    # populate_entry_trend
+    self.diagnostics.record('entry', metadata['pair'], date=dataframe['date'], depth=depth_value,
+                            volume=volume_value, signal=entry)
+"""
+
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from shared.decision_trace import DecisionTrace
+
+
+def _latest(value: Any) -> Any:
+    """
+    Last value of a Series / array, numpy scalars as Python numbers.
+    """
+    if hasattr(value, 'iloc'):
+        value = value.iloc[-1] if len(value) else np.nan
+    elif isinstance(value, np.ndarray):
+        value = value[-1] if len(value) else np.nan
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _tail(value: Any, tail: int) -> Any:
+    if hasattr(value, 'iloc'):
+        return value.iloc[-tail:].to_numpy().tolist()
+    if isinstance(value, np.ndarray):
+        return value[-tail:].tolist()
+    return value
+
+
+class Diagnostics:
+    """
+    Latest diagnostic values per (event, pair), logged on demand.
+    """
+
+    def __init__(self, logger: logging.Logger, sample_rate: int = 0, tail: int = 5,
+                 trace: Optional[DecisionTrace] = None):
+        """
+        :param logger: Logger of the strategy
+        :param sample_rate: Log every n-th record of an event at INFO, 0 to only log at DEBUG
+        :param tail: Number of trailing values shown per Series / array field
+        :param trace: Trace every record is appended to, None for none
+        """
+        self.logger = logger
+        self.sample_rate = sample_rate
+        self.tail = tail
+        self.trace = trace
+        self.latest: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._counts: Dict[str, int] = {}
+
+    def flush_due(self) -> None:
+        """
+        Write the buffered trace rows once their ``flush_interval`` elapsed (from ``bot_loop_start``).
+        """
+        if self.trace is not None:
+            self.trace.flush_due()
+
+    def record(self, event: str, pair: str, **fields: Any) -> None:
+        """
+        Store the latest value of every field and log the record if enabled.
+        Fields may be scalars, Series or arrays; Series and arrays are only formatted
+        (their last ``tail`` values) when the record is logged.
+        """
+        latest = {name: _latest(value) for name, value in fields.items()}
+        self.latest[(event, pair)] = latest
+        if self.trace is not None:
+            self.trace.record(event, pair, latest)
+
+        level = None
+        if self.sample_rate:
+            count = self._counts.get(event, 0)
+            self._counts[event] = count + 1
+            if count % self.sample_rate == 0:
+                level = logging.INFO
+        if level is None:
+            if not self.logger.isEnabledFor(logging.DEBUG):
+                return
+            level = logging.DEBUG
+
+        self.logger.log(level, "%s %s: %s", event, pair,
+                        ", ".join(f"{name}={_tail(value, self.tail)}" for name, value in fields.items()))
@@ -0,0 +1,271 @@
+"""
+Partial take profit / break-even exit logic of the Goal, SLpart and PLpart strategies.
+
+``ExitLadder`` sells fixed fractions of the stake at a table of price targets, closes the
+rest at a final target and can buy in at DCA levels (Goal_* strategies).
+``TrailingProfitLadder`` sells fractions of the stake when the price falls back from the
+best price seen during the trade (SLpart / PLpart strategies).
+Both move the stop to break-even once the price rate reaches the activation level.
+
+Per trade state lives in the trade's custom data, under the same keys the strategies always
+used, so open trades carry over. ``TradeState`` keeps it in memory: the open trades are read
+at startup, changes are written once per bot iteration (stage flags right away).
+
+Strategies using a ladder call ``self.exit_ladder.state.load_open_trades()`` in ``bot_start``
+and ``self.exit_ladder.state.flush()`` in ``bot_loop_start``.
+"""
+
+import logging
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from freqtrade.persistence import Trade
+from freqtrade.strategy import stoploss_from_open
+
+BE_ACTIVATED = 'be_activated'
+STAGE_SOLD = 'stage_{stage}_sold'
+STAGE_BOUGHT = 'stage_{stage}_bought'
+BEST_PRICE_KEY = 'best_price'
+PL_SELL_HALF_KEY = 'pl_sell_half'
+PL_SELL_3_4_KEY = 'pl_sell_3_4'
+
+# (fraction of pl, custom data key, fraction of the stake sold), checked in this order
+TRAILING_STAGES = (
+    (0.75, PL_SELL_3_4_KEY, 0.5),
+    (0.5, PL_SELL_HALF_KEY, 0.5),
+)
+
+
+def price_rate(trade: Trade, current_rate: float) -> float:
+    """
+    Relative price move in favour of the trade (positive is profit, shorts included).
+    """
+    if trade.is_short:
+        return trade.open_rate / current_rate - 1
+    return current_rate / trade.open_rate - 1
+
+
+class TradeState:
+    """
+    In-process cache of trade custom data with dirty tracking.
+
+    ``set`` only marks a value dirty, ``flush`` (called from ``bot_loop_start``) writes all
+    dirty values once per bot iteration. Values that must not be lost on a crash, e.g. the
+    flag of a stage whose order was just placed, are written immediately with ``flush=True``.
+    ``load_open_trades`` (called from ``bot_start``) fills the cache for the open trades,
+    so a restarted bot continues with the stored state without reading key by key.
+    """
+
+    def __init__(self, logger: Optional[logging.Logger] = None):
+        self.logger = logger or logging.getLogger(__name__)
+        self._values: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+        self._trades: Dict[Tuple[Any, Any], Trade] = {}
+        self._loaded = set()
+        self._dirty: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+
+    def _trade_values(self, trade: Trade) -> Dict[str, Any]:
+        # Backtesting may reuse trade ids across runs, the open date tells them apart
+        trade_key = (trade.id, trade.open_date)
+        self._trades[trade_key] = trade
+        return self._values.setdefault(trade_key, {})
+
+    def get(self, trade: Trade, key: str, default: Any = None) -> Any:
+        values = self._trade_values(trade)
+        if key not in values:
+            if (trade.id, trade.open_date) in self._loaded:
+                return default
+            values[key] = trade.get_custom_data(key, default=default)
+        return values[key]
+
+    def set(self, trade: Trade, key: str, value: Any, flush: bool = False) -> None:
+        """
+        :param flush: Write the value right away instead of with the next ``flush()``
+        """
+        values = self._trade_values(trade)
+        trade_key = (trade.id, trade.open_date)
+        if key in values and values[key] == value:
+            return
+        values[key] = value
+
+        if flush:
+            trade.set_custom_data(key, value)
+            self._dirty.get(trade_key, {}).pop(key, None)
+        else:
+            self._dirty.setdefault(trade_key, {})[key] = value
+
+    def flush(self) -> None:
+        """
+        Write all dirty values and forget the trades which are closed.
+        """
+        for trade_key, values in self._dirty.items():
+            trade = self._trades[trade_key]
+            for key, value in values.items():
+                trade.set_custom_data(key, value)
+        self._dirty = {}
+
+        for trade_key in [trade_key for trade_key, trade in self._trades.items() if not trade.is_open]:
+            del self._trades[trade_key]
+            self._values.pop(trade_key, None)
+            self._loaded.discard(trade_key)
+
+    def load_open_trades(self) -> None:
+        """
+        Read the custom data of all open trades in one go.
+        """
+        try:
+            trades = Trade.get_trades_proxy(is_open=True)
+            for trade in trades:
+                values = self._trade_values(trade)
+                for custom_data in trade.get_all_custom_data():
+                    values[custom_data.cd_key] = custom_data.value
+                self._loaded.add((trade.id, trade.open_date))
+        except Exception as e:
+            self.logger.warning(f"Could not load the custom data of the open trades: {e}")
+
+
+class _BreakEvenStop:
+
+    def __init__(self, break_even: float, break_even_offset: float, inclusive: bool,
+                 state: Optional[TradeState], logger: Optional[logging.Logger]):
+        self.break_even = break_even
+        self.break_even_offset = break_even_offset
+        self.inclusive = inclusive
+        self.state = state if state is not None else TradeState(logger)
+        self.logger = logger or logging.getLogger(__name__)
+
+    def custom_stoploss(self, trade: Trade, current_rate: float, current_profit: float) -> Optional[float]:
+        """
+        Stop at ``break_even_offset`` above the open rate once the break-even level was reached.
+        :return: Stoploss relative to current_rate as expected by custom_stoploss, None to keep it
+        """
+        be_activated = self.state.get(trade, BE_ACTIVATED, default=False)
+
+        if not be_activated:
+            rate = price_rate(trade, current_rate)
+            reached = rate >= self.break_even if self.inclusive else rate > self.break_even
+            if not reached:
+                return None
+            self.state.set(trade, BE_ACTIVATED, True, flush=True)
+
+        return stoploss_from_open(self.break_even_offset, current_profit,
+                                  is_short=trade.is_short, leverage=trade.leverage)
+
+
+class ExitLadder(_BreakEvenStop):
+    """
+    Usage:
+        # bot_start
+        self.exit_ladder = ExitLadder(
+            stages=[(self.target_stage_1, self.stage_1_sell_amount),
+                    (self.target_stage_2, self.stage_2_sell_amount)],
+            final_target=self.target_percent, logger=self.logger)
+        # custom_stoploss / adjust_trade_position
+        return self.exit_ladder.custom_stoploss(trade, current_rate, current_profit)
+        return self.exit_ladder.adjust_trade_position(trade, current_rate)
+    """
+
+    def __init__(self, stages: Sequence[Tuple[float, float]], final_target: float,
+                 dca: Sequence[Tuple[float, float]] = (), break_even: Optional[float] = None,
+                 break_even_offset: float = 0.002, state: Optional[TradeState] = None,
+                 logger: Optional[logging.Logger] = None):
+        """
+        :param stages: (price rate target, fraction of the stake to sell), sold once each
+        :param final_target: Price rate at which the whole position is closed
+        :param dca: (price rate level, fraction of the stake to buy), bought once each
+        :param break_even: Price rate activating the break-even stop, the first target if None
+        :param break_even_offset: Profit above the open rate the break-even stop is placed at
+        :param state: Custom data cache, shared with the strategy if it needs the keys itself
+        :param logger: Logger for the stage messages
+        """
+        if break_even is None:
+            break_even = stages[0][0] if stages else final_target
+        super().__init__(break_even, break_even_offset, True, state, logger)
+
+        self.stages = [(stage, STAGE_SOLD.format(stage=stage), target, amount)
+                       for stage, (target, amount) in enumerate(stages, start=1)]
+        self.dca = [(STAGE_BOUGHT.format(stage=stage), level, amount)
+                    for stage, (level, amount) in enumerate(dca)]
+        self.final_target = final_target
+
+    def adjust_trade_position(self, trade: Trade, current_rate: float) -> Optional[float]:
+        """
+        Stake amount to buy (positive) or sell (negative) for the current rate, None for nothing.
+        """
+        rate = price_rate(trade, current_rate)
+        self.logger.debug("Check for goal to be closed, price rate %s", rate)
+
+        for key, level, amount in self.dca:
+            if rate <= level and not self.state.get(trade, key, default=False):
+                self.logger.info(f"DCA level {level} reached, buying {amount * 100}% more")
+                self.state.set(trade, key, True, flush=True)
+                return amount * trade.stake_amount
+
+        for stage, key, target, amount in self.stages:
+            if rate >= target and not self.state.get(trade, key, default=False):
+                self.logger.info(f"Price rise up bigger than {target}, closing target {stage} {amount}")
+                self.state.set(trade, key, True, flush=True)
+                return - (trade.stake_amount * amount)
+
+        if rate >= self.final_target:
+            self.logger.info(f"Price rise up bigger than {self.final_target}, closing order")
+            return - trade.stake_amount
+
+        return None
+
+
+class TrailingProfitLadder(_BreakEvenStop):
+    """
+    Sells parts of the position when the price gives back ``pl`` fractions of the move
+    from the best price, everything once it gave back ``pl``. A new best price re-arms
+    the partial sells.
+    """
+
+    def __init__(self, pl: float, break_even: float, break_even_offset: float = 0.002,
+                 stages: Sequence[Tuple[float, str, float]] = TRAILING_STAGES,
+                 state: Optional[TradeState] = None, logger: Optional[logging.Logger] = None):
+        """
+        :param pl: Pull back from the best price closing the whole position
+        :param break_even: Price rate activating the break-even stop (strictly exceeded)
+        :param break_even_offset: Profit above the open rate the break-even stop is placed at
+        :param stages: (fraction of pl, custom data key, fraction of the stake to sell)
+        :param state: Custom data cache
+        :param logger: Logger for the stage messages
+        """
+        super().__init__(break_even, break_even_offset, False, state, logger)
+        self.pl = pl
+        self.stages = [(self.pl * fraction, key, amount) for fraction, key, amount in stages]
+
+    def adjust_trade_position(self, trade: Trade, current_rate: float) -> Optional[float]:
+        """
+        Negative stake amount to sell for the current rate, None for nothing.
+        """
+        best_price = self.state.get(trade, BEST_PRICE_KEY, default=0)
+
+        if not best_price:
+            self.state.set(trade, BEST_PRICE_KEY, current_rate)
+            return None
+
+        if current_rate < best_price if trade.is_short else current_rate > best_price:
+            self.state.set(trade, BEST_PRICE_KEY, current_rate)
+            for _, key, _ in self.stages:
+                if self.state.get(trade, key, default=False):
+                    self.state.set(trade, key, False)
+            return None
+
+        if trade.is_short:
+            profit_loss = 1 - best_price / current_rate
+        else:
+            profit_loss = 1 - current_rate / best_price
+
+        if profit_loss > self.pl:
+            self.logger.info(f"Profit loss for trade {trade.id} is reached {profit_loss}. "
+                             f"Sell all. Type: {trade.trade_direction}")
+            return - trade.stake_amount
+
+        for threshold, key, amount in self.stages:
+            if profit_loss > threshold and not self.state.get(trade, key, default=False):
+                self.logger.info(f"Profit loss for trade {trade.id} is reached {profit_loss}. "
+                                 f"Sell {amount} of stake. Type: {trade.trade_direction}")
+                self.state.set(trade, key, True, flush=True)
+                return - (trade.stake_amount * amount)
+
+        return None
@@ -0,0 +1,235 @@
+"""
+Operator genes of the GodStra strategies compiled into one boolean mask.
+
+A gene compares an indicator column with a cross column, a number or the indicator's trend
+column (GodStraNew's "<indicator>-SMA-<n>"), e.g. ``('CA', 'trend_macd', 'trend_macd_signal',
+0, 0.5)``. GodStra, GodStraHo and GodStraNew used to walk an if / elif chain per gene,
+building pandas Series for every comparison and shift, and ``reduce`` them with ``&``.
+
+``compile_rules`` resolves the operators once into a ``RulePlan``. ``RulePlan.evaluate``
+runs the NumPy ufuncs of every gene straight on the column arrays, into a few reused
+boolean buffers, ANDing each gene into one result mask. The previous candle of a column
+(crossovers) is shifted once per evaluation, however many genes use it. The results are
+the ones of the pandas / qtpylib expressions: NaN compares False, also in the shifted
+first row.
+
+Usage:
+    plan = compile_rules([(operator, indicator, cross, int_value, real_value), ...])
+    mask = plan.evaluate(dataframe)
+    if mask is not None:
+        dataframe.loc[mask, 'enter_long'] = 1
+"""
+
+from functools import lru_cache
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# (operator, indicator, cross indicator, integer, real number)
+Gene = Tuple[str, str, str, int, float]
+
+# Operand of each operator: the cross column, the integer, the real number, the real
+# number compared with indicator / cross, or the trend column of the indicator
+CROSS = 'cross'
+INTEGER = 'integer'
+REAL = 'real'
+RATIO = 'ratio'
+TREND = 'trend'
+
+
+class _Evaluation:
+    """
+    Buffers and shifted columns of one ``RulePlan.evaluate`` call.
+    """
+
+    def __init__(self, data: Mapping[str, object], length: int):
+        self.data = data
+        self.length = length
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._shifted: Dict[str, np.ndarray] = {}
+        self._buffers: List[np.ndarray] = []
+        self._ratio: Optional[np.ndarray] = None
+
+    def array(self, name: str) -> np.ndarray:
+        array = self._arrays.get(name)
+        if array is None:
+            # The column's own dtype: float32 columns compare like their pandas Series do
+            array = self._arrays[name] = np.asarray(self.data[name])
+        return array
+
+    def shifted(self, name: str) -> np.ndarray:
+        """
+        Previous candle's value of the column, NaN in the first row (``Series.shift(1)``).
+        """
+        shifted = self._shifted.get(name)
+        if shifted is None:
+            array = self.array(name)
+            shifted = np.empty(self.length, dtype=array.dtype if array.dtype.kind == 'f' else np.float64)
+            shifted[:1] = np.nan
+            shifted[1:] = array[:-1]
+            self._shifted[name] = shifted
+        return shifted
+
+    def buffer(self, index: int) -> np.ndarray:
+        while len(self._buffers) <= index:
+            self._buffers.append(np.empty(self.length, dtype=bool))
+        return self._buffers[index]
+
+    def ratio(self, indicator: str, cross: str) -> np.ndarray:
+        if self._ratio is None:
+            self._ratio = np.empty(self.length, dtype=np.float64)
+        # Division by 0 is inf / NaN, like Series.div
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.divide(self.array(indicator), self.array(cross), out=self._ratio)
+
+
+def _isclose(a, b, out: np.ndarray) -> np.ndarray:
+    out[:] = np.isclose(a, b)
+    return out
+
+
+def _crossed_above(ev: _Evaluation, indicator: str, other: str, out: np.ndarray) -> np.ndarray:
+    # qtpylib.crossed_above: (a > b) & (a.shift(1) <= b.shift(1))
+    previous = ev.buffer(1)
+    np.greater(ev.array(indicator), ev.array(other), out=out)
+    np.less_equal(ev.shifted(indicator), ev.shifted(other), out=previous)
+    return np.logical_and(out, previous, out=out)
+
+
+def _crossed_below(ev: _Evaluation, indicator: str, other: str, out: np.ndarray) -> np.ndarray:
+    previous = ev.buffer(1)
+    np.less(ev.array(indicator), ev.array(other), out=out)
+    np.greater_equal(ev.shifted(indicator), ev.shifted(other), out=previous)
+    return np.logical_and(out, previous, out=out)
+
+
+def _crossed(ev: _Evaluation, indicator: str, other: str, out: np.ndarray) -> np.ndarray:
+    below = _crossed_below(ev, indicator, other, ev.buffer(2))
+    _crossed_above(ev, indicator, other, out)
+    return np.logical_or(out, below, out=out)
+
+
+def _column_rule(compare: Callable) -> Callable:
+    def rule(ev: _Evaluation, indicator: str, other: str, value, out: np.ndarray) -> np.ndarray:
+        return compare(ev.array(indicator), ev.array(other), out=out)
+    return rule
+
+
+def _value_rule(compare: Callable) -> Callable:
+    def rule(ev: _Evaluation, indicator: str, other: str, value, out: np.ndarray) -> np.ndarray:
+        return compare(ev.array(indicator), value, out=out)
+    return rule
+
+
+def _ratio_rule(compare: Callable) -> Callable:
+    def rule(ev: _Evaluation, indicator: str, other: str, value, out: np.ndarray) -> np.ndarray:
+        return compare(ev.ratio(indicator, other), value, out=out)
+    return rule
+
+
+def _cross_rule(cross: Callable, compare: Optional[Callable] = None) -> Callable:
+    def rule(ev: _Evaluation, indicator: str, other: str, value, out: np.ndarray) -> np.ndarray:
+        cross(ev, indicator, other, out)
+        if compare is not None:
+            # GodStraNew's "entered the trend": crossed and still on that side
+            np.logical_and(out, compare(ev.array(indicator), ev.array(other), out=ev.buffer(3)), out=out)
+        return out
+    return rule
+
+
+# operator: (operand, rule(evaluation, indicator, other column, value, out))
+OPERATORS: Dict[str, Tuple[str, Callable]] = {
+    '>': (CROSS, _column_rule(np.greater)),
+    '=': (CROSS, _column_rule(_isclose)),
+    '<': (CROSS, _column_rule(np.less)),
+    'C': (CROSS, _cross_rule(_crossed)),
+    'CA': (CROSS, _cross_rule(_crossed_above)),
+    'CB': (CROSS, _cross_rule(_crossed_below)),
+    '>I': (INTEGER, _value_rule(np.greater)),
+    '=I': (INTEGER, _value_rule(np.equal)),
+    '<I': (INTEGER, _value_rule(np.less)),
+    '>R': (REAL, _value_rule(np.greater)),
+    '=R': (REAL, _value_rule(_isclose)),
+    '<R': (REAL, _value_rule(np.less)),
+    '/>R': (RATIO, _ratio_rule(np.greater)),
+    '/=R': (RATIO, _ratio_rule(_isclose)),
+    '/<R': (RATIO, _ratio_rule(np.less)),
+    'UT': (TREND, _column_rule(np.greater)),
+    'DT': (TREND, _column_rule(np.less)),
+    'OT': (TREND, _column_rule(_isclose)),
+    'CUT': (TREND, _cross_rule(_crossed_above, np.greater)),
+    'CDT': (TREND, _cross_rule(_crossed_below, np.less)),
+    'COT': (TREND, _cross_rule(_crossed, _isclose)),
+}
+
+
+class RulePlan:
+    """
+    Compiled genes, see ``compile_rules``.
+    """
+
+    def __init__(self, rules: Sequence[Tuple[Callable, str, str, object]]):
+        """
+        :param rules: (rule, indicator, other column, value) per gene
+        """
+        self.rules = list(rules)
+        self.columns = sorted({column for _, indicator, other, _ in self.rules
+                               for column in (indicator, other) if column is not None})
+
+    def evaluate(self, data: Mapping[str, object]) -> Optional[np.ndarray]:
+        """
+        AND of all genes.
+        :param data: Dataframe, or column name -> array of the same length
+        :return: Boolean array, None if there's no gene (all disabled)
+        """
+        if not self.rules:
+            return None
+        length = len(data[self.columns[0]])
+        ev = _Evaluation(data, length)
+        mask = np.ones(length, dtype=bool)
+        condition = ev.buffer(0)
+        for rule, indicator, other, value in self.rules:
+            np.logical_and(mask, rule(ev, indicator, other, value, condition), out=mask)
+        return mask
+
+
+def param_genes(params: Mapping[str, object], space: str, dna_size: int) -> List[Gene]:
+    """
+    Genes of GodStra / GodStraHo params ('buy-oper-0', 'buy-indicator-0', ...).
+    """
+    return [(params[f'{space}-oper-{i}'], params[f'{space}-indicator-{i}'],
+             params[f'{space}-cross-{i}'], params.get(f'{space}-int-{i}'),
+             params.get(f'{space}-real-{i}'))
+            for i in range(dna_size)]
+
+
+@lru_cache(maxsize=1024)
+def _compile(genes: Tuple[Gene, ...], trend_column: Optional[Callable[[str], str]]) -> RulePlan:
+    rules = []
+    for operator, indicator, cross, integer, real in genes:
+        if operator not in OPERATORS:
+            # "D" (disabled) or unknown: no condition, like the if / elif chains
+            continue
+        operand, rule = OPERATORS[operator]
+        if operand == TREND:
+            if trend_column is None:
+                raise ValueError(f"Operator {operator} needs the trend column of {indicator}")
+            rules.append((rule, indicator, trend_column(indicator), None))
+        elif operand == CROSS:
+            rules.append((rule, indicator, cross, None))
+        elif operand == RATIO:
+            rules.append((rule, indicator, cross, real))
+        else:
+            rules.append((rule, indicator, None, integer if operand == INTEGER else real))
+    return RulePlan(rules)
+
+
+def compile_rules(genes: Sequence[Gene], trend_column: Optional[Callable[[str], str]] = None) -> RulePlan:
+    """
+    Compile the genes into a plan evaluating them all in one go.
+    :param genes: (operator, indicator, cross indicator, integer, real number) per gene
+    :param trend_column: Trend column name of an indicator, needed for the trend operators
+        ('UT', 'DT', 'OT', 'CUT', 'CDT', 'COT')
+    :raises ValueError: For a trend operator without ``trend_column``
+    """
+    return _compile(tuple(tuple(gene) for gene in genes), trend_column)
@@ -0,0 +1,582 @@
+"""
+Incremental TA-Lib indicators for the live bot.
+
+With ``process_only_new_candles`` populate_indicators runs once per candle, but each run
+recalculated EMA / RSI / MACD / ADX over the whole history to get one new row. The
+indicators here are the TA-Lib algorithms written as recursions (``update`` takes one
+candle, returns its values, O(1)), seeded the way TA-Lib seeds them, so fed from the first
+candle they give TA-Lib's values (within float rounding).
+
+``IncrementalIndicators`` keeps their state per pair. When the next dataframe only adds
+candles to the one it saw last (the window may also have dropped old candles at the
+front), only the new candles are fed; anything else - a new pair, a gap, a changed candle,
+other indicators - starts the pair again from the dataframe's first candle.
+
+Every ``check_every`` candles the newest row is compared with TA-Lib over the current
+dataframe. The state differs from it by float noise of the running sums and by the
+history the live window has already dropped (which the recursions still remember, TA-Lib
+seeds from the window's first candle: an EMA 200 over a 1000 candle window differs by
+~1e-7 of its value). If that exceeds ``rtol`` the pair starts again from the dataframe,
+i.e. the values recalculating every candle gave.
+
+Backtesting / hyperopt have all candles at once: ``calculate_full`` runs TA-Lib on them.
+
+Per call this is not cheaper than TA-Lib on freqtrade's live windows: the python overhead
+of a call (~100-170 us) is above TA-Lib over a 500 - 1000 candle window (two EMAs ~65 us,
+RSI / EMA / MACD / ADX ~190-350 us), it only wins from a few thousand candles on (see
+benchmarks/incremental_indicators.py). The strategies therefore keep calling TA-Lib.
+"""
+
+import copy
+import logging
+from collections import deque
+from typing import Dict, Hashable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import talib
+from pandas import DataFrame
+
+from shared.normalize import RollingMinMax
+
+NAN = float('nan')
+
+
+def _is_zero(value: float) -> bool:
+    # TA_IS_ZERO
+    return -0.00000001 < value < 0.00000001
+
+
+def _true_range(high: float, low: float, previous_close: float) -> float:
+    return max(high - low, abs(high - previous_close), abs(low - previous_close))
+
+
+class Indicator:
+    """
+    An indicator as a recursion over the candles.
+
+    ``inputs`` are the candle columns ``update`` reads, ``outputs`` the suffixes of its
+    columns (the key the indicator is given in the mapping plus the suffix), ``params``
+    identify it. ``reference`` is the same indicator from TA-Lib over a dataframe.
+    """
+
+    inputs: Tuple[str, ...] = ('close',)
+    outputs: Tuple[str, ...] = ('',)
+
+    @property
+    def params(self) -> tuple:
+        raise NotImplementedError
+
+    def update(self, candle: Mapping[str, float]) -> Tuple[float, ...]:
+        raise NotImplementedError
+
+    def reference(self, dataframe: DataFrame) -> Tuple[np.ndarray, ...]:
+        raise NotImplementedError
+
+    def signature(self) -> tuple:
+        return (type(self).__name__,) + self.params
+
+    def columns(self, key: str) -> List[str]:
+        return [key + suffix for suffix in self.outputs]
+
+
+def _input(dataframe: DataFrame, column: str) -> np.ndarray:
+    return dataframe[column].to_numpy(dtype=np.float64)
+
+
+class EMA(Indicator):
+    """
+    TA-Lib EMA: the SMA of the first ``period`` values, then ``(value - ema) * k + ema``.
+    Leading NaNs (another indicator's unstable period) are skipped.
+    """
+
+    def __init__(self, period: int, source: str = 'close', skip: int = 0):
+        """
+        :param skip: Number of values (after the leading NaNs) to ignore before seeding, MACD's
+            fast EMA starts where its slow one does
+        """
+        self.period = period
+        self.source = source
+        self.skip = skip
+        self.inputs = (source,)
+        self._k = 2.0 / (period + 1)
+        self._count = 0
+        self._total = 0.0
+        self._value = NAN
+
+    @property
+    def params(self) -> tuple:
+        return self.period, self.source, self.skip
+
+    def append(self, value: float) -> float:
+        if self._count < self.period + self.skip:
+            if self._count == 0 and value != value:
+                return NAN
+            self._count += 1
+            if self._count > self.skip:
+                self._total += value
+                if self._count == self.period + self.skip:
+                    self._value = self._total / self.period
+            return self._value
+        self._value = (value - self._value) * self._k + self._value
+        return self._value
+
+    def update(self, candle: Mapping[str, float]) -> Tuple[float, ...]:
+        return (self.append(candle[self.source]),)
+
+    def reference(self, dataframe: DataFrame) -> Tuple[np.ndarray, ...]:
+        return (talib.EMA(_input(dataframe, self.source), timeperiod=self.period),)
+
+
+class SMA(Indicator):
+    """
+    TA-Lib SMA, a running sum over the last ``period`` values.
+    """
+
+    def __init__(self, period: int, source: str = 'close'):
+        self.period = period
+        self.source = source
+        self.inputs = (source,)
+        self._window: deque = deque()
+        self._total = 0.0
+
+    @property
+    def params(self) -> tuple:
+        return self.period, self.source
+
+    def append(self, value: float) -> float:
+        self._window.append(value)
+        self._total += value
+        if len(self._window) < self.period:
+            return NAN
+        total = self._total
+        self._total -= self._window.popleft()
+        return total / self.period
+
+    def update(self, candle: Mapping[str, float]) -> Tuple[float, ...]:
+        return (self.append(candle[self.source]),)
+
+    def reference(self, dataframe: DataFrame) -> Tuple[np.ndarray, ...]:
+        return (talib.SMA(_input(dataframe, self.source), timeperiod=self.period),)
+
+
+class BBANDS(Indicator):
+    """
+    TA-Lib BBANDS with the SMA as middle band: running sums of the values and their squares,
+    population standard deviation (0 where the variance is below TA-Lib's epsilon).
+    """
+
+    outputs = ('_upper', '_middle', '_lower')
+
+    def __init__(self, period: int = 20, nbdevup: float = 2.0, nbdevdn: float = 2.0, source: str = 'close'):
+        self.period = period
+        self.nbdevup = nbdevup
+        self.nbdevdn = nbdevdn
+        self.source = source
+        self.inputs = (source,)
+        self._window: deque = deque()
+        self._total = 0.0
+        self._squares = 0.0
+
+    @property
+    def params(self) -> tuple:
+        return self.period, self.nbdevup, self.nbdevdn, self.source
+
+    def update(self, candle: Mapping[str, float]) -> Tuple[float, ...]:
+        value = candle[self.source]
+        self._window.append(value)
+        self._total += value
+        self._squares += value * value
+        if len(self._window) < self.period:
+            return NAN, NAN, NAN
+
+        middle = self._total / self.period
+        variance = self._squares / self.period - middle * middle
+        deviation = np.sqrt(variance) if variance >= 0.00000001 else 0.0
+        trailing = self._window.popleft()
+        self._total -= trailing
+        self._squares -= trailing * trailing
+        return middle + deviation * self.nbdevup, middle, middle - deviation * self.nbdevdn
+
+    def reference(self, dataframe: DataFrame) -> Tuple[np.ndarray, ...]:
+        return talib.BBANDS(_input(dataframe, self.source), timeperiod=self.period,
+                            nbdevup=self.nbdevup, nbdevdn=self.nbdevdn, matype=0)
+
+
+class MAX(Indicator):
+    """
+    TA-Lib MAX, the monotonic deque of ``RollingMinMax``.
+    """
+
+    _side = 1
+
+    def __init__(self, period: int, source: str = 'close'):
+        self.period = period
+        self.source = source
+        self.inputs = (source,)
+        self._extremes = RollingMinMax(period)
+        self._count = 0
+
+    @property
+    def params(self) -> tuple:
+        return self.period, self.source
+
+    def update(self, candle: Mapping[str, float]) -> Tuple[float, ...]:
+        extremes = self._extremes.append(candle[self.source])
+        self._count += 1
+        return (extremes[self._side] if self._count >= self.period else NAN,)
+
+    def reference(self, dataframe: DataFrame) -> Tuple[np.ndarray, ...]:
+        return (talib.MAX(_input(dataframe, self.source), timeperiod=self.period),)
+
+
+class MIN(MAX):
+    """
+    TA-Lib MIN.
+    """
+
+    _side = 0
+
+    def reference(self, dataframe: DataFrame) -> Tuple[np.ndarray, ...]:
+        return (talib.MIN(_input(dataframe, self.source), timeperiod=self.period),)
+
+
+class RSI(Indicator):
+    """
+    TA-Lib RSI: gains / losses averaged over the first ``period`` changes, then Wilder's smoothing.
+    """
+
+    def __init__(self, period: int = 14, source: str = 'close'):
+        self.period = period
+        self.source = source
+        self.inputs = (source,)
+        self._previous: Optional[float] = None
+        self._count = 0
+        self._gain = 0.0
+        self._loss = 0.0
+
+    @property
+    def params(self) -> tuple:
+        return self.period, self.source
+
+    def update(self, candle: Mapping[str, float]) -> Tuple[float, ...]:
+        value = candle[self.source]
+        previous, self._previous = self._previous, value
+        if previous is None:
+            return (NAN,)
+
+        change = value - previous
+        self._count += 1
+        if self._count > self.period:
+            self._gain *= self.period - 1
+            self._loss *= self.period - 1
+        if change < 0:
+            self._loss -= change
+        else:
+            self._gain += change
+        if self._count < self.period:
+            return (NAN,)
+        self._gain /= self.period
+        self._loss /= self.period
+
+        total = self._gain + self._loss
+        return (100.0 * (self._gain / total) if not _is_zero(total) else 0.0,)
+
+    def reference(self, dataframe: DataFrame) -> Tuple[np.ndarray, ...]:
+        return (talib.RSI(_input(dataframe, self.source), timeperiod=self.period),)
+
+
+class ATR(Indicator):
+    """
+    TA-Lib ATR: the mean of the first ``period`` true ranges, then Wilder's smoothing.
+    """
+
+    inputs = ('high', 'low', 'close')
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._close: Optional[float] = None
+        self._count = 0
+        self._value = 0.0
+
+    @property
+    def params(self) -> tuple:
+        return (self.period,)
+
+    def update(self, candle: Mapping[str, float]) -> Tuple[float, ...]:
+        previous_close, self._close = self._close, candle['close']
+        if previous_close is None:
+            return (NAN,)
+
+        true_range = _true_range(candle['high'], candle['low'], previous_close)
+        self._count += 1
+        if self._count < self.period:
+            self._value += true_range
+            return (NAN,)
+        if self._count == self.period:
+            self._value = (self._value + true_range) / self.period
+        else:
+            self._value = (self._value * (self.period - 1) + true_range) / self.period
+        return (self._value,)
+
+    def reference(self, dataframe: DataFrame) -> Tuple[np.ndarray, ...]:
+        return (talib.ATR(_input(dataframe, 'high'), _input(dataframe, 'low'), _input(dataframe, 'close'),
+                          timeperiod=self.period),)
+
+
+class ADX(Indicator):
+    """
+    TA-Lib ADX: +DM / -DM / true range summed over the first ``period`` - 1 candles and
+    Wilder-smoothed, the DX averaged over the next ``period`` candles, then Wilder-smoothed.
+    """
+
+    inputs = ('high', 'low', 'close')
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._previous: Optional[Tuple[float, float, float]] = None
+        self._count = 0
+        self._plus_dm = 0.0
+        self._minus_dm = 0.0
+        self._true_range = 0.0
+        self._dx = 0.0
+        self._value = NAN
+
+    @property
+    def params(self) -> tuple:
+        return (self.period,)
+
+    def update(self, candle: Mapping[str, float]) -> Tuple[float, ...]:
+        high, low, close = candle['high'], candle['low'], candle['close']
+        previous, self._previous = self._previous, (high, low, close)
+        if previous is None:
+            return (NAN,)
+
+        period = self.period
+        self._count += 1
+        if self._count >= period:
+            self._plus_dm -= self._plus_dm / period
+            self._minus_dm -= self._minus_dm / period
+            self._true_range -= self._true_range / period
+        plus = high - previous[0]
+        minus = previous[1] - low
+        if minus > 0 and plus < minus:
+            self._minus_dm += minus
+        elif plus > 0 and plus > minus:
+            self._plus_dm += plus
+        self._true_range += _true_range(high, low, previous[2])
+        if self._count < period:
+            return (NAN,)
+
+        dx = None
+        if not _is_zero(self._true_range):
+            minus_di = 100.0 * (self._minus_dm / self._true_range)
+            plus_di = 100.0 * (self._plus_dm / self._true_range)
+            total = minus_di + plus_di
+            if not _is_zero(total):
+                dx = 100.0 * (abs(minus_di - plus_di) / total)
+
+        if self._count < 2 * period - 1:
+            self._dx += dx or 0.0
+            return (NAN,)
+        if self._count == 2 * period - 1:
+            self._value = (self._dx + (dx or 0.0)) / period
+        elif dx is not None:
+            self._value = (self._value * (period - 1) + dx) / period
+        return (self._value,)
+
+    def reference(self, dataframe: DataFrame) -> Tuple[np.ndarray, ...]:
+        return (talib.ADX(_input(dataframe, 'high'), _input(dataframe, 'low'), _input(dataframe, 'close'),
+                          timeperiod=self.period),)
+
+
+class MACD(Indicator):
+    """
+    TA-Lib MACD: the fast EMA seeded where the slow one is, the signal EMA over the MACD line.
+    Like TA-Lib all three are NaN until the signal has a value.
+    """
+
+    outputs = ('', 'signal', 'hist')
+
+    def __init__(self, fastperiod: int = 12, slowperiod: int = 26, signalperiod: int = 9, source: str = 'close'):
+        if slowperiod < fastperiod:
+            fastperiod, slowperiod = slowperiod, fastperiod
+        self.fastperiod = fastperiod
+        self.slowperiod = slowperiod
+        self.signalperiod = signalperiod
+        self.source = source
+        self.inputs = (source,)
+        self._fast = EMA(fastperiod, source, skip=slowperiod - fastperiod)
+        self._slow = EMA(slowperiod, source)
+        self._signal = EMA(signalperiod)
+
+    @property
+    def params(self) -> tuple:
+        return self.fastperiod, self.slowperiod, self.signalperiod, self.source
+
+    def update(self, candle: Mapping[str, float]) -> Tuple[float, ...]:
+        value = candle[self.source]
+        macd = self._fast.append(value) - self._slow.append(value)
+        signal = self._signal.append(macd)
+        if signal != signal:
+            return NAN, NAN, NAN
+        return macd, signal, macd - signal
+
+    def reference(self, dataframe: DataFrame) -> Tuple[np.ndarray, ...]:
+        return talib.MACD(_input(dataframe, self.source), fastperiod=self.fastperiod,
+                          slowperiod=self.slowperiod, signalperiod=self.signalperiod)
+
+
+def calculate_full(dataframe: DataFrame, indicators: Mapping[str, Indicator]) -> Dict[str, np.ndarray]:
+    """
+    The indicators' columns from TA-Lib over the whole dataframe (backtesting / hyperopt).
+    """
+    columns = {}
+    for key, indicator in indicators.items():
+        columns.update(zip(indicator.columns(key), indicator.reference(dataframe)))
+    return columns
+
+
+def _candle(arrays: Dict[str, np.ndarray], inputs: Sequence[str], row: int) -> Tuple[float, ...]:
+    return tuple(float(arrays[column][row]) for column in inputs)
+
+
+class _PairState:
+
+    def __init__(self, signatures: tuple, indicators: Dict[str, Indicator], inputs: Sequence[str]):
+        self.signatures = signatures
+        self.indicators = indicators
+        self.inputs = inputs
+        self.dates: np.ndarray = np.empty(0, dtype='datetime64[ns]')
+        self.last_candle: Tuple[float, ...] = ()
+        self.outputs: Dict[str, np.ndarray] = {}
+        self.since_check = 0
+
+    def feed(self, arrays: Dict[str, np.ndarray], start: int, end: int) -> Dict[str, np.ndarray]:
+        """
+        Feed the candles ``start:end`` to the indicators.
+        :return: Their values by column
+        """
+        outputs = [(indicator.update, [[] for _ in indicator.outputs]) for indicator in self.indicators.values()]
+        # Python floats, the recursions are scalar arithmetic
+        rows = [arrays[column][start:end].tolist() for column in self.inputs]
+        for candle_values in zip(*rows):
+            candle = dict(zip(self.inputs, candle_values))
+            for update, values in outputs:
+                for column_values, value in zip(values, update(candle)):
+                    column_values.append(value)
+
+        columns = [column for key, indicator in self.indicators.items() for column in indicator.columns(key)]
+        values = [column_values for _, indicator_values in outputs for column_values in indicator_values]
+        return {column: np.array(column_values, dtype=np.float64) for column, column_values in zip(columns, values)}
+
+
+class IncrementalIndicators:
+    """
+    Usage:
+        # bot_start
+        self.incremental = IncrementalIndicators(logger=self.logger)
+        # populate_indicators
+        indicators = {'rsi': RSI(14), 'ema_short': EMA(50), 'macd': MACD(12, 26, 9)}
+        if self.dp.runmode.value in ('live', 'dry_run'):
+            columns = self.incremental.calculate(metadata['pair'], dataframe, indicators)
+        else:
+            columns = calculate_full(dataframe, indicators)
+        dataframe = append_columns(dataframe, columns)
+        # columns: 'rsi', 'ema_short', 'macd', 'macdsignal', 'macdhist'
+
+    Rows seen before keep the value they got when they were the latest candle.
+    """
+
+    def __init__(self, check_every: int = 100, rtol: float = 1e-4, max_pairs: int = 1000,
+                 logger: Optional[logging.Logger] = None):
+        """
+        :param check_every: Number of incrementally added candles between comparisons with TA-Lib, 0 never
+        :param rtol: Relative difference from TA-Lib above which the pair starts again
+        :param max_pairs: Number of pair states kept, the oldest are dropped beyond
+        :param logger: Logs the restarts of the drift check
+        """
+        self.check_every = check_every
+        self.rtol = rtol
+        self.max_pairs = max_pairs
+        self.logger = logger or logging.getLogger(__name__)
+        self._pairs: Dict[Hashable, _PairState] = {}
+
+    def calculate(self, pair: Hashable, dataframe: DataFrame,
+                  indicators: Mapping[str, Indicator]) -> Dict[str, np.ndarray]:
+        """
+        The indicators' columns for the dataframe, only its new candles calculated when it
+        continues the pair's previous dataframe.
+        :param pair: Identifies the state, e.g. metadata['pair']
+        :param dataframe: Candles with 'date' and the indicators' inputs
+        :param indicators: Mapping of column name (prefix for several outputs) to indicator
+        :return: Mapping of column name to array aligned with the dataframe
+        """
+        dates = dataframe['date'].to_numpy(dtype='datetime64[ns]')
+        signatures = tuple((key, indicator.signature()) for key, indicator in indicators.items())
+        inputs = sorted({column for indicator in indicators.values() for column in indicator.inputs})
+        arrays = {column: _input(dataframe, column) for column in inputs}
+
+        state = self._pairs.get(pair)
+        outputs = None
+        if state is not None and state.signatures == signatures:
+            outputs = self._extend(state, dates, arrays)
+            if outputs is not None and self._drifted(pair, state, dataframe):
+                outputs = None
+        if outputs is None:
+            outputs = self._full(pair, signatures, indicators, inputs, dates, arrays)
+        return dict(outputs)
+
+    def _extend(self, state: _PairState, dates: np.ndarray, arrays: Dict[str, np.ndarray]) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Feed only the candles after the ones seen last, None if the dataframe doesn't continue them.
+        """
+        if not len(dates) or not len(state.dates):
+            return None
+
+        # Position of the last known candle in the new dates
+        last = int(np.searchsorted(dates, state.dates[-1]))
+        if last >= len(dates) or dates[last] != state.dates[-1]:
+            return None
+        # The candles both have must line up, and the last known one must not have changed
+        first = len(state.dates) - last - 1
+        if (first < 0 or state.dates[first] != dates[0]
+                or _candle(arrays, state.inputs, last) != state.last_candle):
+            return None
+
+        new_outputs = state.feed(arrays, last + 1, len(dates))
+        state.outputs = {column: np.concatenate([values[first:], new_outputs[column]])
+                         for column, values in state.outputs.items()}
+        state.dates = dates
+        state.last_candle = _candle(arrays, state.inputs, -1)
+        state.since_check += len(dates) - last - 1
+        return state.outputs
+
+    def _drifted(self, pair: Hashable, state: _PairState, dataframe: DataFrame) -> bool:
+        """
+        Compare the newest row with TA-Lib every ``check_every`` candles.
+        """
+        if not self.check_every or state.since_check < self.check_every:
+            return False
+        state.since_check = 0
+
+        reference = calculate_full(dataframe, state.indicators)
+        for column, values in reference.items():
+            if not np.allclose(state.outputs[column][-1], values[-1], rtol=self.rtol, atol=0, equal_nan=True):
+                self.logger.info(f'{pair}: incremental {column} {state.outputs[column][-1]} drifted from '
+                                 f'{values[-1]}, recalculating')
+                return True
+        return False
+
+    def _full(self, pair: Hashable, signatures: tuple, indicators: Mapping[str, Indicator],
+              inputs: Sequence[str], dates: np.ndarray, arrays: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        state = _PairState(signatures, {key: copy.deepcopy(indicator) for key, indicator in indicators.items()},
+                           inputs)
+        state.outputs = state.feed(arrays, 0, len(dates))
+        state.dates = dates
+        state.last_candle = _candle(arrays, inputs, -1) if len(dates) else ()
+
+        self._pairs.pop(pair, None)
+        self._pairs[pair] = state
+        while len(self._pairs) > self.max_pairs:
+            self._pairs.pop(next(iter(self._pairs)))
+        return state.outputs
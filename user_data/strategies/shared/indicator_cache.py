@@ -0,0 +1,212 @@
+"""
+Memoized indicator columns, shared across hyperopt epochs and worker processes.
+
+Strategies calculating their indicators in populate_entry_trend / populate_exit_trend
+(GodStraNew, DevilStra, ...) get a fresh dataframe in every hyperopt epoch, so a cache
+inside the dataframe doesn't survive. ``IndicatorCache`` keeps the calculated columns keyed
+by (pair, data fingerprint, indicator name):
+
+- in memory, least recently used columns are evicted once ``max_bytes`` is exceeded,
+- optionally on disk (one .npy file per column), so the hyperopt worker processes and
+  later runs on the same data reuse what any of them calculated. Oldest files are removed
+  once ``max_disk_bytes`` is exceeded.
+
+The fingerprint hashes the date and OHLCV columns, any change of the data (another
+timerange, a new candle, an edited row) gives new keys. Populate methods looking up many
+columns hash their candles once per call with ``hash_candles_once``.
+"""
+
+import functools
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_COLUMNS = ('date', 'open', 'high', 'low', 'close', 'volume')
+
+# (dataframe, fingerprint) of the enclosing ``same_candles`` block
+_pinned: Optional[Tuple[DataFrame, str]] = None
+
+
+def ohlcv_fingerprint(dataframe: DataFrame) -> str:
+    """
+    Hash of the date and OHLCV columns of the dataframe.
+    Hashed on every call (a few ms for 50k candles), except for the dataframe of an
+    enclosing ``same_candles`` block.
+    """
+    if _pinned is not None and _pinned[0] is dataframe:
+        return _pinned[1]
+
+    digest = hashlib.blake2b(digest_size=16)
+    for column in FINGERPRINT_COLUMNS:
+        if column in dataframe.columns:
+            # .values of a tz aware date column is datetime64[ns] in UTC, not Timestamp objects
+            digest.update(column.encode())
+            digest.update(np.ascontiguousarray(dataframe[column].values).view(np.uint8))
+    return digest.hexdigest()
+
+
+@contextmanager
+def same_candles(dataframe: DataFrame):
+    """
+    Hash the dataframe's candles once for the block: ``ohlcv_fingerprint`` of this
+    dataframe object returns that hash until the block ends. The block may add indicator
+    columns, it must not change the OHLCV ones.
+    """
+    global _pinned
+    previous = _pinned
+    _pinned = (dataframe, ohlcv_fingerprint(dataframe))
+    try:
+        yield _pinned[1]
+    finally:
+        _pinned = previous
+
+
+def hash_candles_once(populate: Callable) -> Callable:
+    """
+    Decorator of a populate_* method looking up many cached columns: the candles are
+    hashed once per call (``same_candles``) instead of once per column.
+    """
+    @functools.wraps(populate)
+    def wrapper(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        with same_candles(dataframe):
+            return populate(self, dataframe, metadata)
+    return wrapper
+
+
+class IndicatorCache:
+    """
+    Usage:
+        GENE_CACHE = IndicatorCache('GodStraNew', directory=...)
+
+        def gene_calculator(dataframe, indicator, pair=None):
+            return GENE_CACHE.get_or_calculate(
+                dataframe, indicator, lambda: _calculate_gene(dataframe, indicator), pair=pair)
+    """
+
+    def __init__(self, namespace: str, max_bytes: int = 512 * 2**20,
+                 directory: Optional[Path] = None, max_disk_bytes: int = 4 * 2**30):
+        """
+        :param namespace: Name of the calculating code, keeps caches of different strategies apart
+        :param max_bytes: Memory ceiling of the cached columns
+        :param directory: Directory shared by the processes, None for a memory only cache
+        :param max_disk_bytes: Ceiling of the files in ``directory``
+        """
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self.directory = Path(directory) / namespace if directory is not None else None
+        self.max_disk_bytes = max_disk_bytes
+        self._columns: 'OrderedDict[Tuple[str, str, str], np.ndarray]' = OrderedDict()
+        self._bytes = 0
+        self._disk_writes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_calculate(self, dataframe: DataFrame, name: str, calculate: Callable[[], pd.Series],
+                         pair: Optional[str] = None) -> pd.Series:
+        """
+        Cached column ``name`` for the dataframe's data, calculated and stored if missing.
+        :param dataframe: Dataframe the column belongs to
+        :param name: Indicator name including its parameters, e.g. 'EMA-50'
+        :param calculate: Calculates the column if it isn't cached
+        :param pair: Pair of the dataframe (metadata['pair'])
+        """
+        values = self.get_array(dataframe, name, lambda: np.array(calculate(), dtype=np.float64), pair=pair)
+        # The cached array stays untouched whatever the strategy does with the column
+        return pd.Series(values.copy(), index=dataframe.index, name=name)
+
+    def get_array(self, dataframe: DataFrame, name: str, calculate: Callable[[], np.ndarray],
+                  pair: Optional[str] = None) -> np.ndarray:
+        """
+        Like ``get_or_calculate`` for any array (e.g. a block of several columns), returned
+        as cached: read-only, copy it before changing it.
+        """
+        key = (pair or '', ohlcv_fingerprint(dataframe), name)
+
+        values = self._columns.get(key)
+        if values is not None:
+            self._columns.move_to_end(key)
+        else:
+            values = self._load(key)
+            if values is not None:
+                self._store(key, values)
+        if values is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            values = np.asarray(calculate())
+            self._store(key, values)
+            self._save(key, values)
+        values.flags.writeable = False
+        return values
+
+    def _store(self, key: Tuple[str, str, str], values: np.ndarray) -> None:
+        if values.nbytes > self.max_bytes:
+            return
+        self._columns[key] = values
+        self._bytes += values.nbytes
+        while self._bytes > self.max_bytes:
+            _, evicted = self._columns.popitem(last=False)
+            self._bytes -= evicted.nbytes
+
+    def _path(self, key: Tuple[str, str, str]) -> Path:
+        name = hashlib.blake2b('\0'.join(key).encode(), digest_size=16).hexdigest()
+        return self.directory / f'{name}.npy'
+
+    def _load(self, key: Tuple[str, str, str]) -> Optional[np.ndarray]:
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            values = np.load(path)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        return values
+
+    def _save(self, key: Tuple[str, str, str], values: np.ndarray) -> None:
+        if self.directory is None:
+            return
+        path = self._path(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Other processes may read the file meanwhile, only complete files get the final name
+            tmp_path = path.with_name(f'{path.stem}.{os.getpid()}.tmp')
+            with tmp_path.open('wb') as file:
+                np.save(file, values)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write indicator cache file {path}: {e}")
+            return
+
+        self._disk_writes += 1
+        if self._disk_writes % 100 == 0:
+            self._trim_disk()
+
+    def _trim_disk(self) -> None:
+        """
+        Remove the oldest files until the directory is below ``max_disk_bytes``.
+        """
+        files: Dict[Path, os.stat_result] = {}
+        for path in self.directory.glob('*.npy'):
+            try:
+                files[path] = path.stat()
+            except OSError:
+                pass
+        total = sum(stat.st_size for stat in files.values())
+        for path, stat in sorted(files.items(), key=lambda item: item[1].st_mtime):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                path.unlink()
+                total -= stat.st_size
+            except OSError:
+                pass
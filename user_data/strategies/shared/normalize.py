@@ -0,0 +1,208 @@
+"""
+Causal min-max normalisation.
+
+Scaling a series with its overall ``.min()`` / ``.max()`` (or sklearn's ``MinMaxScaler``)
+uses candles which are in the future of most rows: the lookahead bias described in
+lookahead_bias/readme.md. Here every value is scaled with the min / max of the last
+``window`` values up to and including itself, so a row never changes once its candle
+closed and backtesting sees what the live bot saw.
+
+``causal_normalize`` scales a whole series; pandas' rolling min / max is the monotonic
+deque algorithm (O(n), in C). ``RollingMinMax`` is the same algorithm on python deques,
+fed one value at a time. ``CausalNormalizer`` keeps one per (pair, column) and, when the
+next dataframe only adds candles to the one it saw last, only feeds the new values
+(amortized O(1) per new candle) instead of scaling the whole series again.
+"""
+
+from collections import deque
+from typing import Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def rolling_min_max(values, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Min and max of the last ``window`` values at every position, NaNs skipped
+    (NaN where the window has no value).
+    """
+    rolling = pd.Series(np.asarray(values, dtype=np.float64)).rolling(window, min_periods=1)
+    return rolling.min().to_numpy(), rolling.max().to_numpy()
+
+
+def _scale(values: np.ndarray, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+    # A flat window gives NaN (0 / 0), like the full series min / max did for a flat series
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (values - low) / (high - low)
+
+
+def causal_normalize(values, window: int):
+    """
+    Scale every value to [0, 1] with the min / max of the last ``window`` values.
+    :param values: Series or array
+    :param window: Number of values (candles) the min / max are taken over
+    :return: Series (same index) for a Series, otherwise a numpy array
+    """
+    array = np.asarray(values, dtype=np.float64)
+    low, high = rolling_min_max(array, window)
+    result = _scale(array, low, high)
+    if isinstance(values, pd.Series):
+        return pd.Series(result, index=values.index, name=values.name)
+    return result
+
+
+class RollingMinMax:
+    """
+    Min / max of the last ``window`` appended values, NaNs skipped.
+
+    Monotonic deques of (position, value): the min deque holds increasing values, the max
+    deque decreasing ones, so the front is the extreme of the window. Every value enters
+    and leaves each deque once.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self._count = 0
+        self._min: deque = deque()
+        self._max: deque = deque()
+
+    def append(self, value: float) -> Tuple[float, float]:
+        """
+        Add the next value.
+        :return: (min, max) of the window ending with it
+        """
+        position = self._count
+        self._count += 1
+
+        if not np.isnan(value):
+            while self._min and self._min[-1][1] >= value:
+                self._min.pop()
+            self._min.append((position, value))
+            while self._max and self._max[-1][1] <= value:
+                self._max.pop()
+            self._max.append((position, value))
+
+        start = position - self.window + 1
+        while self._min and self._min[0][0] < start:
+            self._min.popleft()
+        while self._max and self._max[0][0] < start:
+            self._max.popleft()
+
+        return (self._min[0][1] if self._min else np.nan,
+                self._max[0][1] if self._max else np.nan)
+
+
+class _Series:
+
+    def __init__(self, dates: np.ndarray, values: np.ndarray, scaled: np.ndarray, extremes: RollingMinMax):
+        self.dates = dates
+        self.values = values
+        self.scaled = scaled
+        self.extremes = extremes
+
+
+class CausalNormalizer:
+    """
+    Usage:
+        # module / strategy level
+        NORMALIZER = CausalNormalizer(window=500)
+        # populate_*
+        dataframe['wt1'] = NORMALIZER.normalize((metadata['pair'], 'wt1'), dataframe['date'], dataframe['wt1'])
+
+    While the calls only add candles to the same values (a growing dataframe, or the live
+    window sliding over one series), the results equal ``causal_normalize`` over all the
+    values seen so far: rows seen before keep the value they were scaled with when they were
+    the latest candle, where ``causal_normalize`` of only the passed window rescales its
+    first rows with fewer candles. When the overlap was recalculated and only agrees within
+    ``rtol``, the window's min / max still come from the known values, so the new rows are
+    off by up to about ``2 * rtol * |value| / (max - min)``: an approximation, not identical.
+
+    The new values continue the known ones when the dates line up (the last known date is
+    in the new dates, the new ones start at a known date) and the last ``check_rows`` rows
+    both have agree within ``rtol`` of their magnitude. That catches another series under
+    the same key and a changed latest candle; indicators recalculated over the shifted live
+    window (TA-Lib EMA / KAMA seeded one candle later) differ less than that on their
+    newest rows. A changed value further back in the overlap is not detected.
+    """
+
+    def __init__(self, window: int, max_keys: int = 10000, check_rows: int = 8, rtol: float = 1e-4):
+        """
+        :param window: Number of candles the min / max are taken over
+        :param max_keys: Number of (pair, column) states kept, the oldest are dropped beyond
+        :param check_rows: Number of the newest overlapping rows compared with the known values
+        :param rtol: Tolerance of that comparison, relative to the rows' largest absolute value
+        """
+        self.window = window
+        self.max_keys = max_keys
+        self.check_rows = check_rows
+        self.rtol = rtol
+        self._series: Dict[Hashable, _Series] = {}
+
+    def normalize(self, key: Hashable, dates, values):
+        """
+        Causally normalised ``values``.
+        :param key: Identifies the series, e.g. (pair, column name)
+        :param dates: Candle dates of the values (the dataframe's 'date' column)
+        :param values: Series or array to scale
+        :return: Series (same index) for a Series, otherwise a numpy array
+        """
+        array = np.asarray(values, dtype=np.float64)
+        date_array = np.asarray(dates, dtype='datetime64[ns]')
+
+        scaled = self._extend(key, date_array, array)
+        if scaled is None:
+            scaled = self._full(key, date_array, array)
+
+        if isinstance(values, pd.Series):
+            return pd.Series(scaled, index=values.index, name=values.name)
+        return scaled
+
+    def _extend(self, key: Hashable, dates: np.ndarray, values: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Scale only the candles after the ones seen last, None if the series doesn't continue them.
+        """
+        known = self._series.get(key)
+        if known is None or not len(dates) or not len(known.dates):
+            return None
+
+        # Position of the last known candle in the new dates
+        last = int(np.searchsorted(dates, known.dates[-1]))
+        if last >= len(dates) or dates[last] != known.dates[-1] or last + 1 > len(known.dates):
+            return None
+        # The candles both have must line up and their newest rows carry the same values
+        # (within the difference of indicators recalculated over a shifted history)
+        first = len(known.dates) - last - 1
+        if known.dates[first] != dates[0]:
+            return None
+        start = max(first, len(known.dates) - self.check_rows)
+        known_tail = known.values[start:]
+        tail = values[start - first:last + 1]
+        scale = np.nanmax(np.abs(known_tail)) if not np.isnan(known_tail).all() else 0.0
+        if not np.allclose(known_tail, tail, rtol=0, atol=self.rtol * scale, equal_nan=True):
+            return None
+        overlap = slice(first, None)
+
+        new_values = values[last + 1:]
+        new_scaled = np.empty(len(new_values))
+        for i, value in enumerate(new_values):
+            low, high = known.extremes.append(value)
+            new_scaled[i] = _scale(value, low, high)
+
+        known.dates = dates
+        known.values = values
+        known.scaled = np.concatenate([known.scaled[overlap], new_scaled])
+        return known.scaled
+
+    def _full(self, key: Hashable, dates: np.ndarray, values: np.ndarray) -> np.ndarray:
+        scaled = causal_normalize(values, self.window)
+
+        # Deque state of the last window, ready for the next candles
+        extremes = RollingMinMax(self.window)
+        for value in values[-self.window:]:
+            extremes.append(value)
+
+        self._series.pop(key, None)
+        self._series[key] = _Series(dates, values, scaled, extremes)
+        while len(self._series) > self.max_keys:
+            self._series.pop(next(iter(self._series)))
+        return scaled
@@ -0,0 +1,30 @@
+"""
+Optional numba support.
+
+numba is not part of the freqtrade image, so the array kernels in this package
+are written as plain python loops over numpy arrays. When numba is installed
+they get compiled, otherwise ``njit`` is a no-op and the loops run as is.
+"""
+
+try:
+    from numba import njit as _njit
+except ImportError:
+    _njit = None
+
+NUMBA_AVAILABLE = _njit is not None
+
+
+def njit(*args, **kwargs):
+    """
+    Drop-in for ``numba.njit`` supporting both ``@njit`` and ``@njit(cache=True)``.
+    """
+    if _njit is not None:
+        return _njit(*args, **kwargs)
+
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+
+    def decorator(func):
+        return func
+
+    return decorator
@@ -0,0 +1,238 @@
+"""
+Order book analytics shared by the Goal_Depth / Goal_Vidra strategies.
+
+The ccxt order book (``{'bids': [[price, amount], ...], 'asks': [...]}``) is converted
+to contiguous numpy arrays once, cumulative depth is computed in the same pass and the
+depth / large order checks are simple lookups on those arrays.
+
+``OrderBookFrames`` runs the same checks on one snapshot per candle (2-D arrays, e.g.
+replayed from disk) and returns one result per candle.
+"""
+
+import logging
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+def _levels(levels) -> np.ndarray:
+    array = np.asarray(levels if levels else [], dtype=np.float64)
+    if array.ndim != 2 or array.shape[1] < 2:
+        return np.empty((0, 2))
+    return array[:, :2]
+
+
+def _ratio(numerator: float, denominator: float) -> float:
+    # inf / NaN instead of ZeroDivisionError on an empty side
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return float(np.float64(numerator) / denominator)
+
+
+def padded_levels(order_book: dict, depth: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    First ``depth`` levels of a ccxt order book, padded with NaN if the book is shallower.
+    :return: Tuple of (bid prices, bid amounts, ask prices, ask amounts), each of length depth
+    """
+    result = []
+    for side in ('bids', 'asks'):
+        levels = _levels(order_book.get(side))[:depth]
+        padded = np.full((depth, 2), np.nan)
+        padded[:len(levels)] = levels
+        result.extend((padded[:, 0], padded[:, 1]))
+    return tuple(result)
+
+
+class OrderBookAnalytics:
+    """
+    Numpy view of a ccxt order book.
+
+    Usage:
+        order_book = OrderBookAnalytics(self.dp.orderbook(metadata['pair'], depth + 1))
+        order_book.check_depth(depth, delta)
+        order_book.has_large_orders(volume_threshold)
+    """
+
+    def __init__(self, order_book: dict, logger: Optional[logging.Logger] = None):
+        """
+        :param order_book: Order book as returned by ``self.dp.orderbook()``
+        :param logger: Logger used to report the check results (DEBUG), nothing is logged if None
+        """
+        bids = _levels(order_book.get('bids'))
+        asks = _levels(order_book.get('asks'))
+
+        self.bid_prices = np.ascontiguousarray(bids[:, 0])
+        self.bid_amounts = np.ascontiguousarray(bids[:, 1])
+        self.ask_prices = np.ascontiguousarray(asks[:, 0])
+        self.ask_amounts = np.ascontiguousarray(asks[:, 1])
+
+        # Cumulative amount up to each level (sequential, same rounding as sum())
+        self.cumulative_bids = np.cumsum(self.bid_amounts)
+        self.cumulative_asks = np.cumsum(self.ask_amounts)
+
+        self.logger = logger
+        self._large_order_counts: Dict[float, Tuple[int, int]] = {}
+
+    def depth_totals(self, depth: int) -> Optional[Tuple[float, float]]:
+        """
+        Total bid and ask amount of the first ``depth`` levels.
+        :return: Tuple of (total bids, total asks), None if the book has less levels
+        """
+        if depth < 1 or len(self.cumulative_bids) < depth or len(self.cumulative_asks) < depth:
+            return None
+        return float(self.cumulative_bids[depth - 1]), float(self.cumulative_asks[depth - 1])
+
+    def depth_imbalance(self, depth: int, is_short: bool = False) -> float:
+        """
+        Bids / asks ratio of the first ``depth`` levels (asks / bids if ``is_short``).
+        :return: The ratio, NaN if the book has less than ``depth`` levels
+        """
+        totals = self.depth_totals(depth)
+        if totals is None:
+            return np.nan
+
+        total_bids, total_asks = totals
+        return _ratio(total_asks, total_bids) if is_short else _ratio(total_bids, total_asks)
+
+    def check_depth(self, depth: int, delta: float, is_short: bool = False) -> bool:
+        """
+        Check if bids dominate asks (asks dominate bids if ``is_short``) by more than ``delta``.
+        """
+        totals = self.depth_totals(depth)
+        if totals is None:
+            return False
+
+        total_bids, total_asks = totals
+        if self.logger and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Analyzing depth of market... Results: total bids / total asks "
+                              "is %s, configured delta is %s", _ratio(total_bids, total_asks), delta)
+
+        return self.depth_imbalance(depth, is_short=is_short) > delta
+
+    def large_order_counts(self, threshold: float) -> Tuple[int, int]:
+        """
+        Number of bid and ask levels with an amount of at least ``threshold``.
+        """
+        if threshold not in self._large_order_counts:
+            self._large_order_counts[threshold] = (
+                int(np.count_nonzero(self.bid_amounts >= threshold)),
+                int(np.count_nonzero(self.ask_amounts >= threshold)))
+        return self._large_order_counts[threshold]
+
+    def has_large_orders(self, threshold: float) -> bool:
+        """
+        Check if any level on either side holds at least ``threshold``.
+        """
+        large_bids, large_asks = self.large_order_counts(threshold)
+
+        if self.logger and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Analyzing large orders for threshold %s, found %s",
+                              threshold, large_bids + large_asks)
+
+        return large_bids + large_asks > 0
+
+
+class OrderBookCache:
+    """
+    Order book snapshots per (pair, depth), shared by all callbacks of one bot iteration.
+
+    Call ``clear()`` from ``bot_loop_start`` so every iteration starts with fresh books;
+    the TTL (usually ``process_throttle_secs``) bounds the age of a snapshot for callbacks
+    running outside of the iteration.
+    """
+
+    def __init__(self, ttl: float, logger: Optional[logging.Logger] = None, recorder=None):
+        """
+        :param ttl: Maximum age of a snapshot in seconds
+        :param logger: Passed on to the OrderBookAnalytics instances
+        :param recorder: Optional OrderBookRecorder every fetched book is handed to
+        """
+        self.ttl = ttl
+        self.logger = logger
+        self.recorder = recorder
+        self._snapshots: Dict[Tuple[str, int], Tuple[float, OrderBookAnalytics]] = {}
+
+    def get(self, dp, pair: str, depth: int) -> OrderBookAnalytics:
+        """
+        Return the cached snapshot, fetching it from the exchange if missing or expired.
+        :param dp: The strategy's DataProvider
+        :param pair: Pair to get the order book for
+        :param depth: Order book depth to request
+        """
+        key = (pair, depth)
+        now = time.monotonic()
+        cached = self._snapshots.get(key)
+        if cached is not None and now - cached[0] < self.ttl:
+            return cached[1]
+
+        raw_order_book = dp.orderbook(pair, depth)
+        if self.recorder is not None:
+            self.recorder.record(pair, raw_order_book)
+
+        order_book = OrderBookAnalytics(raw_order_book, logger=self.logger)
+        self._snapshots[key] = (now, order_book)
+        return order_book
+
+    def clear(self) -> None:
+        self._snapshots.clear()
+
+
+class OrderBookFrames:
+    """
+    One order book snapshot per candle, as 2-D arrays of shape (candles, levels).
+
+    Offers the checks of OrderBookAnalytics, returning a numpy array with one value per
+    candle. Levels missing from a snapshot (or candles without snapshot) are NaN.
+    """
+
+    def __init__(self, bid_amounts: np.ndarray, ask_amounts: np.ndarray):
+        """
+        :param bid_amounts: Bid amount per candle and level, NaN padded
+        :param ask_amounts: Ask amount per candle and level, NaN padded
+        """
+        self.bid_amounts = np.ascontiguousarray(bid_amounts, dtype=np.float64)
+        self.ask_amounts = np.ascontiguousarray(ask_amounts, dtype=np.float64)
+
+        self.bid_levels = np.count_nonzero(~np.isnan(self.bid_amounts), axis=1)
+        self.ask_levels = np.count_nonzero(~np.isnan(self.ask_amounts), axis=1)
+        self.cumulative_bids = np.cumsum(self.bid_amounts, axis=1)
+        self.cumulative_asks = np.cumsum(self.ask_amounts, axis=1)
+
+    def __len__(self) -> int:
+        return len(self.bid_amounts)
+
+    def depth_imbalance(self, depth: int, is_short: bool = False) -> np.ndarray:
+        """
+        Bids / asks ratio of the first ``depth`` levels (asks / bids if ``is_short``).
+        :return: float array, NaN for candles with less than ``depth`` levels
+        """
+        result = np.full(len(self), np.nan)
+        if depth < 1 or depth > min(self.bid_amounts.shape[1], self.ask_amounts.shape[1]):
+            return result
+
+        valid = (self.bid_levels >= depth) & (self.ask_levels >= depth)
+        total_bids = self.cumulative_bids[valid, depth - 1]
+        total_asks = self.cumulative_asks[valid, depth - 1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result[valid] = total_asks / total_bids if is_short else total_bids / total_asks
+        return result
+
+    def check_depth(self, depth: int, delta: float, is_short: bool = False) -> np.ndarray:
+        """
+        Per candle: do bids dominate asks (asks dominate bids if ``is_short``) by more than ``delta``.
+        """
+        return self.depth_imbalance(depth, is_short=is_short) > delta
+
+    def large_order_counts(self, threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per candle number of bid and ask levels with an amount of at least ``threshold``.
+        """
+        return (np.count_nonzero(self.bid_amounts >= threshold, axis=1),
+                np.count_nonzero(self.ask_amounts >= threshold, axis=1))
+
+    def has_large_orders(self, threshold: float) -> np.ndarray:
+        """
+        Per candle: does any level on either side hold at least ``threshold``.
+        """
+        large_bids, large_asks = self.large_order_counts(threshold)
+        return (large_bids + large_asks) > 0
@@ -0,0 +1,114 @@
+"""
+Order book analytics as dataframe columns, for the Goal_Depth strategies.
+
+Columns (one value per candle):
+    depth_imbalance_<N>         total bids / total asks of the first N levels
+    depth_imbalance_short_<N>   total asks / total bids of the first N levels
+    large_bid_count_<T>         number of bid levels holding at least T
+    large_ask_count_<T>         number of ask levels holding at least T
+
+In backtesting the columns are computed in bulk from ``OrderBookFrames`` (one replayed
+snapshot per candle). Live, the features of each new snapshot are computed once and kept
+in a rolling per pair history keyed by candle date, so every row shows the book the bot
+saw when that candle was the latest. Candles without snapshot are NaN, which makes any
+comparison on them False.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Iterable, List
+
+import pandas as pd
+from pandas import DataFrame
+
+from shared.dataframe_utils import append_columns
+from shared.orderbook import OrderBookFrames
+
+
+def depth_imbalance_column(depth: int, is_short: bool = False) -> str:
+    return f'depth_imbalance_short_{depth}' if is_short else f'depth_imbalance_{depth}'
+
+
+def large_order_columns(threshold: float) -> List[str]:
+    return [f'large_bid_count_{threshold}', f'large_ask_count_{threshold}']
+
+
+class DepthFeatures:
+    """
+    Usage:
+        # bot_start
+        self.depth_features = DepthFeatures(depths=(15,), thresholds=(500,))
+        # populate_indicators
+        dataframe = self.depth_features.populate(dataframe, metadata['pair'], order_book)
+        # populate_entry_trend
+        (dataframe['depth_imbalance_15'] > 1.3) &
+        (dataframe['large_bid_count_500'] + dataframe['large_ask_count_500'] > 0)
+    """
+
+    def __init__(self, depths: Iterable[int] = (), short_depths: Iterable[int] = (),
+                 thresholds: Iterable[float] = (), history_size: int = 1000):
+        """
+        :param depths: Depths to compute the bids / asks imbalance for
+        :param short_depths: Depths to compute the asks / bids imbalance for
+        :param thresholds: Amounts to count large bid / ask levels for
+        :param history_size: Number of candles per pair kept of the live snapshots
+        """
+        self.depths = list(dict.fromkeys(depths))
+        self.short_depths = list(dict.fromkeys(short_depths))
+        self.thresholds = list(dict.fromkeys(thresholds))
+        self.history_size = history_size
+
+        self.columns = ([depth_imbalance_column(depth) for depth in self.depths]
+                        + [depth_imbalance_column(depth, True) for depth in self.short_depths]
+                        + [column for threshold in self.thresholds
+                           for column in large_order_columns(threshold)])
+        self._history: Dict[str, OrderedDict] = {}
+
+    def compute(self, order_book) -> Dict[str, object]:
+        """
+        Feature values of an ``OrderBookAnalytics`` (scalars) or ``OrderBookFrames`` (arrays).
+        """
+        features = {}
+        for depth in self.depths:
+            features[depth_imbalance_column(depth)] = order_book.depth_imbalance(depth)
+        for depth in self.short_depths:
+            features[depth_imbalance_column(depth, True)] = order_book.depth_imbalance(depth, is_short=True)
+        for threshold in self.thresholds:
+            bid_column, ask_column = large_order_columns(threshold)
+            features[bid_column], features[ask_column] = order_book.large_order_counts(threshold)
+        return features
+
+    def update(self, pair: str, date, order_book) -> None:
+        """
+        Store the features of a live snapshot for the candle starting at ``date``.
+        A later snapshot for the same candle replaces the earlier one.
+        """
+        history = self._history.setdefault(pair, OrderedDict())
+        history[pd.Timestamp(date)] = self.compute(order_book)
+        history.move_to_end(pd.Timestamp(date))
+        while len(history) > self.history_size:
+            history.popitem(last=False)
+
+    def history(self, pair: str, dates: pd.Series) -> DataFrame:
+        """
+        Stored features aligned to ``dates``, NaN where no snapshot was seen.
+        """
+        history = self._history.get(pair, {})
+        features = DataFrame(list(history.values()), index=list(history.keys()), columns=self.columns)
+        return features.reindex(pd.DatetimeIndex(dates))
+
+    def populate(self, dataframe: DataFrame, pair: str, order_book) -> DataFrame:
+        """
+        Add the feature columns to the dataframe.
+        :param dataframe: Dataframe of the pair
+        :param pair: Pair the order book belongs to
+        :param order_book: ``OrderBookFrames`` with one snapshot per candle, or the live
+                           ``OrderBookAnalytics`` snapshot belonging to the last candle
+        :return: Dataframe with the feature columns
+        """
+        if isinstance(order_book, OrderBookFrames):
+            return append_columns(dataframe, self.compute(order_book))
+
+        if len(dataframe):
+            self.update(pair, dataframe['date'].iloc[-1], order_book)
+        features = self.history(pair, dataframe['date'])
+        return append_columns(dataframe, {column: features[column].to_numpy() for column in self.columns})
@@ -0,0 +1,171 @@
+"""
+Order book snapshot recording and replay.
+
+``OrderBookRecorder`` appends timestamped order book snapshots per pair to feather files
+(one column per level and field, written in batches) while the bot runs live / dry-run.
+``OrderBookReplay`` loads them again in backtesting and serves, for every candle, the
+latest snapshot taken up to the moment the candle closed, as ``OrderBookFrames``.
+
+Layout:
+    <directory>/<PAIR>/<first snapshot ms>.feather
+    columns: date, bid_price_0..N, bid_amount_0..N, ask_price_0..N, ask_amount_0..N
+"""
+
+import atexit
+import logging
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from shared.orderbook import OrderBookFrames, padded_levels
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ('bid_price', 'bid_amount', 'ask_price', 'ask_amount')
+
+
+def pair_to_dirname(pair: str) -> str:
+    return pair.replace('/', '_').replace(':', '_')
+
+
+def snapshot_columns(depth: int) -> List[str]:
+    return [f'{field}_{level}' for field in FIELDS for level in range(depth)]
+
+
+class OrderBookRecorder:
+    """
+    Buffers order book snapshots in memory and writes them to disk in batches.
+
+    A batch is written when ``flush_size`` snapshots are buffered or ``flush_interval``
+    seconds passed since the last write, so a crash (no atexit) loses at most that much.
+    """
+
+    def __init__(self, directory: Path, depth: int = 20, flush_size: int = 500,
+                 flush_interval: float = 300):
+        """
+        :param directory: Root directory of the recordings (one sub folder per pair)
+        :param depth: Number of levels stored per side, deeper levels are dropped
+        :param flush_size: Number of buffered snapshots (over all pairs) triggering a write
+        :param flush_interval: Maximum number of seconds snapshots stay buffered
+        """
+        self.directory = Path(directory)
+        self.depth = depth
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._buffer: Dict[str, List[Tuple[int, np.ndarray]]] = {}
+        self._buffered = 0
+        self._flushed_at = time.monotonic()
+        # Don't lose the last batch when the bot stops
+        atexit.register(self.flush)
+
+    def record(self, pair: str, order_book: dict, timestamp: Optional[int] = None) -> None:
+        """
+        Add a snapshot to the buffer.
+        :param pair: Pair the order book belongs to
+        :param order_book: ccxt order book
+        :param timestamp: Snapshot time in ms, defaults to the book's timestamp or now
+        """
+        if timestamp is None:
+            timestamp = order_book.get('timestamp') or int(time.time() * 1000)
+
+        row = np.concatenate(padded_levels(order_book, self.depth))
+        self._buffer.setdefault(pair, []).append((int(timestamp), row))
+        self._buffered += 1
+
+        if (self._buffered >= self.flush_size
+                or time.monotonic() - self._flushed_at >= self.flush_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write all buffered snapshots, one new file per pair.
+        """
+        for pair, snapshots in self._buffer.items():
+            if not snapshots:
+                continue
+
+            timestamps = np.array([timestamp for timestamp, _ in snapshots], dtype=np.int64)
+            snapshot_df = DataFrame(np.vstack([row for _, row in snapshots]),
+                                    columns=snapshot_columns(self.depth))
+            snapshot_df.insert(0, 'date', pd.to_datetime(timestamps, unit='ms', utc=True))
+
+            pair_dir = self.directory / pair_to_dirname(pair)
+            pair_dir.mkdir(parents=True, exist_ok=True)
+            try:
+                snapshot_df.to_feather(pair_dir / f'{timestamps[0]}.feather')
+            except Exception as e:
+                logger.warning(f"Could not write order book snapshots for {pair}: {e}")
+
+        self._buffer = {}
+        self._buffered = 0
+        self._flushed_at = time.monotonic()
+
+
+class OrderBookReplay:
+    """
+    Serves recorded order book snapshots aligned to candles.
+    """
+
+    def __init__(self, directory: Path, tolerance: Optional[pd.Timedelta] = None):
+        """
+        :param directory: Root directory of the recordings
+        :param tolerance: Maximum age of a snapshot relative to the candle close,
+                          older snapshots are treated as missing
+        """
+        self.directory = Path(directory)
+        self.tolerance = tolerance
+        self._snapshots: Dict[str, DataFrame] = {}
+        self._frames: Dict[str, Tuple[tuple, OrderBookFrames]] = {}
+
+    def load(self, pair: str) -> DataFrame:
+        """
+        All snapshots recorded for a pair, sorted by date (empty dataframe if none).
+        """
+        if pair not in self._snapshots:
+            files = sorted((self.directory / pair_to_dirname(pair)).glob('*.feather'))
+            if files:
+                snapshots = pd.concat([pd.read_feather(file) for file in files], ignore_index=True)
+                snapshots = snapshots.sort_values('date').drop_duplicates('date', keep='last')
+            else:
+                logger.warning(f"No recorded order book snapshots found for {pair} "
+                               f"in {self.directory}.")
+                snapshots = DataFrame({'date': pd.Series(dtype='datetime64[ns, UTC]')})
+            self._snapshots[pair] = snapshots.reset_index(drop=True)
+        return self._snapshots[pair]
+
+    def frames(self, pair: str, dates: pd.Series,
+               offset: pd.Timedelta = pd.Timedelta(0)) -> OrderBookFrames:
+        """
+        Snapshot per candle, taken at or before ``date + offset``.
+
+        Pass the timeframe as ``offset`` to use the book as it was when the candle closed,
+        which is what the live bot sees when it evaluates that candle (no lookahead).
+        :param pair: Pair to replay
+        :param dates: Candle open dates (the dataframe's 'date' column, sorted)
+        :param offset: Shift applied to the candle dates before matching
+        """
+        key = (len(dates), dates.iloc[0] if len(dates) else None,
+               dates.iloc[-1] if len(dates) else None, offset)
+        cached = self._frames.get(pair)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        snapshots = self.load(pair)
+        bid_columns = [column for column in snapshots.columns if column.startswith('bid_amount_')]
+        ask_columns = [column for column in snapshots.columns if column.startswith('ask_amount_')]
+
+        candles = DataFrame({'date': (dates + offset).astype('datetime64[ns, UTC]').reset_index(drop=True)})
+        snapshots = snapshots.assign(date=snapshots['date'].astype('datetime64[ns, UTC]'))
+        aligned = pd.merge_asof(candles, snapshots[['date'] + bid_columns + ask_columns],
+                                on='date', direction='backward', tolerance=self.tolerance)
+
+        frames = OrderBookFrames(
+            aligned[bid_columns].to_numpy(dtype=np.float64).reshape(len(aligned), len(bid_columns)),
+            aligned[ask_columns].to_numpy(dtype=np.float64).reshape(len(aligned), len(ask_columns)),
+        )
+        self._frames[pair] = (key, frames)
+        return frames
@@ -0,0 +1,85 @@
+"""
+OTT (Optimized Trend Tracker) indicator, as used by futures/FOttStrategy.
+
+The VIDYA style ``Var`` moving average, the longstop / shortstop ratchets and the
+direction state machine are computed in a single O(n) pass over numpy arrays (compiled
+when numba is available). Outputs are identical to the original dataframe implementation,
+whose repeated whole-frame updates converged to the same recurrences in O(n^2).
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from shared.numba_compat import njit
+
+
+@njit(cache=True)
+def _ott_kernel(close, cmo, pds, percent):
+    n = len(close)
+    alpha = 2 / (pds + 1)
+    var = np.zeros(n)
+    mt = np.zeros(n)
+
+    for i in range(pds, n):
+        var[i] = (alpha * cmo[i] * close[i]) + (1 - alpha * cmo[i]) * var[i - 1]
+
+    longstop = np.nan
+    shortstop = np.nan
+    direction = 1.0
+    for i in range(n):
+        fark = var[i] * percent * 0.01
+        newlongstop = var[i] - fark
+        newshortstop = var[i] + fark
+
+        prev_longstop = longstop
+        prev_shortstop = shortstop
+
+        # Ratchet the stops while the average stays on their side
+        if var[i] > prev_longstop:
+            longstop = max(newlongstop, prev_longstop)
+        else:
+            longstop = newlongstop
+
+        if var[i] < prev_shortstop:
+            shortstop = min(newshortstop, prev_shortstop)
+        else:
+            shortstop = newshortstop
+
+        # Flip direction when the average crosses the previous stop
+        if i > 0:
+            if var[i - 1] < prev_shortstop and var[i] > prev_shortstop:
+                direction = 1.0
+            elif var[i - 1] > prev_longstop and var[i] < prev_longstop:
+                direction = -1.0
+
+        mt[i] = longstop if direction == 1 else shortstop
+
+    return var, mt
+
+
+def calculate_ott(close, pds: int = 2, percent: float = 1.4) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate the OTT line and its moving average.
+    :param close: close prices (numpy array or Series)
+    :param pds: period of the VIDYA style moving average
+    :param percent: OTT band width in percent
+    :return: Tuple of (OTT, VAR) numpy arrays, OTT is shifted by 2 candles
+    """
+    close = pd.Series(np.asarray(close, dtype=np.float64))
+
+    ud1 = np.where(close > close.shift(1), (close - close.shift()), 0)
+    dd1 = np.where(close < close.shift(1), (close.shift() - close), 0)
+    # pandas rolling sums are kept on purpose, their rounding is what the strategy was tuned on
+    ud = pd.Series(ud1).rolling(9).sum().to_numpy()
+    dd = pd.Series(dd1).rolling(9).sum().to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cmo = (ud - dd) / (ud + dd)
+    cmo = np.abs(np.where(np.isnan(cmo), 0.0, cmo))
+
+    var, mt = _ott_kernel(close.to_numpy(), cmo, pds, percent)
+
+    ott = np.where(var > mt, (mt * (200 + percent) / 200), (mt * (200 - percent) / 200))
+
+    return pd.Series(ott).shift(2).to_numpy(), var
@@ -0,0 +1,129 @@
+"""
+Per coin settings of the strategy families (Strategy_Goal_Depth, Strategy_Goal_Vidra, ...).
+
+A family strategy holds a ``PAIR_SETTINGS`` table keyed by coin, the base currency of the
+pair, so 'SOL/USDT' and 'SOL/USDT:USDT' share a row. A row overrides class attributes of
+the strategy for that coin; attributes missing from the row fall back to the class. One bot
+trades every coin of the table. The ``ANY_COIN`` row, if present, is used for the coins
+missing from the table: the per coin strategies (Strategy_Goal_Depth_INJ, ...) only have
+that row and trade every pair with the settings of their coin.
+
+``STRATEGY_SETTINGS`` (of a row, or of the class) maps a timeframe to a SettingsObject, whose
+fields are then available on the row of that timeframe as well. The rows are resolved once
+at startup and indexed by (pair, timeframe), so the per candle lookup is a dict access.
+"""
+
+import logging
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+ANY_COIN = '*'
+
+
+def pair_coin(pair: str) -> str:
+    """
+    Base currency of a spot ('SOL/USDT') or futures ('SOL/USDT:USDT') pair.
+    """
+    return pair.split('/')[0]
+
+
+class CoinSettings:
+    """
+    One row of the settings table, falling back to the strategy's attributes.
+    """
+
+    def __init__(self, strategy, coin: str, overrides: Mapping[str, Any]):
+        self._strategy = strategy
+        self.coin = coin
+        self.__dict__.update(overrides)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes missing from the row
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._strategy, name)
+
+    def __repr__(self) -> str:
+        return f"CoinSettings({self.coin})"
+
+
+class PairSettings:
+    """
+    Usage:
+        # bot_start
+        self.pair_settings = PairSettings(self, self.PAIR_SETTINGS, self.timeframe, logger=self.logger)
+        self.pair_settings.index_whitelist(self.dp)
+        # populate_* / callbacks
+        settings = self.pair_settings.get(metadata['pair'])
+        if settings is None:
+            return dataframe
+        settings.depth, settings.target_percent, ...
+    """
+
+    def __init__(self, strategy, table: Optional[Mapping[str, Mapping[str, Any]]] = None,
+                 timeframe: Optional[str] = None, logger: Optional[logging.Logger] = None):
+        """
+        :param strategy: Strategy whose attributes are the defaults of every row
+        :param table: Overrides per coin, ``ANY_COIN`` for the coins missing from the table.
+                      Defaults to a single ``ANY_COIN`` row (the class attributes).
+        :param timeframe: The bot's timeframe, used when ``get`` is called without one
+        :param logger: Logger for the pairs which can't be traded
+        """
+        self.timeframe = timeframe
+        self.logger = logger or logging.getLogger(__name__)
+        # Coins with their own row never fall back to ANY_COIN, even without the timeframe
+        self._coins = set(table or {}) - {ANY_COIN}
+        self._rows: Dict[Tuple[str, Optional[str]], CoinSettings] = {}
+        self._index: Dict[Tuple[str, Optional[str]], Optional[CoinSettings]] = {}
+
+        for coin, overrides in (table or {ANY_COIN: {}}).items():
+            row = CoinSettings(strategy, coin, overrides)
+            timeframe_settings = getattr(row, 'STRATEGY_SETTINGS', None)
+            if timeframe_settings is None:
+                self._rows[(coin, timeframe)] = row
+                continue
+
+            for row_timeframe, settings in timeframe_settings.items():
+                self._rows[(coin, row_timeframe)] = CoinSettings(strategy, coin, {**overrides, **vars(settings)})
+
+    def __iter__(self) -> Iterator[CoinSettings]:
+        """
+        Rows of the bot's timeframe.
+        """
+        return iter([row for (_, timeframe), row in self._rows.items() if timeframe == self.timeframe])
+
+    def get(self, pair: str, timeframe: Optional[str] = None) -> Optional[CoinSettings]:
+        """
+        Settings of the pair's coin, None if the pair is not to be traded.
+        :param pair: Pair, e.g. metadata['pair']
+        :param timeframe: Timeframe of the settings, the bot's timeframe if None
+        """
+        key = (pair, timeframe or self.timeframe)
+        try:
+            return self._index[key]
+        except KeyError:
+            pass
+
+        coin = pair_coin(pair)
+        row = self._rows.get((coin, key[1]))
+        if row is None and coin not in self._coins:
+            row = self._rows.get((ANY_COIN, key[1]))
+        if row is None:
+            self.logger.warning(f"No {key[1]} settings for {pair}, the pair is not traded.")
+        self._index[key] = row
+        return row
+
+    def index_whitelist(self, dp) -> None:
+        """
+        Resolve the settings of all whitelisted pairs up front. Pairs added later (dynamic
+        pairlists) are resolved on their first lookup.
+        :param dp: The strategy's DataProvider
+        """
+        try:
+            pairs = dp.current_whitelist()
+        except Exception as e:
+            # No pairlist in some run modes (e.g. backtesting before the pairlist is loaded)
+            self.logger.info(f"Settings not indexed up front, whitelist unavailable: {e}")
+            return
+
+        for pair in pairs:
+            self.get(pair)
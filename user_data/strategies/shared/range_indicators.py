@@ -0,0 +1,75 @@
+"""
+One indicator for every period of hyperoptable parameters, without duplicates.
+
+Strategies hyperopting an indicator period used to add a column per value of each
+parameter's ``.range``: a buy and a sell CCI period over the same range gave every CCI
+twice, two SMA ranges overlapping by a dozen periods gave a dozen SMAs twice.
+``RangeIndicator`` takes the parameters of all spaces at once, calculates each distinct
+period once into a single float64 block (the dtype of the TA-Lib columns it replaces, so
+comparisons with prices and thresholds give the same signals) and adds the columns to the
+dataframe in one concat instead of inserting them one by one.
+
+Outside hyperopt (and for parameters not being optimized) freqtrade's ``.range`` is only
+the parameter's value, so live / dry-run / backtesting calculate only the periods in use.
+"""
+
+from typing import Callable, Iterable, List
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from shared.dataframe_utils import append_columns
+
+
+def parameter_periods(*parameters) -> List[int]:
+    """
+    Distinct values of the parameters' ``.range``, sorted.
+    """
+    return sorted({int(value) for parameter in parameters for value in parameter.range})
+
+
+class RangeIndicator:
+    """
+    Usage:
+        # strategy class
+        cci = RangeIndicator('cci', lambda dataframe, period: ta.CCI(dataframe, timeperiod=period))
+        # populate_indicators
+        dataframe = self.cci.add(dataframe, self.buy_cciTime, self.sell_cciTime)
+        # populate_entry_trend / populate_exit_trend
+        dataframe[self.cci.column(self.buy_cciTime.value)]
+    """
+
+    def __init__(self, name: str, function: Callable[[DataFrame, int], pd.Series],
+                 dtype=np.float64):
+        """
+        :param name: Column name prefix, the columns are '<name>_<period>'
+        :param function: Calculates the indicator of a period
+        :param dtype: dtype of the block
+        """
+        self.name = name
+        self.function = function
+        self.dtype = dtype
+
+    def column(self, period: int) -> str:
+        return f'{self.name}_{period}'
+
+    def block(self, dataframe: DataFrame, periods: Iterable[int]) -> np.ndarray:
+        """
+        The indicator of each period, one column per period.
+        """
+        periods = list(periods)
+        block = np.empty((len(dataframe), len(periods)), dtype=self.dtype)
+        for position, period in enumerate(periods):
+            block[:, position] = self.function(dataframe, period)
+        return block
+
+    def add(self, dataframe: DataFrame, *parameters) -> DataFrame:
+        """
+        Add the columns of all periods of the parameters (each period once).
+        :param parameters: IntParameters of any space giving the periods
+        """
+        periods = parameter_periods(*parameters)
+        block = self.block(dataframe, periods)
+        return append_columns(dataframe, {self.column(period): block[:, position]
+                                          for position, period in enumerate(periods)})
@@ -0,0 +1,137 @@
+"""
+Supertrend Indicator; adapted for freqtrade
+from: https://github.com/freqtrade/freqtrade-strategies/issues/30
+
+Array implementation of the ``supertrend()`` method used by FSupertrendStrategy and
+not_used/Supertrend. The final band / supertrend recurrences run in a single loop over
+numpy arrays (compiled when numba is available), without copying the dataframe.
+Outputs are identical to the original dataframe implementation.
+
+``calculate_supertrend_grid`` computes many (multiplier, period) combinations at once,
+sharing the true range, the midpoint and the ATR of each distinct period.
+"""
+
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+import talib
+
+from shared.numba_compat import njit
+
+
+@njit(cache=True)
+def _supertrend_kernel(basic_ub, basic_lb, close, period):
+    n = len(close)
+    final_ub = np.zeros(n)
+    final_lb = np.zeros(n)
+    st = np.zeros(n)
+
+    for i in range(period, n):
+        # Compute final upper and lower bands
+        if basic_ub[i] < final_ub[i - 1] or close[i - 1] > final_ub[i - 1]:
+            final_ub[i] = basic_ub[i]
+        else:
+            final_ub[i] = final_ub[i - 1]
+
+        if basic_lb[i] > final_lb[i - 1] or close[i - 1] < final_lb[i - 1]:
+            final_lb[i] = basic_lb[i]
+        else:
+            final_lb[i] = final_lb[i - 1]
+
+        # Set the Supertrend value
+        if st[i - 1] == final_ub[i - 1] and close[i] <= final_ub[i]:
+            st[i] = final_ub[i]
+        elif st[i - 1] == final_ub[i - 1] and close[i] > final_ub[i]:
+            st[i] = final_lb[i]
+        elif st[i - 1] == final_lb[i - 1] and close[i] >= final_lb[i]:
+            st[i] = final_lb[i]
+        elif st[i - 1] == final_lb[i - 1] and close[i] < final_lb[i]:
+            st[i] = final_ub[i]
+        else:
+            st[i] = 0.00
+
+    return st
+
+
+@njit(cache=True)
+def _supertrend_grid_kernel(basic_ub, basic_lb, close, periods):
+    st = np.zeros(basic_ub.shape)
+    for row in range(basic_ub.shape[0]):
+        st[row] = _supertrend_kernel(basic_ub[row], basic_lb[row], close, periods[row])
+
+    return st
+
+
+def _as_float_array(values) -> np.ndarray:
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def _trend_direction(st: np.ndarray, close: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Mark the trend direction up/down ('nan' while the supertrend is not set,
+    # exactly like the string array the dataframe version produced)
+    stx = np.where(st > 0.00, np.where(close < st, "down", "up"), "nan")
+    st = np.where(np.isnan(st), 0.00, st)
+    return st, stx
+
+
+def calculate_supertrend(high, low, close, multiplier, period: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate the supertrend line and its direction.
+    :param high: high prices (numpy array or Series)
+    :param low: low prices (numpy array or Series)
+    :param close: close prices (numpy array or Series)
+    :param multiplier: ATR multiplier of the bands
+    :param period: ATR period
+    :return: Tuple of (ST, STX) numpy arrays, STX holding 'up' / 'down' / 'nan'
+    """
+    high = _as_float_array(high)
+    low = _as_float_array(low)
+    close = _as_float_array(close)
+
+    atr = talib.SMA(talib.TRANGE(high, low, close), period)
+
+    # Compute basic upper and lower bands
+    basic_ub = (high + low) / 2 + multiplier * atr
+    basic_lb = (high + low) / 2 - multiplier * atr
+
+    st = _supertrend_kernel(basic_ub, basic_lb, close, period)
+
+    return _trend_direction(st, close)
+
+
+def calculate_supertrend_grid(
+    high, low, close, params: Iterable[Tuple[int, int]]
+) -> Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray]]:
+    """
+    Calculate the supertrend for a set of (multiplier, period) combinations in one pass.
+
+    True range and midpoint are computed once, the ATR once per distinct period, and all
+    bands are filled as rows of a single 2-D array.
+    :param high: high prices (numpy array or Series)
+    :param low: low prices (numpy array or Series)
+    :param close: close prices (numpy array or Series)
+    :param params: (multiplier, period) combinations, duplicates are computed once
+    :return: Dict of (multiplier, period) -> (ST, STX), same values as calculate_supertrend
+    """
+    params = list(dict.fromkeys(params))
+    if not params:
+        return {}
+
+    high = _as_float_array(high)
+    low = _as_float_array(low)
+    close = _as_float_array(close)
+
+    tr = talib.TRANGE(high, low, close)
+    mid = (high + low) / 2
+    atr_by_period = {period: talib.SMA(tr, period) for period in {p for _, p in params}}
+
+    multipliers = np.array([m for m, _ in params])[:, None]
+    atr = np.stack([atr_by_period[p] for _, p in params])
+    periods = np.array([p for _, p in params], dtype=np.int64)
+
+    basic_ub = mid + multipliers * atr
+    basic_lb = mid - multipliers * atr
+
+    st, stx = _trend_direction(_supertrend_grid_kernel(basic_ub, basic_lb, close, periods), close)
+
+    return {param: (st[row], stx[row]) for row, param in enumerate(params)}
@@ -0,0 +1,266 @@
+"""
+The features of ``ta.add_all_ta_features``, calculated selectively.
+
+``add_all_ta_features`` adds ~86 columns (GodStraHo's ``GodGenes``), while a hyperopted
+GodStra only compares the ``buy-indicator-*`` / ``buy-cross-*`` (and sell) columns of its
+params. ``plan_features`` maps the wanted columns to the ``ta`` indicators producing them:
+one indicator object gives several columns (all Bollinger Band ones, the three KST ones,
+...), so a column brings in the indicator it depends on and the indicator is calculated
+once for all of its columns. The indicators are built with the parameters
+``add_all_ta_features`` uses, the columns are the same.
+
+``add_all_features`` is the hyperopt mode, where every epoch may pick any column: all
+features of the pair's candles in one float64 block, kept in an ``IndicatorCache`` (memory
+and disk) so it is calculated once per pair and data, not per epoch or worker process.
+float64 like ``add_ta_features``: the '=' / crossing genes hyperopted on the block give the
+same signals in backtesting and live.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from ta.momentum import (AwesomeOscillatorIndicator, KAMAIndicator, PercentagePriceOscillator,
+                         PercentageVolumeOscillator, ROCIndicator, RSIIndicator,
+                         StochasticOscillator, StochRSIIndicator, TSIIndicator,
+                         UltimateOscillator, WilliamsRIndicator)
+from ta.others import CumulativeReturnIndicator, DailyLogReturnIndicator, DailyReturnIndicator
+from ta.trend import (MACD, ADXIndicator, AroonIndicator, CCIIndicator, DPOIndicator,
+                      EMAIndicator, IchimokuIndicator, KSTIndicator, MassIndex, PSARIndicator,
+                      SMAIndicator, STCIndicator, TRIXIndicator, VortexIndicator)
+from ta.volatility import (AverageTrueRange, BollingerBands, DonchianChannel, KeltnerChannel,
+                           UlcerIndex)
+from ta.volume import (AccDistIndexIndicator, ChaikinMoneyFlowIndicator,
+                       EaseOfMovementIndicator, ForceIndexIndicator, MFIIndicator,
+                       NegativeVolumeIndexIndicator, OnBalanceVolumeIndicator,
+                       VolumePriceTrendIndicator, VolumeWeightedAveragePrice)
+
+from shared.indicator_cache import IndicatorCache
+
+# Columns every dataframe has, nothing to calculate
+BASE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+# (indicator factory(dataframe, fillna), {column: method of the indicator}), in the order
+# add_all_ta_features adds the columns
+INDICATORS: Dict[str, Tuple[Callable[[DataFrame, bool], Any], Dict[str, str]]] = {
+    # Volume
+    'adi': (lambda df, fillna: AccDistIndexIndicator(
+        high=df['high'], low=df['low'], close=df['close'], volume=df['volume'], fillna=fillna),
+        {'volume_adi': 'acc_dist_index'}),
+    'obv': (lambda df, fillna: OnBalanceVolumeIndicator(
+        close=df['close'], volume=df['volume'], fillna=fillna),
+        {'volume_obv': 'on_balance_volume'}),
+    'cmf': (lambda df, fillna: ChaikinMoneyFlowIndicator(
+        high=df['high'], low=df['low'], close=df['close'], volume=df['volume'], fillna=fillna),
+        {'volume_cmf': 'chaikin_money_flow'}),
+    'fi': (lambda df, fillna: ForceIndexIndicator(
+        close=df['close'], volume=df['volume'], window=13, fillna=fillna),
+        {'volume_fi': 'force_index'}),
+    'eom': (lambda df, fillna: EaseOfMovementIndicator(
+        high=df['high'], low=df['low'], volume=df['volume'], window=14, fillna=fillna),
+        {'volume_em': 'ease_of_movement', 'volume_sma_em': 'sma_ease_of_movement'}),
+    'vpt': (lambda df, fillna: VolumePriceTrendIndicator(
+        close=df['close'], volume=df['volume'], fillna=fillna),
+        {'volume_vpt': 'volume_price_trend'}),
+    'vwap': (lambda df, fillna: VolumeWeightedAveragePrice(
+        high=df['high'], low=df['low'], close=df['close'], volume=df['volume'], window=14,
+        fillna=fillna),
+        {'volume_vwap': 'volume_weighted_average_price'}),
+    'mfi': (lambda df, fillna: MFIIndicator(
+        high=df['high'], low=df['low'], close=df['close'], volume=df['volume'], window=14,
+        fillna=fillna),
+        {'volume_mfi': 'money_flow_index'}),
+    'nvi': (lambda df, fillna: NegativeVolumeIndexIndicator(
+        close=df['close'], volume=df['volume'], fillna=fillna),
+        {'volume_nvi': 'negative_volume_index'}),
+    # Volatility
+    'bb': (lambda df, fillna: BollingerBands(
+        close=df['close'], window=20, window_dev=2, fillna=fillna),
+        {'volatility_bbm': 'bollinger_mavg', 'volatility_bbh': 'bollinger_hband',
+         'volatility_bbl': 'bollinger_lband', 'volatility_bbw': 'bollinger_wband',
+         'volatility_bbp': 'bollinger_pband', 'volatility_bbhi': 'bollinger_hband_indicator',
+         'volatility_bbli': 'bollinger_lband_indicator'}),
+    'kc': (lambda df, fillna: KeltnerChannel(
+        close=df['close'], high=df['high'], low=df['low'], window=10, fillna=fillna),
+        {'volatility_kcc': 'keltner_channel_mband', 'volatility_kch': 'keltner_channel_hband',
+         'volatility_kcl': 'keltner_channel_lband', 'volatility_kcw': 'keltner_channel_wband',
+         'volatility_kcp': 'keltner_channel_pband',
+         'volatility_kchi': 'keltner_channel_hband_indicator',
+         'volatility_kcli': 'keltner_channel_lband_indicator'}),
+    'dc': (lambda df, fillna: DonchianChannel(
+        high=df['high'], low=df['low'], close=df['close'], window=20, offset=0, fillna=fillna),
+        {'volatility_dcl': 'donchian_channel_lband', 'volatility_dch': 'donchian_channel_hband',
+         'volatility_dcm': 'donchian_channel_mband', 'volatility_dcw': 'donchian_channel_wband',
+         'volatility_dcp': 'donchian_channel_pband'}),
+    'atr': (lambda df, fillna: AverageTrueRange(
+        close=df['close'], high=df['high'], low=df['low'], window=10, fillna=fillna),
+        {'volatility_atr': 'average_true_range'}),
+    'ui': (lambda df, fillna: UlcerIndex(close=df['close'], window=14, fillna=fillna),
+           {'volatility_ui': 'ulcer_index'}),
+    # Trend
+    'macd': (lambda df, fillna: MACD(
+        close=df['close'], window_slow=26, window_fast=12, window_sign=9, fillna=fillna),
+        {'trend_macd': 'macd', 'trend_macd_signal': 'macd_signal', 'trend_macd_diff': 'macd_diff'}),
+    'sma_fast': (lambda df, fillna: SMAIndicator(close=df['close'], window=12, fillna=fillna),
+                 {'trend_sma_fast': 'sma_indicator'}),
+    'sma_slow': (lambda df, fillna: SMAIndicator(close=df['close'], window=26, fillna=fillna),
+                 {'trend_sma_slow': 'sma_indicator'}),
+    'ema_fast': (lambda df, fillna: EMAIndicator(close=df['close'], window=12, fillna=fillna),
+                 {'trend_ema_fast': 'ema_indicator'}),
+    'ema_slow': (lambda df, fillna: EMAIndicator(close=df['close'], window=26, fillna=fillna),
+                 {'trend_ema_slow': 'ema_indicator'}),
+    'vortex': (lambda df, fillna: VortexIndicator(
+        high=df['high'], low=df['low'], close=df['close'], window=14, fillna=fillna),
+        {'trend_vortex_ind_pos': 'vortex_indicator_pos',
+         'trend_vortex_ind_neg': 'vortex_indicator_neg',
+         'trend_vortex_ind_diff': 'vortex_indicator_diff'}),
+    'trix': (lambda df, fillna: TRIXIndicator(close=df['close'], window=15, fillna=fillna),
+             {'trend_trix': 'trix'}),
+    'mass_index': (lambda df, fillna: MassIndex(
+        high=df['high'], low=df['low'], window_fast=9, window_slow=25, fillna=fillna),
+        {'trend_mass_index': 'mass_index'}),
+    'dpo': (lambda df, fillna: DPOIndicator(close=df['close'], window=20, fillna=fillna),
+            {'trend_dpo': 'dpo'}),
+    'kst': (lambda df, fillna: KSTIndicator(
+        close=df['close'], roc1=10, roc2=15, roc3=20, roc4=30, window1=10, window2=10,
+        window3=10, window4=15, nsig=9, fillna=fillna),
+        {'trend_kst': 'kst', 'trend_kst_sig': 'kst_sig', 'trend_kst_diff': 'kst_diff'}),
+    'ichimoku': (lambda df, fillna: IchimokuIndicator(
+        high=df['high'], low=df['low'], window1=9, window2=26, window3=52, visual=False,
+        fillna=fillna),
+        {'trend_ichimoku_conv': 'ichimoku_conversion_line',
+         'trend_ichimoku_base': 'ichimoku_base_line',
+         'trend_ichimoku_a': 'ichimoku_a', 'trend_ichimoku_b': 'ichimoku_b'}),
+    'stc': (lambda df, fillna: STCIndicator(
+        close=df['close'], window_slow=50, window_fast=23, cycle=10, smooth1=3, smooth2=3,
+        fillna=fillna),
+        {'trend_stc': 'stc'}),
+    'adx': (lambda df, fillna: ADXIndicator(
+        high=df['high'], low=df['low'], close=df['close'], window=14, fillna=fillna),
+        {'trend_adx': 'adx', 'trend_adx_pos': 'adx_pos', 'trend_adx_neg': 'adx_neg'}),
+    'cci': (lambda df, fillna: CCIIndicator(
+        high=df['high'], low=df['low'], close=df['close'], window=20, constant=0.015,
+        fillna=fillna),
+        {'trend_cci': 'cci'}),
+    'visual_ichimoku': (lambda df, fillna: IchimokuIndicator(
+        high=df['high'], low=df['low'], window1=9, window2=26, window3=52, visual=True,
+        fillna=fillna),
+        {'trend_visual_ichimoku_a': 'ichimoku_a', 'trend_visual_ichimoku_b': 'ichimoku_b'}),
+    'aroon': (lambda df, fillna: AroonIndicator(
+        high=df['high'], low=df['low'], window=25, fillna=fillna),
+        {'trend_aroon_up': 'aroon_up', 'trend_aroon_down': 'aroon_down',
+         'trend_aroon_ind': 'aroon_indicator'}),
+    'psar': (lambda df, fillna: PSARIndicator(
+        high=df['high'], low=df['low'], close=df['close'], step=0.02, max_step=0.20,
+        fillna=fillna),
+        {'trend_psar_up': 'psar_up', 'trend_psar_down': 'psar_down',
+         'trend_psar_up_indicator': 'psar_up_indicator',
+         'trend_psar_down_indicator': 'psar_down_indicator'}),
+    # Momentum
+    'rsi': (lambda df, fillna: RSIIndicator(close=df['close'], window=14, fillna=fillna),
+            {'momentum_rsi': 'rsi'}),
+    'stoch_rsi': (lambda df, fillna: StochRSIIndicator(
+        close=df['close'], window=14, smooth1=3, smooth2=3, fillna=fillna),
+        {'momentum_stoch_rsi': 'stochrsi', 'momentum_stoch_rsi_k': 'stochrsi_k',
+         'momentum_stoch_rsi_d': 'stochrsi_d'}),
+    'tsi': (lambda df, fillna: TSIIndicator(
+        close=df['close'], window_slow=25, window_fast=13, fillna=fillna),
+        {'momentum_tsi': 'tsi'}),
+    'uo': (lambda df, fillna: UltimateOscillator(
+        high=df['high'], low=df['low'], close=df['close'], window1=7, window2=14, window3=28,
+        weight1=4.0, weight2=2.0, weight3=1.0, fillna=fillna),
+        {'momentum_uo': 'ultimate_oscillator'}),
+    'stoch': (lambda df, fillna: StochasticOscillator(
+        high=df['high'], low=df['low'], close=df['close'], window=14, smooth_window=3,
+        fillna=fillna),
+        {'momentum_stoch': 'stoch', 'momentum_stoch_signal': 'stoch_signal'}),
+    'wr': (lambda df, fillna: WilliamsRIndicator(
+        high=df['high'], low=df['low'], close=df['close'], lbp=14, fillna=fillna),
+        {'momentum_wr': 'williams_r'}),
+    'ao': (lambda df, fillna: AwesomeOscillatorIndicator(
+        high=df['high'], low=df['low'], window1=5, window2=34, fillna=fillna),
+        {'momentum_ao': 'awesome_oscillator'}),
+    'roc': (lambda df, fillna: ROCIndicator(close=df['close'], window=12, fillna=fillna),
+            {'momentum_roc': 'roc'}),
+    'ppo': (lambda df, fillna: PercentagePriceOscillator(
+        close=df['close'], window_slow=26, window_fast=12, window_sign=9, fillna=fillna),
+        {'momentum_ppo': 'ppo', 'momentum_ppo_signal': 'ppo_signal',
+         'momentum_ppo_hist': 'ppo_hist'}),
+    'pvo': (lambda df, fillna: PercentageVolumeOscillator(
+        volume=df['volume'], window_slow=26, window_fast=12, window_sign=9, fillna=fillna),
+        {'momentum_pvo': 'pvo', 'momentum_pvo_signal': 'pvo_signal',
+         'momentum_pvo_hist': 'pvo_hist'}),
+    'kama': (lambda df, fillna: KAMAIndicator(
+        close=df['close'], window=10, pow1=2, pow2=30, fillna=fillna),
+        {'momentum_kama': 'kama'}),
+    # Others
+    'dr': (lambda df, fillna: DailyReturnIndicator(close=df['close'], fillna=fillna),
+           {'others_dr': 'daily_return'}),
+    'dlr': (lambda df, fillna: DailyLogReturnIndicator(close=df['close'], fillna=fillna),
+            {'others_dlr': 'daily_log_return'}),
+    'cr': (lambda df, fillna: CumulativeReturnIndicator(close=df['close'], fillna=fillna),
+           {'others_cr': 'cumulative_return'}),
+}
+
+# Indicator producing each column
+FEATURES: Dict[str, str] = {column: indicator
+                            for indicator, (_, methods) in INDICATORS.items() for column in methods}
+ALL_FEATURES: List[str] = list(FEATURES)
+
+
+def plan_features(columns: Iterable[str]) -> Dict[str, List[str]]:
+    """
+    Indicators to calculate for the columns, with the wanted columns of each.
+    :param columns: Feature (or OHLCV) column names, e.g. the indicator / cross params
+    :raises ValueError: For a column no ``ta`` indicator produces
+    """
+    plan: Dict[str, List[str]] = {}
+    for column in columns:
+        if column in BASE_COLUMNS:
+            continue
+        indicator = FEATURES.get(column)
+        if indicator is None:
+            raise ValueError(f"{column} is not a feature of add_all_ta_features")
+        if column not in plan.setdefault(indicator, []):
+            plan[indicator].append(column)
+    return plan
+
+
+def add_ta_features(dataframe: DataFrame, columns: Iterable[str], fillna: bool = False) -> DataFrame:
+    """
+    Add only the columns (and the indicators they come from) add_all_ta_features would add.
+    """
+    for indicator, indicator_columns in plan_features(columns).items():
+        factory, methods = INDICATORS[indicator]
+        calculated = factory(dataframe, fillna)
+        for column in indicator_columns:
+            dataframe[column] = getattr(calculated, methods[column])()
+    return dataframe
+
+
+def feature_block(dataframe: DataFrame, fillna: bool = False) -> np.ndarray:
+    """
+    All features, one column per ``ALL_FEATURES`` entry.
+    """
+    block = np.empty((len(dataframe), len(ALL_FEATURES)), dtype=np.float64)
+    position = 0
+    for factory, methods in INDICATORS.values():
+        calculated = factory(dataframe, fillna)
+        for method in methods.values():
+            block[:, position] = getattr(calculated, method)()
+            position += 1
+    return block
+
+
+def add_all_features(dataframe: DataFrame, cache: IndicatorCache, pair: Optional[str] = None,
+                     fillna: bool = False) -> DataFrame:
+    """
+    Add all features, calculated once per pair and data through ``cache``.
+    """
+    # dtype in the name: blocks cached as float32 before aren't reused
+    name = f'ta_features-{"fillna" if fillna else "nan"}-float64'
+    block = cache.get_array(dataframe, name, lambda: feature_block(dataframe, fillna), pair=pair)
+    # concat copies the read-only cached block
+    features = DataFrame(block, index=dataframe.index, columns=ALL_FEATURES)
+    return pd.concat([dataframe.drop(columns=ALL_FEATURES, errors='ignore'), features], axis=1)
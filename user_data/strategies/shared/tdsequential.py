@@ -0,0 +1,67 @@
+"""
+TD Sequential setup counts, as used by berlinguyinca/TDSequentialStrategy.
+
+Counts and the "bars 6 and 7 exceeded by bars 8 or 9" check are computed with a few
+numpy operations over the whole series, giving the same columns the original
+``iterrows`` loop produced.
+"""
+
+from typing import Callable, Dict
+
+import numpy as np
+
+
+def consecutive_count(condition: np.ndarray) -> np.ndarray:
+    """
+    Count consecutive True values, resetting to 0 on every False.
+    :param condition: boolean numpy array
+    :return: int64 numpy array with the running count
+    """
+    index = np.arange(len(condition))
+    last_reset = np.maximum.accumulate(np.where(condition, -1, index))
+    return np.where(condition, index - last_reset, 0)
+
+
+def _exceeded(values: np.ndarray, seq: np.ndarray, exceeds: Callable) -> np.ndarray:
+    index = np.arange(len(values))
+    counted = seq >= 8
+
+    # position of bars 6 and 7 of the current count
+    bar_6 = np.where(counted, index - (seq - 6), index)
+    bar_7 = np.where(counted, index - (seq - 7), index)
+    exceed = counted & (exceeds(values, values[bar_6]) | exceeds(values, values[bar_7]))
+
+    # bar 9 reports the outcome of bar 8, like the original loop did
+    ninth = np.flatnonzero(seq == 9)
+    exceed[ninth] = exceed[ninth - 1]
+
+    return exceed
+
+
+def td_sequential(close, high, low) -> Dict[str, np.ndarray]:
+    """
+    Calculate the TD Sequential buy / sell setup.
+    :param close: close prices (numpy array or Series)
+    :param high: high prices (numpy array or Series)
+    :param low: low prices (numpy array or Series)
+    :return: Dict with the 'seq_buy', 'seq_sell', 'exceed_low' and 'exceed_high' arrays
+    """
+    close = np.asarray(close, dtype=np.float64)
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+
+    close_4 = np.full(len(close), np.nan)
+    close_4[4:] = close[:-4]
+
+    # count consecutive closes "lower" / "higher" than the close 4 bars prior.
+    seq_buy = consecutive_count(close < close_4)
+    seq_sell = consecutive_count(close > close_4)
+
+    return {
+        'seq_buy': seq_buy,
+        'seq_sell': seq_sell,
+        # the low of bars 6 and 7 in the count exceeded by the low of bars 8 or 9.
+        'exceed_low': _exceeded(low, seq_buy, np.less),
+        # the high of bars 6 and 7 in the count exceeded by the high of bars 8 or 9.
+        'exceed_high': _exceeded(high, seq_sell, np.greater),
+    }